@@ -0,0 +1,98 @@
+"""
+Channel Manager - Benchmark de serialización de listados
+
+Compara el coste por fila de los dos caminos de listar_disponibilidad:
+  - normal: objetos ORM -> validación Pydantic (from_attributes) -> JSON
+  - rápido: consulta por columnas -> dicts -> RespuestaJSONRapida (orjson)
+
+Uso:
+    python bench_serializacion.py --filas 20000
+"""
+import argparse
+import os
+import tempfile
+import time
+from datetime import date, timedelta
+
+# Base de datos temporal propia, antes de importar la aplicación
+_tmp = tempfile.mkdtemp()
+os.environ["DATABASE_URL"] = f"sqlite:///{_tmp}/bench.db"
+
+from fastapi.encoders import jsonable_encoder  # noqa: E402
+from fastapi.responses import JSONResponse  # noqa: E402
+from pydantic import TypeAdapter  # noqa: E402
+from typing import List  # noqa: E402
+
+from src.database import SessionLocal, init_db  # noqa: E402
+from src.models import User, Hotel, TipoHabitacion, Disponibilidad  # noqa: E402
+from src.responses import RespuestaJSONRapida  # noqa: E402
+from src.schemas import DisponibilidadResponse  # noqa: E402
+from src.services import columnas_schema, filas_a_dicts  # noqa: E402
+
+
+def poblar(db, filas: int):
+    user = User(email="bench@channel.local", password_hash="x")
+    hotel = Hotel(nombre="Hotel Bench", usuario=user)
+    tipos = [TipoHabitacion(nombre=f"Tipo {i}", hotel=hotel) for i in range(-(-filas // 365))]
+    db.add_all([user, hotel, *tipos])
+    db.flush()
+    inicio = date(2026, 1, 1)
+    db.bulk_insert_mappings(Disponibilidad, [
+        {
+            "tipo_habitacion_id": tipos[i // 365].id,
+            "fecha": inicio + timedelta(days=i % 365),
+            "cantidad_disponible": 5,
+            "precio": 99.5
+        }
+        for i in range(filas)
+    ])
+    db.commit()
+
+
+def normal(db) -> bytes:
+    disponibilidades = db.query(Disponibilidad).order_by(Disponibilidad.fecha).all()
+    validados = TypeAdapter(List[DisponibilidadResponse]).validate_python(
+        disponibilidades, from_attributes=True
+    )
+    return JSONResponse(jsonable_encoder(validados)).body
+
+
+def rapido(db) -> bytes:
+    filas = db.query(*columnas_schema(Disponibilidad, DisponibilidadResponse)).order_by(
+        Disponibilidad.fecha
+    ).all()
+    return RespuestaJSONRapida(filas_a_dicts(filas)).body
+
+
+def medir(funcion, filas: int, repeticiones: int) -> float:
+    """Mejor tiempo por fila (microsegundos) de varias repeticiones"""
+    mejor = float("inf")
+    for _ in range(repeticiones):
+        with SessionLocal() as db:
+            inicio = time.perf_counter()
+            funcion(db)
+            mejor = min(mejor, time.perf_counter() - inicio)
+    return mejor / filas * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--filas", type=int, default=20000)
+    parser.add_argument("--repeticiones", type=int, default=5)
+    args = parser.parse_args()
+
+    init_db()
+    with SessionLocal() as db:
+        poblar(db, args.filas)
+
+    coste_normal = medir(normal, args.filas, args.repeticiones)
+    coste_rapido = medir(rapido, args.filas, args.repeticiones)
+
+    print(f"Filas: {args.filas}")
+    print(f"  ORM + Pydantic + JSONResponse: {coste_normal:8.2f} us/fila")
+    print(f"  Columnas + RespuestaJSONRapida: {coste_rapido:8.2f} us/fila")
+    print(f"  Mejora: x{coste_normal / coste_rapido:.1f}")
+
+
+if __name__ == "__main__":
+    main()
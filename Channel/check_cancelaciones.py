@@ -0,0 +1,108 @@
+"""
+Channel Manager - Comprobación de permisos en la cancelación de reservas
+
+Crea dos cuentas con un hotel y una reserva cada una y comprueba que
+POST /reservas/{id}/cancelar y POST /reservas/cancelar:
+  - exigen token (401 sin él)
+  - responden 404 a las reservas de hoteles de otra cuenta, sin cancelarlas
+    ni devolver su stock (tampoco dentro de un lote con reservas propias)
+  - cancelan las reservas propias
+
+Termina con código de salida 1 si alguna comprobación falla.
+
+Uso:
+    python check_cancelaciones.py
+"""
+import os
+import sys
+import tempfile
+
+# Base de datos temporal propia, antes de importar la aplicación
+_tmp = tempfile.mkdtemp()
+os.environ["DATABASE_URL"] = f"sqlite:///{_tmp}/cancelaciones.db"
+
+from fastapi.testclient import TestClient  # noqa: E402
+
+from src.main import app  # noqa: E402
+
+FECHA_ENTRADA = "2026-03-01"
+FECHA_SALIDA = "2026-03-03"
+ULTIMA_NOCHE = "2026-03-02"
+
+
+def preparar_cuenta(client: TestClient, nombre: str) -> dict:
+    """Crear un usuario con un hotel, un tipo de habitación con stock y una reserva"""
+    email = f"{nombre}@channel.local"
+    client.post("/api/auth/crear-usuario", json={"email": email, "password": nombre}).raise_for_status()
+    token = client.post("/api/auth/login", json={"email": email, "password": nombre}).json()["access_token"]
+    headers = {"Authorization": f"Bearer {token}"}
+
+    hotel = client.post("/api/hoteles/", json={"nombre": f"Hotel {nombre}"}, headers=headers).json()
+    tipo = client.post("/api/habitaciones/", json={
+        "codigo": "DBL", "nombre": "Doble", "hotel_id": hotel["id"], "capacidad_max": 2
+    }, headers=headers).json()
+    client.post("/api/disponibilidad/bulk", json={
+        "tipo_habitacion_id": tipo["id"], "fecha_inicio": FECHA_ENTRADA, "fecha_fin": FECHA_SALIDA,
+        "cantidad_disponible": 5, "precio": 100
+    }, headers=headers).raise_for_status()
+    reserva = client.post("/api/reservas/crear", json={
+        "hotel_id": hotel["id"], "tipo_habitacion_id": tipo["id"],
+        "fecha_entrada": FECHA_ENTRADA, "fecha_salida": FECHA_SALIDA
+    })
+    reserva.raise_for_status()
+    return {"headers": headers, "tipo_id": tipo["id"], "reserva_id": reserva.json()["id"]}
+
+
+def stock(client: TestClient, cuenta: dict) -> list:
+    # Noches de la reserva: de la entrada al día anterior a la salida
+    respuesta = client.get("/api/disponibilidad/", params={
+        "tipo_habitacion_id": cuenta["tipo_id"], "fecha_inicio": FECHA_ENTRADA, "fecha_fin": ULTIMA_NOCHE
+    }, headers=cuenta["headers"])
+    return [d["cantidad_disponible"] for d in respuesta.json()]
+
+
+def main():
+    fallos = []
+
+    def comprobar(descripcion: str, correcto: bool):
+        print(f"{'OK   ' if correcto else 'ERROR'} {descripcion}")
+        if not correcto:
+            fallos.append(descripcion)
+
+    with TestClient(app) as client:
+        propia = preparar_cuenta(client, "propietaria")
+        ajena = preparar_cuenta(client, "ajena")
+        reserva_id = propia["reserva_id"]
+        stock_inicial = stock(client, propia)
+
+        respuesta = client.post(f"/api/reservas/{reserva_id}/cancelar")
+        comprobar("cancelar sin token -> 401", respuesta.status_code == 401)
+        respuesta = client.post("/api/reservas/cancelar", json={"reserva_ids": [reserva_id]})
+        comprobar("cancelación masiva sin token -> 401", respuesta.status_code == 401)
+
+        respuesta = client.post(f"/api/reservas/{reserva_id}/cancelar", headers=ajena["headers"])
+        comprobar("cancelar reserva de otra cuenta -> 404", respuesta.status_code == 404)
+        respuesta = client.post("/api/reservas/cancelar", json={
+            "reserva_ids": [ajena["reserva_id"], reserva_id]
+        }, headers=ajena["headers"])
+        comprobar("lote con una reserva de otra cuenta -> 404", respuesta.status_code == 404)
+
+        estado = client.get(f"/api/reservas/{reserva_id}").json()["estado"]
+        comprobar("la reserva ajena sigue confirmada", estado == "confirmada")
+        comprobar("el stock ajeno no cambia", stock(client, propia) == stock_inicial)
+        estado = client.get(f"/api/reservas/{ajena['reserva_id']}").json()["estado"]
+        comprobar("el lote rechazado no cancela la reserva propia", estado == "confirmada")
+
+        respuesta = client.post(f"/api/reservas/{reserva_id}/cancelar", headers=propia["headers"])
+        comprobar("cancelar reserva propia -> 200 cancelada",
+                  respuesta.status_code == 200 and respuesta.json()["estado"] == "cancelada")
+        comprobar("se devuelve el stock", stock(client, propia) == [n + 1 for n in stock_inicial])
+
+    if fallos:
+        print(f"\nERROR: {len(fallos)} comprobaciones fallidas")
+        sys.exit(1)
+    print("\nOK: la cancelación exige autenticación y reservas propias")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,143 @@
+"""
+Channel Manager - Comprobación de consultas SQL por endpoint
+
+Cuenta las sentencias SQL que ejecuta cada endpoint de lectura con un
+conjunto de datos pequeño y otro grande. Si el número de consultas de un
+endpoint crece con el tamaño del resultado (patrón N+1 por lazy loading al
+serializar relaciones), termina con código de salida 1.
+
+Uso:
+    python check_consultas.py
+    python check_consultas.py --pequeno 2 --grande 25 -v
+"""
+import argparse
+import os
+import sys
+import tempfile
+from datetime import date, timedelta
+
+# Base de datos temporal propia, antes de importar la aplicación
+_tmp = tempfile.mkdtemp()
+os.environ["DATABASE_URL"] = f"sqlite:///{_tmp}/consultas.db"
+
+from fastapi.testclient import TestClient  # noqa: E402
+from sqlalchemy import event  # noqa: E402
+
+from src.database import engine  # noqa: E402
+from src.main import app  # noqa: E402
+
+
+class ContadorSQL:
+    """Cuenta las sentencias enviadas al motor mientras está activo"""
+
+    def __init__(self):
+        self.activo = False
+        self.sentencias = []
+        event.listen(engine, "before_cursor_execute", self._registrar)
+
+    def _registrar(self, conn, cursor, statement, parameters, context, executemany):
+        if self.activo:
+            self.sentencias.append(statement)
+
+    def medir(self, funcion):
+        self.sentencias = []
+        self.activo = True
+        try:
+            funcion()
+        finally:
+            self.activo = False
+        return len(self.sentencias)
+
+
+def preparar_cuenta(client: TestClient, nombre: str, tamano: int) -> dict:
+    """Crear un usuario con `tamano` hoteles, tipos de habitación y noches"""
+    email = f"{nombre}@channel.local"
+    client.post("/api/auth/crear-usuario", json={"email": email, "password": nombre}).raise_for_status()
+    token = client.post("/api/auth/login", json={"email": email, "password": nombre}).json()["access_token"]
+    headers = {"Authorization": f"Bearer {token}"}
+
+    hotel_ids = []
+    tipo_ids = []
+    for h in range(tamano):
+        hotel = client.post("/api/hoteles/", json={"nombre": f"Hotel {nombre} {h}"}, headers=headers).json()
+        hotel_ids.append(hotel["id"])
+        for t in range(tamano):
+            tipo = client.post("/api/habitaciones/", json={
+                "codigo": f"T{t}",
+                "nombre": f"Tipo {t}",
+                "hotel_id": hotel["id"]
+            }, headers=headers).json()
+            tipo_ids.append(tipo["id"])
+
+    inicio = date(2026, 3, 1)
+    client.post("/api/disponibilidad/bulk", json={
+        "tipo_habitacion_id": tipo_ids[0],
+        "fecha_inicio": inicio.isoformat(),
+        "fecha_fin": (inicio + timedelta(days=tamano * 5)).isoformat(),
+        "cantidad_disponible": 3,
+        "precio": 100
+    }, headers=headers).raise_for_status()
+
+    return {"headers": headers, "hotel_id": hotel_ids[0], "tipo_id": tipo_ids[0]}
+
+
+def endpoints(cuenta: dict) -> dict:
+    """Endpoints de lectura a medir: nombre -> (ruta, parámetros, es_listado)"""
+    return {
+        "GET /hoteles/": ("/api/hoteles/", None, True),
+        "GET /hoteles/{id}": (f"/api/hoteles/{cuenta['hotel_id']}", None, True),
+        "GET /habitaciones/": ("/api/habitaciones/", None, True),
+        "GET /habitaciones/{id}": (f"/api/habitaciones/{cuenta['tipo_id']}", None, False),
+        "GET /disponibilidad/": ("/api/disponibilidad/", {"tipo_habitacion_id": cuenta["tipo_id"]}, True),
+    }
+
+
+def contar(client: TestClient, contador: ContadorSQL, cuenta: dict) -> dict:
+    resultados = {}
+    for nombre, (ruta, params, _) in endpoints(cuenta).items():
+        peticion = lambda: client.get(ruta, params=params, headers=cuenta["headers"]).raise_for_status()
+        peticion()  # Calentar cachés (usuario autenticado, etc.)
+        resultados[nombre] = contador.medir(peticion)
+    return resultados
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--pequeno", type=int, default=2, help="Hoteles y tipos por hotel del conjunto pequeño")
+    parser.add_argument("--grande", type=int, default=12, help="Hoteles y tipos por hotel del conjunto grande")
+    parser.add_argument("-v", "--verbose", action="store_true", help="Mostrar las sentencias del conjunto grande")
+    args = parser.parse_args()
+
+    contador = ContadorSQL()
+    with TestClient(app) as client:
+        pequena = preparar_cuenta(client, "pequeno", args.pequeno)
+        grande = preparar_cuenta(client, "grande", args.grande)
+
+        consultas_pequena = contar(client, contador, pequena)
+        consultas_grande = contar(client, contador, grande)
+
+        if args.verbose:
+            for nombre, (ruta, params, _) in endpoints(grande).items():
+                contador.medir(lambda: client.get(ruta, params=params, headers=grande["headers"]))
+                print(f"\n{nombre}")
+                for sentencia in contador.sentencias:
+                    print("   ", " ".join(sentencia.split())[:140])
+            print()
+
+    fallos = []
+    print(f"{'Endpoint':<26}{'pequeño':>9}{'grande':>9}")
+    for nombre, (_, _, es_listado) in endpoints(pequena).items():
+        n_pequena, n_grande = consultas_pequena[nombre], consultas_grande[nombre]
+        crece = n_grande > n_pequena
+        print(f"{nombre:<26}{n_pequena:>9}{n_grande:>9}{'  <-- N+1' if crece else ''}")
+        if crece and es_listado:
+            fallos.append(nombre)
+
+    if fallos:
+        print(f"\nERROR: el número de consultas crece con el resultado en: {', '.join(fallos)}")
+        sys.exit(1)
+    print("\nOK: número de consultas constante en todos los endpoints")
+
+
+if __name__ == "__main__":
+    main()
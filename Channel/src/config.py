@@ -9,6 +9,64 @@ load_dotenv()
 # Base de datos
 DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///./channel.db")
 
+# Modo asíncrono: las rutas de alta concurrencia usan AsyncSession
+# (requiere aiosqlite, asyncpg o aiomysql según DATABASE_URL)
+DB_ASYNC = os.getenv("DB_ASYNC", "false").lower() in ("1", "true", "yes")
+
+# Pool de conexiones
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", 5))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", 10))
+DB_POOL_TIMEOUT = int(os.getenv("DB_POOL_TIMEOUT", 30))  # segundos
+DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", 1800))  # segundos, -1 = nunca
+DB_POOL_PRE_PING = os.getenv("DB_POOL_PRE_PING", "true").lower() in ("1", "true", "yes")
+
+# Perfil de rendimiento SQLite (se aplica a cada conexión)
+SQLITE_WAL = os.getenv("SQLITE_WAL", "true").lower() in ("1", "true", "yes")
+SQLITE_SYNCHRONOUS = os.getenv("SQLITE_SYNCHRONOUS", "NORMAL")
+SQLITE_MMAP_SIZE = int(os.getenv("SQLITE_MMAP_SIZE", 268435456))  # bytes, 0 = desactivado
+SQLITE_BUSY_TIMEOUT = int(os.getenv("SQLITE_BUSY_TIMEOUT", 5000))  # milisegundos
+
+# Caché de la búsqueda pública de disponibilidad (TTL 0 = desactivada)
+BUSQUEDA_CACHE_TTL = float(os.getenv("BUSQUEDA_CACHE_TTL", 30))  # segundos
+BUSQUEDA_CACHE_MAX = int(os.getenv("BUSQUEDA_CACHE_MAX", 1024))  # entradas
+
+# Inventario en memoria para la búsqueda pública. Cada proceso mantiene su
+# propia copia y solo ve sus propias escrituras: usar con un único worker.
+INVENTARIO_EN_MEMORIA = os.getenv("INVENTARIO_EN_MEMORIA", "false").lower() in ("1", "true", "yes")
+
+# Caché de tokens verificados -> usuario en get_current_user (TTL 0 = desactivada)
+AUTH_CACHE_TTL = float(os.getenv("AUTH_CACHE_TTL", 60))  # segundos
+AUTH_CACHE_MAX = int(os.getenv("AUTH_CACHE_MAX", 1024))  # entradas
+
+# Serialización rápida de listados: consultas por columnas + orjson, sin
+# revalidar con Pydantic filas que vienen directamente de la BD
+RESPUESTAS_RAPIDAS = os.getenv("RESPUESTAS_RAPIDAS", "false").lower() in ("1", "true", "yes")
+
+# Claves de idempotencia de POST /reservas/crear (cabecera Idempotency-Key)
+IDEMPOTENCIA_TTL_HORAS = float(os.getenv("IDEMPOTENCIA_TTL_HORAS", 24))
+IDEMPOTENCIA_LIMPIEZA_SEGUNDOS = float(os.getenv("IDEMPOTENCIA_LIMPIEZA_SEGUNDOS", 3600))
+
+# Líneas máximas por reserva de grupo (POST /reservas/lote)
+RESERVAS_LOTE_MAX = int(os.getenv("RESERVAS_LOTE_MAX", 100))
+
+# Reservas máximas por cancelación masiva (POST /reservas/cancelar)
+CANCELACIONES_LOTE_MAX = int(os.getenv("CANCELACIONES_LOTE_MAX", 500))
+
+# Días máximos por rango de una carga ARI (POST /disponibilidad/bulk)
+ARI_RANGO_MAX_DIAS = int(os.getenv("ARI_RANGO_MAX_DIAS", 730))
+
+# Registro de cambios (GET /api/changes)
+CAMBIOS_LIMITE_MAX = int(os.getenv("CAMBIOS_LIMITE_MAX", 1000))  # cambios por respuesta
+CAMBIOS_ESPERA_MAX = float(os.getenv("CAMBIOS_ESPERA_MAX", 60))  # segundos de long-poll
+# Intervalo de reconsulta durante el long-poll, para ver cambios de otros workers
+CAMBIOS_POLL_SEGUNDOS = float(os.getenv("CAMBIOS_POLL_SEGUNDOS", 1))
+
+# Perfilado SQL por petición: en modo DEBUG las respuestas incluyen cabeceras
+# X-SQL-* con el número de consultas, el tiempo en BD y la más lenta
+DEBUG = os.getenv("DEBUG", "false").lower() in ("1", "true", "yes")
+SQL_LENTA_MS = float(os.getenv("SQL_LENTA_MS", 200))  # umbral de log, 0 = desactivado
+SQL_LENTAS_MAX = int(os.getenv("SQL_LENTAS_MAX", 3))  # sentencias más lentas guardadas por petición
+
 # Servidor
 HOST = os.getenv("HOST", "127.0.0.1")
 PORT = int(os.getenv("PORT", 8001))
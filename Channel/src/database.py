@@ -1,16 +1,67 @@
 """
 Channel Manager - Configuración de Base de Datos
 """
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event, inspect, text
+from sqlalchemy.engine import make_url
 from sqlalchemy.orm import sessionmaker, declarative_base
+from starlette.concurrency import run_in_threadpool
+
+from .config import (
+    DATABASE_URL, DB_ASYNC,
+    DB_POOL_SIZE, DB_MAX_OVERFLOW, DB_POOL_TIMEOUT, DB_POOL_RECYCLE, DB_POOL_PRE_PING,
+    SQLITE_WAL, SQLITE_SYNCHRONOUS, SQLITE_MMAP_SIZE, SQLITE_BUSY_TIMEOUT
+)
+from .metrics import instrumentar_motor, registrar_pool
+
+
+def opciones_motor(url: str) -> dict:
+    """Argumentos de create_engine según el motor y la configuración del pool"""
+    url = make_url(url)
+    opciones = {"pool_pre_ping": DB_POOL_PRE_PING}
+
+    if url.get_backend_name() == "sqlite":
+        opciones["connect_args"] = {"check_same_thread": False}
+        # Las bases de datos en memoria usan un pool de una conexión por hilo
+        if url.database in (None, "", ":memory:"):
+            return opciones
+
+    opciones.update(
+        pool_size=DB_POOL_SIZE,
+        max_overflow=DB_MAX_OVERFLOW,
+        pool_timeout=DB_POOL_TIMEOUT,
+        pool_recycle=DB_POOL_RECYCLE
+    )
+    return opciones
+
+
+def conexiones_maximas(opciones: dict) -> int:
+    """Conexiones simultáneas que admite el pool (0 si no está acotado)"""
+    return opciones.get("pool_size", 0) + opciones.get("max_overflow", 0)
+
+
+def aplicar_perfil_sqlite(motor):
+    """
+    Configurar cada conexión SQLite nueva: WAL para que los lectores no se
+    bloqueen con el escritor, synchronous, mmap y busy timeout.
+    """
+    @event.listens_for(motor, "connect")
+    def _pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        if SQLITE_WAL:
+            cursor.execute("PRAGMA journal_mode=WAL")
+        cursor.execute(f"PRAGMA synchronous={SQLITE_SYNCHRONOUS}")
+        cursor.execute(f"PRAGMA mmap_size={SQLITE_MMAP_SIZE}")
+        cursor.execute(f"PRAGMA busy_timeout={SQLITE_BUSY_TIMEOUT}")
+        cursor.close()
 
-from .config import DATABASE_URL
 
 # Crear motor de SQLAlchemy
-engine = create_engine(
-    DATABASE_URL,
-    connect_args={"check_same_thread": False}  # Solo para SQLite
-)
+engine = create_engine(DATABASE_URL, **opciones_motor(DATABASE_URL))
+
+if engine.dialect.name == "sqlite":
+    aplicar_perfil_sqlite(engine)
+instrumentar_motor(engine)
+registrar_pool(engine, "sync", conexiones_maximas(opciones_motor(DATABASE_URL)))
 
 # Crear sesión
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
@@ -18,6 +69,39 @@ SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 # Base para modelos
 Base = declarative_base()
 
+# Drivers asíncronos por motor
+DRIVERS_ASYNC = {
+    "sqlite": "sqlite+aiosqlite",
+    "postgresql": "postgresql+asyncpg",
+    "mysql": "mysql+aiomysql",
+}
+
+
+def url_asincrona(url: str) -> str:
+    """Traducir DATABASE_URL a la URL equivalente con driver asíncrono"""
+    url = make_url(url)
+    driver = DRIVERS_ASYNC.get(url.get_backend_name())
+    if driver is None:
+        raise ValueError(f"Motor sin driver asíncrono soportado: {url.get_backend_name()}")
+    return url.set(drivername=driver).render_as_string(hide_password=False)
+
+
+# Motor y sesión asíncronos (solo con DB_ASYNC activado)
+async_engine = None
+AsyncSessionLocal = None
+
+if DB_ASYNC:
+    from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
+
+    async_engine = create_async_engine(url_asincrona(DATABASE_URL), **opciones_motor(DATABASE_URL))
+    if async_engine.dialect.name == "sqlite":
+        aplicar_perfil_sqlite(async_engine.sync_engine)
+    instrumentar_motor(async_engine.sync_engine)
+    registrar_pool(async_engine.sync_engine, "async", conexiones_maximas(opciones_motor(DATABASE_URL)))
+    AsyncSessionLocal = async_sessionmaker(
+        bind=async_engine, autocommit=False, autoflush=False, expire_on_commit=False
+    )
+
 
 def get_db():
     """Dependency para obtener sesión de BD"""
@@ -28,7 +112,93 @@ def get_db():
         db.close()
 
 
+class SesionEnHilo:
+    """
+    Envoltorio de una Session síncrona con la interfaz run_sync de
+    AsyncSession. Ejecuta el trabajo en el threadpool para que las rutas
+    async no bloqueen el event loop cuando DB_ASYNC está desactivado.
+    """
+
+    def __init__(self, session):
+        self.session = session
+
+    async def run_sync(self, fn, *args, **kwargs):
+        return await run_in_threadpool(fn, self.session, *args, **kwargs)
+
+
+async def get_async_db():
+    """
+    Dependency para rutas async. Con DB_ASYNC cede una AsyncSession; si no,
+    una Session síncrona envuelta en SesionEnHilo. En ambos casos las rutas
+    hacen ``await db.run_sync(funcion, ...)``.
+    """
+    if AsyncSessionLocal is not None:
+        async with AsyncSessionLocal() as session:
+            yield session
+    else:
+        db = SessionLocal()
+        try:
+            yield SesionEnHilo(db)
+        finally:
+            await run_in_threadpool(db.close)
+
+
+async def close_db():
+    """Liberar las conexiones del motor asíncrono"""
+    if async_engine is not None:
+        await async_engine.dispose()
+
+
 def init_db():
     """Inicializar base de datos"""
     from . import models  # noqa
     Base.metadata.create_all(bind=engine)
+    migrar_db()
+
+
+def migrar_db():
+    """
+    Aplicar sobre bases de datos existentes (p. ej. channel.db) los cambios
+    de esquema que create_all no realiza en tablas ya creadas.
+    """
+    from .models import Disponibilidad
+    from .models.models import Cambio
+
+    inspector = inspect(engine)
+
+    # Índice único (tipo_habitacion_id, fecha) de Disponibilidad
+    indice = next(
+        i for i in Disponibilidad.__table__.indexes
+        if i.name == "ux_disponibilidad_tipo_fecha"
+    )
+    existentes = {i["name"] for i in inspector.get_indexes("disponibilidad")}
+    if indice.name not in existentes:
+        with engine.begin() as conn:
+            # Eliminar duplicados previos conservando la fila más antigua,
+            # que es la que leían las rutas anteriores con .first()
+            conn.execute(text("""
+                DELETE FROM disponibilidad
+                WHERE id NOT IN (
+                    SELECT id FROM (
+                        SELECT MIN(id) AS id
+                        FROM disponibilidad
+                        GROUP BY tipo_habitacion_id, fecha
+                    ) AS conservar
+                )
+            """))
+            indice.create(conn)
+
+    # Propietario en el registro de cambios, rellenado desde los hoteles
+    # que aún existen
+    columnas = {c["name"] for c in inspector.get_columns("cambios")}
+    if "user_id" not in columnas:
+        with engine.begin() as conn:
+            conn.execute(text("ALTER TABLE cambios ADD COLUMN user_id INTEGER"))
+            conn.execute(text("""
+                UPDATE cambios SET user_id = (
+                    SELECT hoteles.user_id FROM hoteles WHERE hoteles.id = cambios.hotel_id
+                )
+            """))
+            for indice in Cambio.__table__.indexes:
+                if indice.columns.keys() == ["user_id"]:
+                    indice.create(conn)
@@ -1,11 +1,27 @@
 """
 Channel Manager - Backend FastAPI
 """
-from fastapi import FastAPI
+import logging
+import time
+
+from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import PlainTextResponse
+
+from .config import INVENTARIO_EN_MEMORIA, RESPUESTAS_RAPIDAS, DEBUG
+from .database import init_db, close_db, SessionLocal
+from .metrics import (
+    PerfilSQL, perfil_actual, plantilla_ruta, observar_peticion, peticiones_en_curso,
+    registrar_cache, registro
+)
+from .routes import (
+    auth_router, hoteles_router, habitaciones_router, disponibilidad_router, reservas_router, cambios_router
+)
+from . import responses
+from .routes.auth import cache_usuarios
+from .services import inventario_memoria, cache_busqueda, limpiar_claves_expiradas
 
-from .database import init_db
-from .routes import auth_router, hoteles_router, habitaciones_router, disponibilidad_router, reservas_router
+logger = logging.getLogger("channel")
 
 # Crear aplicación FastAPI
 app = FastAPI(
@@ -23,18 +39,68 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+
+
+@app.middleware("http")
+async def perfilar_peticion(request: Request, call_next):
+    """
+    Medir cada petición: duración, número de sentencias SQL y tiempo en BD.
+    Se acumulan en histogramas por ruta (GET /metrics) y, en modo DEBUG, se
+    devuelven también como cabeceras X-SQL-*.
+    """
+    perfil = PerfilSQL()
+    token = perfil_actual.set(perfil)
+    peticiones_en_curso.inc()
+    inicio = time.perf_counter()
+    try:
+        response = await call_next(request)
+    finally:
+        peticiones_en_curso.dec()
+        perfil_actual.reset(token)
+    duracion = time.perf_counter() - inicio
+
+    observar_peticion(request.method, plantilla_ruta(request.scope), duracion, perfil)
+
+    if DEBUG:
+        response.headers["X-SQL-Consultas"] = str(perfil.consultas)
+        response.headers["X-SQL-Tiempo-Ms"] = f"{perfil.tiempo_db * 1000:.2f}"
+        if perfil.lentas:
+            duracion_lenta, sentencia = perfil.mas_lentas[0]
+            response.headers["X-SQL-Mas-Lenta-Ms"] = f"{duracion_lenta * 1000:.2f}"
+            response.headers["X-SQL-Mas-Lenta"] = " ".join(sentencia.split())[:200]
+    return response
+
+
+# Aciertos de las cachés en /metrics
+registrar_cache("busqueda", cache_busqueda)
+registrar_cache("usuarios", cache_usuarios)
+
 # Incluir routers
 app.include_router(auth_router, prefix="/api")
 app.include_router(hoteles_router, prefix="/api")
 app.include_router(habitaciones_router, prefix="/api")
 app.include_router(disponibilidad_router, prefix="/api")
 app.include_router(reservas_router, prefix="/api")
+app.include_router(cambios_router, prefix="/api")
 
 
 @app.on_event("startup")
 def startup():
-    """Evento de inicio - Inicializar BD"""
+    """Evento de inicio - Inicializar BD, purgar claves de idempotencia y cargar el inventario en memoria"""
     init_db()
+    if RESPUESTAS_RAPIDAS and responses.orjson is None:
+        logger.warning("RESPUESTAS_RAPIDAS activado sin orjson instalado: se usa json de la librería estándar")
+    with SessionLocal() as db:
+        limpiar_claves_expiradas(db, forzar=True)
+    if INVENTARIO_EN_MEMORIA:
+        with SessionLocal() as db:
+            inventario_memoria.cargar(db)
+
+
+@app.on_event("shutdown")
+async def shutdown():
+    """Evento de cierre - Liberar conexiones asíncronas"""
+    await close_db()
 
 
 @app.get("/")
@@ -54,6 +120,12 @@ def health_check():
     return {"status": "ok"}
 
 
+@app.get("/metrics", response_class=PlainTextResponse)
+def metrics():
+    """Métricas del proceso en formato de texto Prometheus"""
+    return PlainTextResponse(registro.exponer(), media_type="text/plain; version=0.0.4")
+
+
 # Punto de entrada para ejecución directa
 if __name__ == "__main__":
     import uvicorn
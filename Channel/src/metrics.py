@@ -0,0 +1,353 @@
+"""
+Channel Manager - Métricas y perfilado de consultas SQL por petición
+
+- PerfilSQL: número de sentencias, tiempo total en BD y sentencias más
+  lentas de la petición en curso (vía contextvars, así también lo ven las
+  rutas síncronas que FastAPI ejecuta en el threadpool).
+- instrumentar_motor: engancha before/after_cursor_execute de un Engine.
+- Histograma, Contador, Gauge y MetricaCalculada: métricas agregadas en
+  memoria del proceso y expuestas en formato de texto Prometheus por
+  ``GET /metrics`` (latencia por ruta, peticiones en curso, reservas por
+  resultado, uso del pool de conexiones y aciertos de las cachés).
+"""
+import bisect
+import heapq
+import logging
+import threading
+import time
+from contextvars import ContextVar
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from sqlalchemy import event
+
+from .config import SQL_LENTA_MS, SQL_LENTAS_MAX
+
+logger = logging.getLogger("channel.sql")
+
+
+class PerfilSQL:
+    """Estadísticas SQL de una petición"""
+
+    def __init__(self):
+        self.consultas = 0
+        self.tiempo_db = 0.0  # segundos
+        self.lentas: List[Tuple[float, str]] = []  # montículo (duración, sentencia)
+
+    def registrar(self, duracion: float, sentencia: str):
+        self.consultas += 1
+        self.tiempo_db += duracion
+        if SQL_LENTAS_MAX <= 0:
+            return
+        if len(self.lentas) < SQL_LENTAS_MAX:
+            heapq.heappush(self.lentas, (duracion, sentencia))
+        elif duracion > self.lentas[0][0]:
+            heapq.heapreplace(self.lentas, (duracion, sentencia))
+
+    @property
+    def mas_lentas(self) -> List[Tuple[float, str]]:
+        return sorted(self.lentas, reverse=True)
+
+
+perfil_actual: ContextVar[Optional[PerfilSQL]] = ContextVar("perfil_sql", default=None)
+
+
+def instrumentar_motor(motor):
+    """
+    Medir cada sentencia del motor y acumularla en el PerfilSQL de la
+    petición en curso. Las sentencias que superan SQL_LENTA_MS se registran
+    en el logger ``channel.sql`` aunque no haya petición activa.
+    """
+    # Las sentencias de una conexión se ejecutan de una en una: basta con un
+    # único instante de inicio por conexión (no una pila)
+    @event.listens_for(motor, "before_cursor_execute")
+    def _inicio(conn, cursor, statement, parameters, context, executemany):
+        conn.info["inicio_consulta"] = time.perf_counter()
+
+    @event.listens_for(motor, "handle_error")
+    def _error(contexto):
+        # Una sentencia que falla no llega a after_cursor_execute
+        if contexto.connection is not None:
+            contexto.connection.info.pop("inicio_consulta", None)
+
+    @event.listens_for(motor, "after_cursor_execute")
+    def _fin(conn, cursor, statement, parameters, context, executemany):
+        inicio = conn.info.pop("inicio_consulta", None)
+        if inicio is None:
+            return
+        duracion = time.perf_counter() - inicio
+        perfil = perfil_actual.get()
+        if perfil is not None:
+            perfil.registrar(duracion, statement)
+        if SQL_LENTA_MS > 0 and duracion * 1000 >= SQL_LENTA_MS:
+            logger.warning("Consulta lenta (%.1f ms): %s", duracion * 1000, " ".join(statement.split()))
+
+
+# ============== Histogramas en formato Prometheus ==============
+
+BUCKETS_SEGUNDOS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+BUCKETS_CONSULTAS = (1, 2, 3, 5, 10, 20, 50, 100, 250)
+
+
+def _etiquetas(nombres: Sequence[str], valores: Sequence[str], extra: str = "") -> str:
+    pares = [f'{n}="{_escapar(v)}"' for n, v in zip(nombres, valores)]
+    if extra:
+        pares.append(extra)
+    return "{" + ",".join(pares) + "}" if pares else ""
+
+
+def _escapar(valor: str) -> str:
+    return str(valor).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _numero(valor: float) -> str:
+    return repr(float(valor)) if isinstance(valor, float) else str(valor)
+
+
+class Histograma:
+    """Histograma acumulativo con etiquetas, seguro entre hilos"""
+
+    tipo = "histogram"
+
+    def __init__(self, nombre: str, ayuda: str, etiquetas: Sequence[str], buckets: Sequence[float]):
+        self.nombre = nombre
+        self.ayuda = ayuda
+        self.etiquetas = tuple(etiquetas)
+        self.buckets = tuple(buckets)
+        self._series: Dict[tuple, list] = {}  # valores -> [cuentas por bucket, suma, total]
+        self._lock = threading.Lock()
+
+    def observar(self, valor: float, *etiquetas: str):
+        indice = bisect.bisect_left(self.buckets, valor)
+        with self._lock:
+            serie = self._series.get(etiquetas)
+            if serie is None:
+                serie = self._series[etiquetas] = [[0] * len(self.buckets), 0.0, 0]
+            if indice < len(self.buckets):
+                serie[0][indice] += 1
+            serie[1] += valor
+            serie[2] += 1
+
+    def exponer(self) -> List[str]:
+        lineas = [f"# HELP {self.nombre} {self.ayuda}", f"# TYPE {self.nombre} {self.tipo}"]
+        with self._lock:
+            series = [(k, list(v[0]), v[1], v[2]) for k, v in sorted(self._series.items())]
+        for valores, cuentas, suma, total in series:
+            acumulado = 0
+            for limite, cuenta in zip(self.buckets, cuentas):
+                acumulado += cuenta
+                etiquetas = _etiquetas(self.etiquetas, valores, f'le="{_numero(limite)}"')
+                lineas.append(f"{self.nombre}_bucket{etiquetas} {acumulado}")
+            etiquetas = _etiquetas(self.etiquetas, valores, 'le="+Inf"')
+            lineas.append(f"{self.nombre}_bucket{etiquetas} {total}")
+            etiquetas = _etiquetas(self.etiquetas, valores)
+            lineas.append(f"{self.nombre}_sum{etiquetas} {_numero(suma)}")
+            lineas.append(f"{self.nombre}_count{etiquetas} {total}")
+        return lineas
+
+
+class Contador:
+    """Contador monótono con etiquetas, seguro entre hilos"""
+
+    tipo = "counter"
+
+    def __init__(self, nombre: str, ayuda: str, etiquetas: Sequence[str] = ()):
+        self.nombre = nombre
+        self.ayuda = ayuda
+        self.etiquetas = tuple(etiquetas)
+        self._valores: Dict[tuple, float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, *etiquetas: str, cantidad: float = 1):
+        with self._lock:
+            self._valores[etiquetas] = self._valores.get(etiquetas, 0) + cantidad
+
+    def muestras(self) -> List[Tuple[tuple, float]]:
+        with self._lock:
+            return sorted(self._valores.items())
+
+    def exponer(self) -> List[str]:
+        lineas = [f"# HELP {self.nombre} {self.ayuda}", f"# TYPE {self.nombre} {self.tipo}"]
+        for valores, valor in self.muestras():
+            lineas.append(f"{self.nombre}{_etiquetas(self.etiquetas, valores)} {_numero(valor)}")
+        return lineas
+
+
+class Gauge(Contador):
+    """Valor que sube y baja (peticiones en curso, conexiones en uso...)"""
+
+    tipo = "gauge"
+
+    def dec(self, *etiquetas: str, cantidad: float = 1):
+        self.inc(*etiquetas, cantidad=-cantidad)
+
+    def set(self, valor: float, *etiquetas: str):
+        with self._lock:
+            self._valores[etiquetas] = valor
+
+
+class MetricaCalculada(Contador):
+    """
+    Métrica cuyo valor se lee en el momento de exponerla, a partir de una
+    función que devuelve pares (valores de etiquetas, valor). Para estado que
+    ya mantiene otro objeto: el pool de conexiones, las cachés...
+    """
+
+    def __init__(self, nombre: str, ayuda: str, etiquetas: Sequence[str],
+                 leer: Callable[[], Iterable[Tuple[tuple, float]]], tipo: str = "gauge"):
+        super().__init__(nombre, ayuda, etiquetas)
+        self.tipo = tipo
+        self._leer = leer
+
+    def muestras(self) -> List[Tuple[tuple, float]]:
+        return sorted(self._leer())
+
+
+class RegistroMetricas:
+    """Conjunto de métricas del proceso, renderizable en formato Prometheus"""
+
+    def __init__(self):
+        self.metricas = []
+
+    def registrar(self, metrica):
+        self.metricas.append(metrica)
+        return metrica
+
+    def exponer(self) -> str:
+        lineas = []
+        for metrica in self.metricas:
+            lineas.extend(metrica.exponer())
+        return "\n".join(lineas) + "\n"
+
+
+registro = RegistroMetricas()
+
+ETIQUETAS_RUTA = ("method", "route")
+
+duracion_peticiones = registro.registrar(Histograma(
+    "channel_http_request_duration_seconds",
+    "Duración de las peticiones HTTP por ruta",
+    ETIQUETAS_RUTA, BUCKETS_SEGUNDOS
+))
+consultas_peticion = registro.registrar(Histograma(
+    "channel_db_queries_per_request",
+    "Sentencias SQL ejecutadas por petición",
+    ETIQUETAS_RUTA, BUCKETS_CONSULTAS
+))
+tiempo_db_peticion = registro.registrar(Histograma(
+    "channel_db_time_seconds",
+    "Tiempo total en la base de datos por petición",
+    ETIQUETAS_RUTA, BUCKETS_SEGUNDOS
+))
+
+peticiones_en_curso = registro.registrar(Gauge(
+    "channel_http_requests_in_flight",
+    "Peticiones HTTP en curso"
+))
+reservas_total = registro.registrar(Contador(
+    "channel_reservas_total",
+    "Intentos de reserva en POST /reservas/crear por código de estado (201 creada, 409 sin stock)",
+    ("status",)
+))
+
+reservas_lote_total = registro.registrar(Contador(
+    "channel_reservas_lote_total",
+    "Intentos de reserva de grupo en POST /reservas/lote por código de estado",
+    ("status",)
+))
+reservas_repetidas_total = registro.registrar(Contador(
+    "channel_reservas_repetidas_total",
+    "Reintentos de reserva respondidos desde su Idempotency-Key"
+))
+
+
+# ============== Pool de conexiones y cachés ==============
+
+_pools: Dict[str, Tuple[object, int]] = {}  # nombre -> (pool, conexiones máximas)
+_caches: Dict[str, object] = {}
+
+
+def registrar_pool(motor, nombre: str, maximo: int = 0):
+    """Exponer el uso del pool de conexiones de un Engine (maximo = pool_size + max_overflow)"""
+    _pools[nombre] = (motor.pool, maximo)
+
+
+def registrar_cache(nombre: str, cache):
+    """Exponer aciertos, fallos y tamaño de una CacheTTL"""
+    _caches[nombre] = cache
+
+
+def _leer_pool(metodo: str):
+    def leer():
+        for nombre, (pool, _) in _pools.items():
+            funcion = getattr(pool, metodo, None)
+            if funcion is not None:
+                # overflow() es negativo mientras el pool no está lleno
+                yield (nombre,), max(funcion(), 0) if metodo == "overflow" else funcion()
+    return leer
+
+
+def _leer_pool_maximo():
+    for nombre, (_, maximo) in _pools.items():
+        if maximo:
+            yield (nombre,), maximo
+
+
+def _leer_cache(campo: str):
+    def leer():
+        for nombre, cache in _caches.items():
+            yield (nombre,), cache.estadisticas()[campo]
+    return leer
+
+
+for _metodo, _ayuda in (
+    ("size", "Tamaño configurado del pool de conexiones"),
+    ("checkedout", "Conexiones del pool en uso"),
+    ("checkedin", "Conexiones del pool libres"),
+    ("overflow", "Conexiones abiertas por encima de pool_size"),
+):
+    registro.registrar(MetricaCalculada(
+        f"channel_db_pool_{_metodo.replace('checked', 'checked_')}", _ayuda, ("pool",), _leer_pool(_metodo)
+    ))
+registro.registrar(MetricaCalculada(
+    "channel_db_pool_max", "Conexiones máximas del pool (pool_size + max_overflow)", ("pool",), _leer_pool_maximo
+))
+
+for _campo, _tipo, _ayuda in (
+    ("hits", "counter", "Aciertos de la caché"),
+    ("misses", "counter", "Fallos de la caché"),
+    ("hit_rate", "gauge", "Proporción de aciertos de la caché desde el arranque"),
+    ("entradas", "gauge", "Entradas vigentes en la caché"),
+    ("desalojos", "counter", "Entradas desalojadas por tamaño (LRU)"),
+    ("invalidaciones", "counter", "Entradas invalidadas por escrituras"),
+):
+    _sufijo = "_total" if _tipo == "counter" else ""
+    registro.registrar(MetricaCalculada(
+        f"channel_cache_{_campo}{_sufijo}", _ayuda, ("cache",), _leer_cache(_campo), tipo=_tipo
+    ))
+
+
+def plantilla_ruta(scope: dict) -> str:
+    """
+    Plantilla de la ruta atendida (/api/hoteles/{hotel_id}) para no crear
+    una serie por ID. Según la versión de FastAPI, ``route.path`` de un
+    router incluido puede no llevar el prefijo: se recupera de la ruta real.
+    """
+    ruta = scope.get("route")
+    if ruta is None or not hasattr(ruta, "path_regex"):
+        return "desconocida"
+    path = scope.get("path", "")
+    if ruta.path_regex.match(path):
+        return ruta.path
+    inicio = path.find("/", 1)
+    while inicio != -1:
+        if ruta.path_regex.match(path[inicio:]):
+            return path[:inicio] + ruta.path
+        inicio = path.find("/", inicio + 1)
+    return ruta.path
+
+
+def observar_peticion(metodo: str, ruta: str, duracion: float, perfil: PerfilSQL):
+    """Acumular en los histogramas por ruta una petición terminada"""
+    duracion_peticiones.observar(duracion, metodo, ruta)
+    consultas_peticion.observar(perfil.consultas, metodo, ruta)
+    tiempo_db_peticion.observar(perfil.tiempo_db, metodo, ruta)
@@ -2,7 +2,7 @@
 Channel Manager - Modelos SQLAlchemy
 """
 from datetime import datetime, date
-from sqlalchemy import Column, Integer, String, Float, DateTime, Date, ForeignKey, Boolean
+from sqlalchemy import Column, Integer, String, Float, DateTime, Date, ForeignKey, Boolean, Index, Text
 from sqlalchemy.orm import relationship
 
 from ..database import Base
@@ -84,6 +84,13 @@ class Disponibilidad(Base):
     # Relaciones
     tipo_habitacion = relationship("TipoHabitacion", back_populates="disponibilidades")
 
+    # Una sola fila por tipo de habitación y fecha; sirve también de índice
+    # para todas las consultas por (tipo_habitacion_id, fecha) y como
+    # objetivo de los upserts (INSERT ... ON CONFLICT DO UPDATE)
+    __table_args__ = (
+        Index("ux_disponibilidad_tipo_fecha", "tipo_habitacion_id", "fecha", unique=True),
+    )
+
 
 class Reserva(Base):
     """
@@ -122,3 +129,49 @@ class Reserva(Base):
     # Relaciones
     hotel = relationship("Hotel", back_populates="reservas")
     tipo_habitacion = relationship("TipoHabitacion", back_populates="reservas")
+
+
+class ClaveIdempotencia(Base):
+    """
+    Modelo de Clave de Idempotencia - Respuesta guardada de una petición
+    con cabecera Idempotency-Key, para que los reintentos de los canales
+    reciban la respuesta original sin repetir la operación.
+    """
+    __tablename__ = "claves_idempotencia"
+
+    id = Column(Integer, primary_key=True, index=True)
+    clave = Column(String(255), unique=True, nullable=False)
+    hash_peticion = Column(String(64), nullable=False)  # SHA-256 del cuerpo
+    status_code = Column(Integer, nullable=False)
+    respuesta = Column(Text, nullable=False)  # JSON
+    
+    # Timestamps
+    created_at = Column(DateTime, default=datetime.utcnow)
+    expires_at = Column(DateTime, nullable=False, index=True)
+
+
+class Cambio(Base):
+    """
+    Modelo de Cambio - Registro secuencial de escrituras sobre
+    Hotel, Disponibilidad, Reserva y TipoHabitacion, para que los sistemas
+    externos se sincronicen de forma incremental (GET /api/changes).
+    """
+    __tablename__ = "cambios"
+    # AUTOINCREMENT en SQLite: seq nunca se reutiliza aunque se purguen filas
+    __table_args__ = {"sqlite_autoincrement": True}
+
+    seq = Column(Integer, primary_key=True, autoincrement=True)
+    entidad = Column(String(30), nullable=False)  # hotel, disponibilidad, reserva, tipo_habitacion
+    operacion = Column(String(20), nullable=False)  # crear, actualizar, eliminar, cancelar
+    entidad_id = Column(Integer, nullable=True)
+    hotel_id = Column(Integer, nullable=False, index=True)
+    tipo_habitacion_id = Column(Integer, nullable=True)
+    # Propietario del hotel al registrar el cambio: las bajas de un hotel
+    # eliminado se siguen devolviendo a su cuenta
+    user_id = Column(Integer, nullable=True, index=True)
+    
+    # Noches afectadas [fecha_desde, fecha_hasta], ambas incluidas
+    fecha_desde = Column(Date, nullable=True)
+    fecha_hasta = Column(Date, nullable=True)
+    
+    created_at = Column(DateTime, default=datetime.utcnow)
@@ -0,0 +1,35 @@
+"""
+Channel Manager - Respuestas JSON rápidas
+"""
+import json
+from datetime import date, datetime
+from typing import Any
+
+from fastapi.responses import Response
+
+try:
+    import orjson
+except ImportError:  # orjson es opcional
+    orjson = None
+
+
+def _por_defecto(valor: Any):
+    if isinstance(valor, (date, datetime)):
+        return valor.isoformat()
+    raise TypeError(f"Tipo no serializable: {type(valor).__name__}")
+
+
+class RespuestaJSONRapida(Response):
+    """
+    Respuesta JSON que serializa directamente dicts/listas de tipos simples
+    (sin pasar por la validación de Pydantic ni jsonable_encoder).
+    Usa orjson si está instalado y json de la librería estándar si no.
+    """
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        if orjson is not None:
+            return orjson.dumps(content)
+        return json.dumps(
+            content, ensure_ascii=False, separators=(",", ":"), default=_por_defecto
+        ).encode("utf-8")
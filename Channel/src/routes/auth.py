@@ -1,16 +1,20 @@
 ﻿"""
 Channel Manager - Autenticacion con JWT y bcrypt
 """
+import time
 import jwt
 import bcrypt
 from datetime import datetime, timedelta
 from typing import Optional
 from fastapi import APIRouter, Depends, HTTPException, status, Header
+from sqlalchemy import event
 from sqlalchemy.orm import Session
 
-from ..database import get_db
+from ..config import AUTH_CACHE_TTL, AUTH_CACHE_MAX
+from ..database import get_db, get_async_db
 from ..models import User
 from ..schemas import UserCreate, UserLogin, UserResponse, TokenResponse, MessageResponse
+from ..services.cache import CacheTTL
 
 router = APIRouter(prefix="/auth", tags=["Autenticacion"])
 
@@ -18,6 +22,11 @@ SECRET_KEY = "channel_manager_secret_key_2024"
 ALGORITHM = "HS256"
 TOKEN_EXPIRE_HOURS = 24
 
+# Tokens ya verificados -> instantánea del usuario, para no decodificar el
+# JWT ni consultar la tabla users en cada petición autenticada
+cache_usuarios = CacheTTL(max_entradas=AUTH_CACHE_MAX, ttl=AUTH_CACHE_TTL)
+CAMPOS_USUARIO = ("id", "email", "nombre", "activo", "created_at")
+
 
 def hash_password(password: str) -> str:
     password_bytes = password.encode("utf-8")
@@ -104,8 +113,25 @@ def verify_token(authorization: Optional[str] = Header(None)):
     return {"message": "Token valido", "user_id": payload["user_id"], "email": payload["email"]}
 
 
-def get_current_user(authorization: Optional[str] = Header(None), db: Session = Depends(get_db)) -> User:
-    token = extract_token_from_header(authorization)
+def invalidar_usuario(user_id: int) -> int:
+    """Eliminar de la caché todos los tokens de un usuario"""
+    return cache_usuarios.invalidar(lambda _token, datos: datos["id"] == user_id)
+
+
+@event.listens_for(User, "after_update")
+@event.listens_for(User, "after_delete")
+def _invalidar_usuario_modificado(mapper, connection, target):
+    """Cualquier cambio en un usuario (p. ej. desactivarlo) invalida sus tokens cacheados"""
+    invalidar_usuario(target.id)
+
+
+def datos_usuario(db: Session, token: str) -> dict:
+    """Instantánea (CAMPOS_USUARIO) del usuario de un token, desde la caché o la BD"""
+    datos = cache_usuarios.get(token)
+    if datos is not None:
+        return datos
+
+    version = cache_usuarios.version
     payload = decode_jwt_token(token)
     user_id = payload.get("user_id")
     if not user_id:
@@ -115,7 +141,37 @@ def get_current_user(authorization: Optional[str] = Header(None), db: Session =
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Usuario no encontrado")
     if not user.activo:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Usuario desactivado")
-    return user
+
+    datos = {campo: getattr(user, campo) for campo in CAMPOS_USUARIO}
+    # Nunca más allá de la expiración del propio token
+    ttl = min(AUTH_CACHE_TTL, payload["exp"] - time.time())
+    if ttl > 0:
+        cache_usuarios.set(token, datos, ttl=ttl, version=version)
+    return datos
+
+
+def get_current_user(authorization: Optional[str] = Header(None), db: Session = Depends(get_db)) -> User:
+    token = extract_token_from_header(authorization)
+    # Instancia transitoria (sin sesión) con los datos del usuario
+    return User(**datos_usuario(db, token))
+
+
+def _datos_usuario_y_cerrar(db: Session, token: str) -> dict:
+    try:
+        return datos_usuario(db, token)
+    finally:
+        # Libera la conexión: la ruta puede quedarse esperando (long-poll)
+        db.rollback()
+
+
+async def get_current_user_async(authorization: Optional[str] = Header(None), db=Depends(get_async_db)) -> User:
+    """
+    get_current_user para rutas async: resuelve el usuario con la misma
+    sesión de get_async_db que usa la ruta, en lugar de abrir otra síncrona
+    que retendría su conexión del pool durante toda la petición.
+    """
+    token = extract_token_from_header(authorization)
+    return User(**await db.run_sync(_datos_usuario_y_cerrar, token))
 
 
 @router.get("/me", response_model=UserResponse)
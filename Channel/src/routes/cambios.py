@@ -0,0 +1,96 @@
+"""
+Channel Manager - Rutas del Registro de Cambios (sincronización incremental)
+"""
+import time
+from typing import List, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.orm import Session
+
+from ..config import CAMBIOS_LIMITE_MAX, CAMBIOS_ESPERA_MAX, CAMBIOS_POLL_SEGUNDOS
+from ..database import get_async_db
+from ..models import Hotel, User
+from ..models.models import Cambio
+from ..schemas import CambioResponse, CambiosResponse
+from ..services import aviso_cambios, listar_cambios
+from .auth import get_current_user_async
+
+router = APIRouter(prefix="/changes", tags=["Cambios"])
+
+
+@router.get("", response_model=CambiosResponse)
+async def obtener_cambios(
+    since: int = Query(0, ge=0, description="Último seq ya procesado (0 = desde el principio)"),
+    limit: int = Query(500, ge=1, le=CAMBIOS_LIMITE_MAX),
+    wait: float = Query(0, ge=0, le=CAMBIOS_ESPERA_MAX, description="Segundos a esperar si no hay cambios (long-poll)"),
+    hotel_id: Optional[int] = None,
+    db=Depends(get_async_db),
+    current_user: User = Depends(get_current_user_async)
+):
+    """
+    Cambios en Hotel, Disponibilidad, Reserva y TipoHabitacion de los
+    hoteles del usuario con seq > since, en orden. Al eliminar un hotel o
+    un tipo de habitación se devuelve también la baja de lo borrado en
+    cascada (operación "eliminar"), aunque el hotel ya no exista. El consumidor guarda `ultimo_seq` y
+    lo envía como `since` en la siguiente llamada; si `hay_mas` es cierto,
+    debe volver a llamar sin esperar.
+
+    Con `wait` > 0 la petición queda abierta hasta que haya algún cambio o
+    se agote el tiempo (respuesta con la lista vacía). El usuario se
+    resuelve con la misma sesión, que no retiene ninguna conexión del pool
+    mientras espera.
+    """
+    if hotel_id is not None and not await db.run_sync(hotel_del_usuario, current_user.id, hotel_id):
+        raise HTTPException(status_code=404, detail="Hotel no encontrado")
+    
+    limite_espera = time.monotonic() + wait
+    while True:
+        # La espera se registra antes de consultar para no perder un aviso
+        # que llegue entre la consulta y la espera
+        futuro = aviso_cambios.preparar()
+        cambios = await db.run_sync(consultar_cambios, since, current_user.id, hotel_id, limit + 1)
+        restante = limite_espera - time.monotonic()
+        if cambios or restante <= 0:
+            aviso_cambios.descartar(futuro)
+            break
+        await aviso_cambios.esperar(futuro, min(restante, CAMBIOS_POLL_SEGUNDOS))
+    
+    hay_mas = len(cambios) > limit
+    cambios = cambios[:limit]
+    return CambiosResponse(
+        cambios=cambios,
+        ultimo_seq=cambios[-1].seq if cambios else since,
+        hay_mas=hay_mas
+    )
+
+
+def hotel_del_usuario(db: Session, user_id: int, hotel_id: int) -> bool:
+    """El hotel pertenece al usuario, o le perteneció y tiene cambios suyos registrados"""
+    try:
+        if db.query(Hotel.id).filter(Hotel.id == hotel_id, Hotel.user_id == user_id).first():
+            return True
+        return db.query(Cambio.seq).filter(
+            Cambio.hotel_id == hotel_id,
+            Cambio.user_id == user_id
+        ).first() is not None
+    finally:
+        db.rollback()
+
+
+def consultar_cambios(
+    db: Session,
+    since: int,
+    user_id: int,
+    hotel_id: Optional[int],
+    limite: int
+) -> List[CambioResponse]:
+    """
+    Leer los cambios y cerrar la transacción: durante el long-poll la sesión
+    no retiene una conexión del pool y cada consulta ve los últimos commits.
+    """
+    try:
+        return [
+            CambioResponse.model_validate(cambio)
+            for cambio in listar_cambios(db, since, user_id, hotel_id, limite)
+        ]
+    finally:
+        db.rollback()
@@ -1,50 +1,149 @@
 """
 Channel Manager - Rutas de Disponibilidad
 """
-from typing import List, Optional
+import json
+from typing import List, Optional, Union
 from datetime import date, timedelta
 from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
-from sqlalchemy import and_
+from sqlalchemy import and_, or_, func
 
-from ..database import get_db
+from ..config import RESPUESTAS_RAPIDAS
+from ..database import get_db, get_async_db, SessionLocal
 from ..models import Disponibilidad, TipoHabitacion, Hotel, User
+from ..responses import RespuestaJSONRapida
 from ..schemas import (
     DisponibilidadCreate, 
     DisponibilidadUpdate,
     DisponibilidadResponse, 
+    PaginatedResponse,
     DisponibilidadBulkCreate,
+    DisponibilidadARIBulk,
+    ARIRango,
     ConsultaDisponibilidad
 )
+from ..services import (
+    aplicar_ari,
+    rango_fechas,
+    buscar_disponibilidad,
+    cache_busqueda,
+    cambio_inventario,
+    registrar_cambio,
+    generar_calendario,
+    inventario_memoria,
+    upsert_disponibilidad,
+    codificar_cursor,
+    decodificar_cursor,
+    columnas_schema,
+    filas_a_dicts
+)
 from .auth import get_current_user
 
 router = APIRouter(prefix="/disponibilidad", tags=["Disponibilidad"])
 
 
-@router.get("/", response_model=List[DisponibilidadResponse])
+# Columnas seleccionables con fields= en el listado paginado
+CAMPOS_DISPONIBILIDAD = {
+    "id": Disponibilidad.id,
+    "tipo_habitacion_id": Disponibilidad.tipo_habitacion_id,
+    "fecha": Disponibilidad.fecha,
+    "cantidad_disponible": Disponibilidad.cantidad_disponible,
+    "precio": Disponibilidad.precio,
+    "cerrado": Disponibilidad.cerrado,
+}
+CAMPOS_DISPONIBILIDAD_DEFECTO = ["id", "tipo_habitacion_id", "fecha", "cantidad_disponible", "precio"]
+
+
+@router.get("/", response_model=Union[PaginatedResponse, List[DisponibilidadResponse]])
 def listar_disponibilidad(
     hotel_id: Optional[int] = None,
     tipo_habitacion_id: Optional[int] = None,
     fecha_inicio: Optional[date] = None,
     fecha_fin: Optional[date] = None,
+    limit: Optional[int] = Query(None, ge=1, le=1000, description="Tamaño de página"),
+    cursor: Optional[str] = Query(None, description="next_cursor de la página anterior"),
+    fields: Optional[str] = Query(None, description="Columnas a devolver, separadas por comas"),
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
-    """Listar disponibilidad del usuario"""
-    query = db.query(Disponibilidad).join(TipoHabitacion).join(Hotel).filter(
-        Hotel.user_id == current_user.id
-    )
+    """
+    Listar disponibilidad del usuario.
+
+    Sin limit/cursor/fields devuelve la lista completa (compatibilidad).
+    Con cualquiera de ellos devuelve una PaginatedResponse paginada por
+    cursor sobre (fecha, id) y, con fields, solo las columnas pedidas, sin
+    construir objetos ORM.
+    """
+    filtros = [Hotel.user_id == current_user.id]
     
     if hotel_id:
-        query = query.filter(TipoHabitacion.hotel_id == hotel_id)
+        filtros.append(TipoHabitacion.hotel_id == hotel_id)
     if tipo_habitacion_id:
-        query = query.filter(Disponibilidad.tipo_habitacion_id == tipo_habitacion_id)
+        filtros.append(Disponibilidad.tipo_habitacion_id == tipo_habitacion_id)
     if fecha_inicio:
-        query = query.filter(Disponibilidad.fecha >= fecha_inicio)
+        filtros.append(Disponibilidad.fecha >= fecha_inicio)
     if fecha_fin:
-        query = query.filter(Disponibilidad.fecha <= fecha_fin)
+        filtros.append(Disponibilidad.fecha <= fecha_fin)
+    
+    if limit is None and cursor is None and fields is None:
+        if RESPUESTAS_RAPIDAS:
+            filas = db.query(*columnas_schema(Disponibilidad, DisponibilidadResponse)).join(
+                TipoHabitacion
+            ).join(Hotel).filter(*filtros).order_by(Disponibilidad.fecha).all()
+            return RespuestaJSONRapida(filas_a_dicts(filas))
+        query = db.query(Disponibilidad).join(TipoHabitacion).join(Hotel).filter(*filtros)
+        return query.order_by(Disponibilidad.fecha).all()
+    
+    # Proyección de columnas
+    campos = [c.strip() for c in fields.split(",") if c.strip()] if fields else CAMPOS_DISPONIBILIDAD_DEFECTO
+    desconocidos = [c for c in campos if c not in CAMPOS_DISPONIBILIDAD]
+    if desconocidos:
+        raise HTTPException(status_code=400, detail=f"Campos no válidos: {', '.join(desconocidos)}")
+    
+    try:
+        clave, pagina = decodificar_cursor(cursor)
+        if clave is not None:
+            fecha_cursor, id_cursor = date.fromisoformat(clave[0]), int(clave[1])
+    except (ValueError, IndexError, TypeError):
+        raise HTTPException(status_code=400, detail="Cursor inválido")
+    
+    page_size = limit or 100
+    
+    total = db.query(func.count(Disponibilidad.id)).join(TipoHabitacion).join(Hotel).filter(
+        *filtros
+    ).scalar()
+    
+    query = db.query(
+        Disponibilidad.fecha.label("_fecha"),
+        Disponibilidad.id.label("_id"),
+        *[CAMPOS_DISPONIBILIDAD[c].label(c) for c in campos]
+    ).join(TipoHabitacion).join(Hotel).filter(*filtros)
+    
+    if clave is not None:
+        query = query.filter(or_(
+            Disponibilidad.fecha > fecha_cursor,
+            and_(Disponibilidad.fecha == fecha_cursor, Disponibilidad.id > id_cursor)
+        ))
+    
+    # Un elemento de más para saber si hay página siguiente
+    filas = query.order_by(Disponibilidad.fecha, Disponibilidad.id).limit(page_size + 1).all()
+    
+    next_cursor = None
+    if len(filas) > page_size:
+        filas = filas[:page_size]
+        next_cursor = codificar_cursor(filas[-1]._fecha, filas[-1]._id, pagina=pagina + 1)
     
-    return query.order_by(Disponibilidad.fecha).all()
+    pagina_respuesta = {
+        "items": [{c: getattr(fila, c) for c in campos} for fila in filas],
+        "total": total,
+        "page": pagina,
+        "page_size": page_size,
+        "next_cursor": next_cursor
+    }
+    if RESPUESTAS_RAPIDAS:
+        return RespuestaJSONRapida(pagina_respuesta)
+    return PaginatedResponse(**pagina_respuesta)
 
 
 @router.get("/calendario")
@@ -116,6 +215,55 @@ def obtener_calendario(
     }
 
 
+@router.get("/calendario/stream")
+def obtener_calendario_stream(
+    hotel_ids: List[int] = Query(..., description="Hoteles a incluir (repetible)"),
+    fecha_inicio: date = Query(..., description="Primera fecha del calendario"),
+    fecha_fin: date = Query(..., description="Última fecha del calendario (incluida)"),
+    formato: str = Query("ndjson", pattern="^(ndjson|json)$"),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Calendario de disponibilidad de varios hoteles y un rango arbitrario de
+    fechas, emitido en streaming por tipo de habitación.
+
+    - formato=ndjson: una línea JSON por tipo de habitación
+    - formato=json: un array JSON enviado por fragmentos
+    """
+    if fecha_fin < fecha_inicio:
+        raise HTTPException(status_code=400, detail="fecha_fin debe ser igual o posterior a fecha_inicio")
+    
+    # Verificar que todos los hoteles pertenecen al usuario
+    hotel_ids = set(hotel_ids)
+    propios = {
+        hotel_id for (hotel_id,) in db.query(Hotel.id).filter(
+            Hotel.id.in_(hotel_ids),
+            Hotel.user_id == current_user.id
+        ).all()
+    }
+    
+    if propios != hotel_ids:
+        raise HTTPException(status_code=404, detail="Hotel no encontrado")
+    
+    def emitir():
+        # Sesión propia: la de la petición se cierra antes de terminar el streaming
+        with SessionLocal() as sesion:
+            calendario = generar_calendario(sesion, sorted(hotel_ids), fecha_inicio, fecha_fin)
+            if formato == "ndjson":
+                for tipo in calendario:
+                    yield json.dumps(tipo, ensure_ascii=False) + "\n"
+            else:
+                separador = "["
+                for tipo in calendario:
+                    yield separador + json.dumps(tipo, ensure_ascii=False)
+                    separador = ","
+                yield "[]" if separador == "[" else "]"
+    
+    media_type = "application/x-ndjson" if formato == "ndjson" else "application/json"
+    return StreamingResponse(emitir(), media_type=media_type)
+
+
 @router.post("/", response_model=DisponibilidadResponse)
 def crear_disponibilidad(
     disponibilidad: DisponibilidadCreate,
@@ -132,77 +280,73 @@ def crear_disponibilidad(
     if not habitacion:
         raise HTTPException(status_code=404, detail="Habitación no encontrada")
     
-    # Verificar si ya existe para esa fecha
-    existente = db.query(Disponibilidad).filter(
-        Disponibilidad.tipo_habitacion_id == disponibilidad.tipo_habitacion_id,
-        Disponibilidad.fecha == disponibilidad.fecha
-    ).first()
+    capacidad_max = habitacion.capacidad_max
     
-    if existente:
-        # Actualizar existente
-        for key, value in disponibilidad.model_dump().items():
-            setattr(existente, key, value)
-        db.commit()
-        db.refresh(existente)
-        return existente
-    
-    # Crear nuevo
-    db_disp = Disponibilidad(**disponibilidad.model_dump())
-    db.add(db_disp)
+    # Insertar o actualizar en una sola sentencia (upsert)
+    upsert_disponibilidad(
+        db,
+        [disponibilidad.model_dump()],
+        columnas_actualizar=["cantidad_disponible", "precio"]
+    )
+    registrar_cambio(
+        db, "disponibilidad", "actualizar", habitacion.hotel_id, disponibilidad.tipo_habitacion_id,
+        fecha_desde=disponibilidad.fecha, fecha_hasta=disponibilidad.fecha
+    )
     db.commit()
-    db.refresh(db_disp)
-    return db_disp
+    cambio_inventario(
+        db, [disponibilidad.tipo_habitacion_id], disponibilidad.fecha, disponibilidad.fecha, capacidad_max
+    )
+    
+    return db.query(Disponibilidad).filter(
+        Disponibilidad.tipo_habitacion_id == disponibilidad.tipo_habitacion_id,
+        Disponibilidad.fecha == disponibilidad.fecha
+    ).one()
 
 
 @router.post("/bulk")
 def crear_disponibilidad_bulk(
-    bulk: DisponibilidadBulkCreate,
+    bulk: Union[DisponibilidadARIBulk, DisponibilidadBulkCreate],
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
-    """Crear/actualizar disponibilidad para un rango de fechas"""
-    # Verificar que la habitación pertenece al usuario
-    habitacion = db.query(TipoHabitacion).join(Hotel).filter(
-        TipoHabitacion.id == bulk.tipo_habitacion_id,
-        Hotel.user_id == current_user.id
-    ).first()
+    """
+    Crear/actualizar disponibilidad para rangos de fechas.
+
+    Acepta el formato simple (un tipo de habitación y un rango) o una carga
+    ARI con varios tipos de habitación, rangos, máscaras de días de la
+    semana y overrides por día. Todo se aplica en una única transacción.
+    """
+    if isinstance(bulk, DisponibilidadBulkCreate):
+        actualizaciones = [ARIRango(**bulk.model_dump())]
+    else:
+        actualizaciones = bulk.actualizaciones
     
-    if not habitacion:
-        raise HTTPException(status_code=404, detail="Habitación no encontrada")
+    # Verificar que todas las habitaciones pertenecen al usuario
+    tipo_ids = {rango.tipo_habitacion_id for rango in actualizaciones}
+    propias = dict(
+        db.query(TipoHabitacion.id, TipoHabitacion.hotel_id).join(Hotel).filter(
+            TipoHabitacion.id.in_(tipo_ids),
+            Hotel.user_id == current_user.id
+        ).all()
+    )
     
-    fecha_actual = bulk.fecha_inicio
-    creados = 0
-    actualizados = 0
-    
-    while fecha_actual <= bulk.fecha_fin:
-        existente = db.query(Disponibilidad).filter(
-            Disponibilidad.tipo_habitacion_id == bulk.tipo_habitacion_id,
-            Disponibilidad.fecha == fecha_actual
-        ).first()
-        
-        if existente:
-            existente.cantidad_disponible = bulk.cantidad_disponible
-            if bulk.precio is not None:
-                existente.precio = bulk.precio
-            actualizados += 1
-        else:
-            db_disp = Disponibilidad(
-                tipo_habitacion_id=bulk.tipo_habitacion_id,
-                fecha=fecha_actual,
-                cantidad_disponible=bulk.cantidad_disponible,
-                precio=bulk.precio
-            )
-            db.add(db_disp)
-            creados += 1
-        
-        fecha_actual += timedelta(days=1)
+    if propias.keys() != tipo_ids:
+        raise HTTPException(status_code=404, detail="Habitación no encontrada")
     
+    resultado = aplicar_ari(db, actualizaciones)
+    for tipo_id, hotel_id in propias.items():
+        fecha_desde, fecha_hasta = rango_fechas([r for r in actualizaciones if r.tipo_habitacion_id == tipo_id])
+        registrar_cambio(
+            db, "disponibilidad", "actualizar", hotel_id, tipo_id,
+            fecha_desde=fecha_desde, fecha_hasta=fecha_hasta
+        )
     db.commit()
+    cambio_inventario(db, tipo_ids, *rango_fechas(actualizaciones))
     
     return {
         "message": "Disponibilidad actualizada",
-        "creados": creados,
-        "actualizados": actualizados
+        "creados": resultado["creados"],
+        "actualizados": resultado["actualizados"]
     }
 
 
@@ -214,20 +358,26 @@ def actualizar_disponibilidad(
     current_user: User = Depends(get_current_user)
 ):
     """Actualizar una disponibilidad específica"""
-    db_disp = db.query(Disponibilidad).join(TipoHabitacion).join(Hotel).filter(
+    fila = db.query(Disponibilidad, TipoHabitacion.hotel_id).join(TipoHabitacion).join(Hotel).filter(
         Disponibilidad.id == disponibilidad_id,
         Hotel.user_id == current_user.id
     ).first()
     
-    if not db_disp:
+    if not fila:
         raise HTTPException(status_code=404, detail="Disponibilidad no encontrada")
+    db_disp, hotel_id = fila
     
     update_data = disponibilidad.model_dump(exclude_unset=True)
     for key, value in update_data.items():
         setattr(db_disp, key, value)
     
+    registrar_cambio(
+        db, "disponibilidad", "actualizar", hotel_id, db_disp.tipo_habitacion_id, db_disp.id,
+        db_disp.fecha, db_disp.fecha
+    )
     db.commit()
     db.refresh(db_disp)
+    cambio_inventario(db, [db_disp.tipo_habitacion_id], db_disp.fecha, db_disp.fecha)
     return db_disp
 
 
@@ -238,86 +388,49 @@ def eliminar_disponibilidad(
     current_user: User = Depends(get_current_user)
 ):
     """Eliminar una disponibilidad"""
-    db_disp = db.query(Disponibilidad).join(TipoHabitacion).join(Hotel).filter(
+    fila = db.query(Disponibilidad, TipoHabitacion.hotel_id).join(TipoHabitacion).join(Hotel).filter(
         Disponibilidad.id == disponibilidad_id,
         Hotel.user_id == current_user.id
     ).first()
     
-    if not db_disp:
+    if not fila:
         raise HTTPException(status_code=404, detail="Disponibilidad no encontrada")
+    db_disp, hotel_id = fila
     
+    tipo_habitacion_id, fecha = db_disp.tipo_habitacion_id, db_disp.fecha
+    registrar_cambio(
+        db, "disponibilidad", "eliminar", hotel_id, tipo_habitacion_id, db_disp.id, fecha, fecha
+    )
     db.delete(db_disp)
     db.commit()
+    cambio_inventario(db, [tipo_habitacion_id], fecha, fecha)
     return {"message": "Disponibilidad eliminada"}
 
 
 @router.get("/buscar")
-def buscar_disponibilidad_publica(
+async def buscar_disponibilidad_publica(
     fecha_inicio: date = Query(..., description="Fecha de entrada"),
     fecha_fin: date = Query(..., description="Fecha de salida"),
     num_huespedes: int = Query(..., description="Número de huéspedes"),
-    db: Session = Depends(get_db)
+    db=Depends(get_async_db)
 ):
     """
     Endpoint público para buscar disponibilidad de habitaciones
     No requiere autenticación - usado por sistemas externos como Principal
     """
-    from sqlalchemy import func
-    
-    # Buscar tipos de habitación que tengan capacidad suficiente
-    tipos_habitacion = db.query(TipoHabitacion).filter(
-        TipoHabitacion.capacidad_max >= num_huespedes
-    ).all()
-    
-    resultados = []
-    
-    for tipo in tipos_habitacion:
-        # Obtener el hotel
-        hotel = db.query(Hotel).filter(Hotel.id == tipo.hotel_id).first()
-        if not hotel:
-            continue
-        
-        # Verificar disponibilidad para todas las fechas del rango
-        fecha_actual = fecha_inicio
-        disponibilidad_minima = None
-        precio_total_acumulado = 0
-        tiene_disponibilidad_completa = True
-        
-        while fecha_actual < fecha_fin:
-            disp = db.query(Disponibilidad).filter(
-                Disponibilidad.tipo_habitacion_id == tipo.id,
-                Disponibilidad.fecha == fecha_actual
-            ).first()
-            
-            if disp and disp.cantidad_disponible > 0:
-                if disponibilidad_minima is None:
-                    disponibilidad_minima = disp.cantidad_disponible
-                else:
-                    disponibilidad_minima = min(disponibilidad_minima, disp.cantidad_disponible)
-                precio_total_acumulado += (disp.precio or 100)  # Precio por defecto 100 si no está definido
-            else:
-                # No hay disponibilidad para esta fecha
-                tiene_disponibilidad_completa = False
-                break
-            
-            fecha_actual += timedelta(days=1)
-        
-        # Solo incluir si hay disponibilidad para todas las fechas
-        if tiene_disponibilidad_completa and disponibilidad_minima and disponibilidad_minima > 0:
-            # Foto por defecto si no tiene
-            foto_url = "https://images.unsplash.com/photo-1611892440504-42a792e24d32?w=800"
-            
-            resultados.append({
-                "tipo_habitacion_id": tipo.id,
-                "tipo_nombre": tipo.nombre,
-                "hotel_id": hotel.id,
-                "hotel_nombre": hotel.nombre,
-                "descripcion": tipo.descripcion or f"Habitación {tipo.nombre}",
-                "capacidad_max": tipo.capacidad_max,
-                "precio": precio_total_acumulado,
-                "cantidad_disponible": int(disponibilidad_minima),
-                "foto_url": foto_url,
-                "servicios": tipo.servicios or ""
-            })
-    
+    clave = (fecha_inicio, fecha_fin, num_huespedes)
+    resultados = cache_busqueda.get(clave)
+    if resultados is None:
+        version = cache_busqueda.version
+        if inventario_memoria.cargado:
+            resultados = inventario_memoria.buscar(fecha_inicio, fecha_fin, num_huespedes)
+        else:
+            resultados = await db.run_sync(buscar_disponibilidad, fecha_inicio, fecha_fin, num_huespedes)
+        cache_busqueda.set(clave, resultados, version=version)
     return resultados
+
+
+@router.get("/buscar/cache")
+def estadisticas_cache_busqueda():
+    """Estadísticas de la caché de búsqueda pública (aciertos, fallos, tamaño)"""
+    return cache_busqueda.estadisticas()
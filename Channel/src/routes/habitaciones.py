@@ -3,15 +3,22 @@ Channel Manager - Rutas de Habitaciones (Tipos de Habitación)
 """
 from typing import List, Optional
 from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, contains_eager
 
+from ..config import RESPUESTAS_RAPIDAS
 from ..database import get_db
 from ..models import Hotel, TipoHabitacion, User
+from ..responses import RespuestaJSONRapida
 from ..schemas import (
     TipoHabitacionCreate, 
     TipoHabitacionUpdate, 
     TipoHabitacionResponse,
-    TipoHabitacionConHotel
+    TipoHabitacionConHotel,
+    HotelResponse
+)
+from ..services import (
+    aviso_cambios, cambio_catalogo, registrar_cambio, registrar_bajas_en_cascada, columnas_schema,
+    filas_a_dicts
 )
 from .auth import get_current_user
 
@@ -27,17 +34,28 @@ def listar_habitaciones(
 ):
     """Listar tipos de habitación del usuario"""
     # Solo habitaciones de hoteles del usuario
-    query = db.query(TipoHabitacion).join(Hotel).filter(
-        Hotel.user_id == current_user.id
-    )
+    filtros = [Hotel.user_id == current_user.id]
     
     if hotel_id:
-        query = query.filter(TipoHabitacion.hotel_id == hotel_id)
+        filtros.append(TipoHabitacion.hotel_id == hotel_id)
     
     if activo is not None:
-        query = query.filter(TipoHabitacion.activo == activo)
+        filtros.append(TipoHabitacion.activo == activo)
     
-    return query.order_by(TipoHabitacion.hotel_id, TipoHabitacion.nombre).all()
+    orden = (TipoHabitacion.hotel_id, TipoHabitacion.nombre)
+    
+    if RESPUESTAS_RAPIDAS:
+        filas = db.query(
+            *columnas_schema(TipoHabitacion, TipoHabitacionResponse),
+            *columnas_schema(Hotel, HotelResponse, prefijo="hotel__")
+        ).join(Hotel).filter(*filtros).order_by(*orden).all()
+        return RespuestaJSONRapida(filas_a_dicts(filas, prefijo_anidado={"hotel": "hotel__"}))
+    
+    # El JOIN con Hotel ya existe para filtrar por usuario: se reutiliza para
+    # poblar tipo.hotel y evitar una consulta por fila al serializar
+    return db.query(TipoHabitacion).join(Hotel).options(
+        contains_eager(TipoHabitacion.hotel)
+    ).filter(*filtros).order_by(*orden).all()
 
 
 @router.get("/{habitacion_id}", response_model=TipoHabitacionConHotel)
@@ -47,7 +65,9 @@ def obtener_habitacion(
     current_user: User = Depends(get_current_user)
 ):
     """Obtener un tipo de habitación por ID"""
-    habitacion = db.query(TipoHabitacion).join(Hotel).filter(
+    habitacion = db.query(TipoHabitacion).join(Hotel).options(
+        contains_eager(TipoHabitacion.hotel)
+    ).filter(
         TipoHabitacion.id == habitacion_id,
         Hotel.user_id == current_user.id
     ).first()
@@ -75,7 +95,10 @@ def crear_habitacion(
     
     db_habitacion = TipoHabitacion(**habitacion.model_dump())
     db.add(db_habitacion)
+    db.flush()
+    registrar_cambio(db, "tipo_habitacion", "crear", hotel.id, db_habitacion.id, db_habitacion.id)
     db.commit()
+    aviso_cambios.notificar()
     db.refresh(db_habitacion)
     return db_habitacion
 
@@ -100,7 +123,11 @@ def actualizar_habitacion(
     for key, value in update_data.items():
         setattr(db_habitacion, key, value)
     
+    registrar_cambio(
+        db, "tipo_habitacion", "actualizar", db_habitacion.hotel_id, habitacion_id, habitacion_id
+    )
     db.commit()
+    cambio_catalogo(db, tipo_ids=[habitacion_id])
     db.refresh(db_habitacion)
     return db_habitacion
 
@@ -120,6 +147,9 @@ def eliminar_habitacion(
     if not db_habitacion:
         raise HTTPException(status_code=404, detail="Habitación no encontrada")
     
+    # Incluye las noches y reservas que se borran en cascada con el tipo
+    registrar_bajas_en_cascada(db, db_habitacion.hotel_id, current_user.id, [habitacion_id])
     db.delete(db_habitacion)
     db.commit()
+    cambio_catalogo(db, tipo_ids=[habitacion_id])
     return {"message": f"Habitación '{db_habitacion.nombre}' eliminada correctamente"}
@@ -3,11 +3,16 @@ Channel Manager - Rutas de Hoteles
 """
 from typing import List, Optional
 from fastapi import APIRouter, Depends, HTTPException, Query, Header
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, selectinload
 
+from ..config import RESPUESTAS_RAPIDAS
 from ..database import get_db
-from ..models import Hotel, User
+from ..models import Hotel, TipoHabitacion, User
+from ..responses import RespuestaJSONRapida
 from ..schemas import HotelCreate, HotelUpdate, HotelResponse, HotelConHabitaciones
+from ..services import (
+    cambio_catalogo, registrar_cambio, registrar_bajas_en_cascada, columnas_schema, filas_a_dicts
+)
 from .auth import get_current_user
 
 router = APIRouter(prefix="/hoteles", tags=["Hoteles"])
@@ -20,12 +25,16 @@ def listar_hoteles(
     current_user: User = Depends(get_current_user)
 ):
     """Listar hoteles del usuario actual"""
-    query = db.query(Hotel).filter(Hotel.user_id == current_user.id)
+    filtros = [Hotel.user_id == current_user.id]
     
     if activo is not None:
-        query = query.filter(Hotel.activo == activo)
+        filtros.append(Hotel.activo == activo)
     
-    return query.order_by(Hotel.nombre).all()
+    if RESPUESTAS_RAPIDAS:
+        filas = db.query(*columnas_schema(Hotel, HotelResponse)).filter(*filtros).order_by(Hotel.nombre).all()
+        return RespuestaJSONRapida(filas_a_dicts(filas))
+    
+    return db.query(Hotel).filter(*filtros).order_by(Hotel.nombre).all()
 
 
 @router.get("/{hotel_id}", response_model=HotelConHabitaciones)
@@ -35,7 +44,9 @@ def obtener_hotel(
     current_user: User = Depends(get_current_user)
 ):
     """Obtener un hotel por ID con sus habitaciones"""
-    hotel = db.query(Hotel).filter(
+    # HotelConHabitaciones serializa la colección: se carga en una segunda
+    # consulta (SELECT ... WHERE hotel_id IN ...) en lugar de un lazy load
+    hotel = db.query(Hotel).options(selectinload(Hotel.habitaciones)).filter(
         Hotel.id == hotel_id,
         Hotel.user_id == current_user.id
     ).first()
@@ -82,7 +93,9 @@ def actualizar_hotel(
     for key, value in update_data.items():
         setattr(db_hotel, key, value)
     
+    registrar_cambio(db, "hotel", "actualizar", hotel_id, entidad_id=hotel_id, user_id=current_user.id)
     db.commit()
+    cambio_catalogo(db, hotel_id=hotel_id)
     db.refresh(db_hotel)
     return db_hotel
 
@@ -102,6 +115,12 @@ def eliminar_hotel(
     if not db_hotel:
         raise HTTPException(status_code=404, detail="Hotel no encontrado")
     
+    # Las bajas en cascada se registran antes del borrado, mientras aún
+    # se pueden consultar los tipos, las noches y las reservas del hotel
+    tipo_ids = [id_ for (id_,) in db.query(TipoHabitacion.id).filter(TipoHabitacion.hotel_id == hotel_id)]
+    registrar_bajas_en_cascada(db, hotel_id, current_user.id, tipo_ids, hotel_completo=True)
+    registrar_cambio(db, "hotel", "eliminar", hotel_id, entidad_id=hotel_id, user_id=current_user.id)
     db.delete(db_hotel)
     db.commit()
+    cambio_catalogo(db, hotel_id=hotel_id)
     return {"message": f"Hotel '{db_hotel.nombre}' eliminado correctamente"}
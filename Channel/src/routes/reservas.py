@@ -1,15 +1,26 @@
 """
 Channel Manager - Rutas de Reservas
 """
-from datetime import date, datetime
-from typing import Optional
+from collections import defaultdict
+from datetime import date, datetime, timedelta
+from typing import Callable, Dict, List, Optional, Tuple, Type
 import uuid
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
-from pydantic import BaseModel
-from ..database import get_db
-from ..models import TipoHabitacion, Hotel, Disponibilidad
+from fastapi import APIRouter, Depends, Header, HTTPException, Response, status
+from sqlalchemy import update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session, contains_eager
+from pydantic import BaseModel, Field
+from ..config import RESERVAS_LOTE_MAX, CANCELACIONES_LOTE_MAX
+from ..database import get_async_db
+from ..metrics import reservas_total, reservas_lote_total, reservas_repetidas_total
+from ..models import TipoHabitacion, Hotel, User
 from ..models.models import Reserva
+from ..services import (
+    cargar_noches, cargar_noches_tipos, descontar_stock, descontar_stock_noches, restaurar_stock_noches,
+    cambio_inventario, registrar_cambio,
+    hash_peticion, buscar_clave, guardar_clave, limpiar_claves_expiradas
+)
+from .auth import get_current_user_async
 
 router = APIRouter(prefix="/reservas", tags=["Reservas"])
 
@@ -48,15 +59,177 @@ class ReservaResponse(BaseModel):
         from_attributes = True
 
 
+class ReservaLoteCreate(BaseModel):
+    """Schema para reservas de grupo: varias líneas (tipos y fechas distintos) en una operación"""
+    reservas: List[ReservaCreate] = Field(..., min_length=1, max_length=RESERVAS_LOTE_MAX)
+
+
+class ReservaLoteResponse(BaseModel):
+    """Schema de respuesta de una reserva de grupo"""
+    reservas: List[ReservaResponse]
+    precio_total: Optional[float]
+
+
+class CancelacionLote(BaseModel):
+    """Schema para cancelar varias reservas en una operación"""
+    reserva_ids: List[int] = Field(..., min_length=1, max_length=CANCELACIONES_LOTE_MAX)
+
+
+class CancelacionLoteResponse(BaseModel):
+    """Schema de respuesta de una cancelación masiva"""
+    canceladas: List[int]
+    ya_canceladas: List[int]
+    noches_restauradas: int
+
+
 @router.post("/crear", response_model=ReservaResponse, status_code=status.HTTP_201_CREATED)
-async def create_reservation(data: ReservaCreate, db: Session = Depends(get_db)):
+async def create_reservation(
+    data: ReservaCreate,
+    response: Response,
+    idempotency_key: Optional[str] = Header(None, max_length=255),
+    db=Depends(get_async_db)
+):
     """
     Endpoint para crear reserva
     - Valida tipo de habitacion y hotel
     - Verifica disponibilidad
     - Calcula precio total
-    - Reduce stock
+    - Reduce stock de forma atómica (sin sobreventa con reservas concurrentes)
     - Genera localizador unico
+    - Con cabecera Idempotency-Key, los reintentos devuelven la respuesta
+      original (cabecera Idempotent-Replayed) sin volver a reservar
+    """
+    return await ejecutar_reserva(
+        db, response, reservas_total, crear_reserva, ReservaResponse, data, idempotency_key
+    )
+
+
+@router.post("/lote", response_model=ReservaLoteResponse, status_code=status.HTTP_201_CREATED)
+async def create_group_reservation(
+    data: ReservaLoteCreate,
+    response: Response,
+    idempotency_key: Optional[str] = Header(None, max_length=255),
+    db=Depends(get_async_db)
+):
+    """
+    Endpoint para reservas de grupo (varias habitaciones, tipos y fechas)
+    - Todo o nada: si una línea falla no se crea ninguna reserva
+    - Valida todos los tipos y hoteles en una sola consulta
+    - Verifica la disponibilidad agregada de las líneas que comparten noches
+    - Reduce el stock con un UPDATE por tipo de habitación y un único commit
+    - Admite Idempotency-Key igual que /crear
+    """
+    return await ejecutar_reserva(
+        db, response, reservas_lote_total, crear_reservas_lote, ReservaLoteResponse, data, idempotency_key
+    )
+
+
+@router.get("/{reserva_id}", response_model=ReservaResponse)
+async def get_reservation(reserva_id: int, db=Depends(get_async_db)):
+    """Obtener reserva por ID"""
+    return await db.run_sync(obtener_reserva, reserva_id)
+
+
+@router.post("/cancelar", response_model=CancelacionLoteResponse)
+async def cancel_reservations(
+    data: CancelacionLote,
+    db=Depends(get_async_db),
+    current_user: User = Depends(get_current_user_async)
+):
+    """
+    Cancelar varias reservas (p. ej. un evento cancelado) en una transacción
+    - Solo reservas de hoteles del usuario; las de otros cuentan como no encontradas
+    - Todo o nada: si alguna no existe o no se puede cancelar, no se cancela ninguna
+    - Las ya canceladas se ignoran (los reintentos no devuelven stock dos veces)
+    - Restaura el stock con un UPDATE por tipo de habitación
+    """
+    return await db.run_sync(cancelar_reservas, data.reserva_ids, current_user.id)
+
+
+@router.post("/{reserva_id}/cancelar", response_model=ReservaResponse)
+async def cancel_reservation(
+    reserva_id: int,
+    db=Depends(get_async_db),
+    current_user: User = Depends(get_current_user_async)
+):
+    """Cancelar una reserva de un hotel del usuario y devolver sus noches al stock"""
+    await db.run_sync(cancelar_reservas, [reserva_id], current_user.id)
+    return await db.run_sync(obtener_reserva, reserva_id)
+
+
+async def ejecutar_reserva(db, response: Response, contador, crear: Callable, modelo: Type[BaseModel], data, clave):
+    """Ejecutar una operación de reserva vía run_sync, contando su resultado en /metrics"""
+    try:
+        reserva, repetida = await db.run_sync(crear_idempotente, crear, modelo, data, clave)
+    except HTTPException as e:
+        contador.inc(str(e.status_code))
+        raise
+    except Exception:
+        contador.inc("500")
+        raise
+    
+    if repetida:
+        response.headers["Idempotent-Replayed"] = "true"
+        reservas_repetidas_total.inc()
+    else:
+        contador.inc("201")
+    return reserva
+
+
+def crear_idempotente(
+    db: Session,
+    crear: Callable,
+    modelo: Type[BaseModel],
+    data: BaseModel,
+    clave: Optional[str]
+) -> Tuple[BaseModel, bool]:
+    """
+    Ejecutar crear(db, data) respetando la Idempotency-Key (vía run_sync).
+    Devuelve (respuesta, repetida): repetida indica que la clave ya se había
+    usado y la respuesta es la guardada, sin comprobar ni tocar inventario.
+    """
+    if clave is None:
+        return crear(db, data), False
+    
+    hash_cuerpo = hash_peticion(data)
+    guardada = buscar_clave(db, clave)
+    
+    if guardada is None:
+        try:
+            reserva = crear(db, data, clave_idempotencia=clave, hash_cuerpo=hash_cuerpo)
+        except IntegrityError:
+            # Un reintento concurrente con la misma clave ha confirmado antes:
+            # esta transacción (reserva y stock incluidos) se deshace
+            db.rollback()
+            guardada = buscar_clave(db, clave)
+            if guardada is None:
+                raise
+        else:
+            limpiar_claves_expiradas(db)
+            return reserva, False
+    
+    if guardada.hash_peticion != hash_cuerpo:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail="Idempotency-Key ya utilizada con otros datos de reserva"
+        )
+    return modelo.model_validate_json(guardada.respuesta), True
+
+
+def crear_reserva(
+    db: Session,
+    data: ReservaCreate,
+    clave_idempotencia: Optional[str] = None,
+    hash_cuerpo: Optional[str] = None
+) -> ReservaResponse:
+    """
+    Crear una reserva (se ejecuta vía run_sync, fuera del event loop)
+    - Valida tipo de habitacion y hotel
+    - Verifica disponibilidad
+    - Calcula precio total
+    - Reduce stock de forma atómica (sin sobreventa con reservas concurrentes)
+    - Genera localizador unico
+    - Guarda la respuesta con la clave de idempotencia en la misma transacción
     """
     
     # Validar tipo de habitacion
@@ -90,19 +263,23 @@ async def create_reservation(data: ReservaCreate, db: Session = Depends(get_db))
             detail="Fecha de salida debe ser posterior a fecha de entrada"
         )
     
-    # Verificar disponibilidad para todas las noches
-    current_date = data.fecha_entrada
+    # Cargar todas las noches de la estancia en una sola consulta
+    noches = cargar_noches(
+        db, data.tipo_habitacion_id, data.fecha_entrada, data.fecha_salida, bloquear=True
+    )
+    
+    # Verificar disponibilidad y calcular precio total en memoria
     unavailable_dates = []
+    total_price = 0.0
+    current_date = data.fecha_entrada
     
     while current_date < data.fecha_salida:
-        disp = db.query(Disponibilidad).filter(
-            Disponibilidad.tipo_habitacion_id == data.tipo_habitacion_id,
-            Disponibilidad.fecha == current_date,
-            Disponibilidad.cerrado == False
-        ).first()
+        disp = noches.get(current_date)
         
-        if not disp or disp.cantidad_disponible < data.num_habitaciones:
+        if not disp or disp.cerrado or disp.cantidad_disponible < data.num_habitaciones:
             unavailable_dates.append(current_date.isoformat())
+        elif disp.precio:
+            total_price += disp.precio * data.num_habitaciones
         
         current_date = date.fromordinal(current_date.toordinal() + 1)
     
@@ -112,21 +289,6 @@ async def create_reservation(data: ReservaCreate, db: Session = Depends(get_db))
             detail=f"Sin disponibilidad en fechas: {', '.join(unavailable_dates)}"
         )
     
-    # Calcular precio total
-    total_price = 0.0
-    current_date = data.fecha_entrada
-    
-    while current_date < data.fecha_salida:
-        disp = db.query(Disponibilidad).filter(
-            Disponibilidad.tipo_habitacion_id == data.tipo_habitacion_id,
-            Disponibilidad.fecha == current_date
-        ).first()
-        
-        if disp and disp.precio:
-            total_price += disp.precio * data.num_habitaciones
-        
-        current_date = date.fromordinal(current_date.toordinal() + 1)
-    
     # Generar localizador
     localizador = str(uuid.uuid4())
     
@@ -149,25 +311,23 @@ async def create_reservation(data: ReservaCreate, db: Session = Depends(get_db))
     
     db.add(reserva)
     
-    # Reducir disponibilidad
-    current_date = data.fecha_entrada
-    while current_date < data.fecha_salida:
-        disp = db.query(Disponibilidad).filter(
-            Disponibilidad.tipo_habitacion_id == data.tipo_habitacion_id,
-            Disponibilidad.fecha == current_date
-        ).first()
-        
-        if disp:
-            disp.cantidad_disponible -= data.num_habitaciones
-        
-        current_date = date.fromordinal(current_date.toordinal() + 1)
+    # Reducir disponibilidad de todas las noches con un único UPDATE condicional
+    num_noches = (data.fecha_salida - data.fecha_entrada).days
+    noches_descontadas = descontar_stock(
+        db, data.tipo_habitacion_id, data.fecha_entrada, data.fecha_salida, data.num_habitaciones
+    )
     
-    # Guardar todo
-    db.commit()
-    db.refresh(reserva)
+    if noches_descontadas != num_noches:
+        # Otra reserva concurrente ha consumido el stock tras la verificación
+        db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Sin disponibilidad: el stock ha sido reservado por otra operación"
+        )
     
-    # Respuesta
-    return ReservaResponse(
+    # Respuesta (flush para obtener id y created_at antes de confirmar)
+    db.flush()
+    respuesta = ReservaResponse(
         id=reserva.id,
         localizador=localizador,
         hotel_id=reserva.hotel_id,
@@ -182,11 +342,271 @@ async def create_reservation(data: ReservaCreate, db: Session = Depends(get_db))
         cliente_email=reserva.cliente_email,
         created_at=reserva.created_at
     )
+    
+    if clave_idempotencia is not None:
+        guardar_clave(db, clave_idempotencia, hash_cuerpo, status.HTTP_201_CREATED, respuesta)
+    
+    ultima_noche = data.fecha_salida - timedelta(days=1)
+    registrar_cambio(
+        db, "reserva", "crear", hotel.id, data.tipo_habitacion_id, reserva.id, data.fecha_entrada, ultima_noche
+    )
+    registrar_cambio(
+        db, "disponibilidad", "actualizar", hotel.id, data.tipo_habitacion_id,
+        fecha_desde=data.fecha_entrada, fecha_hasta=ultima_noche
+    )
+    
+    # Guardar todo
+    capacidad_max = tipo.capacidad_max
+    db.commit()
+    cambio_inventario(db, [data.tipo_habitacion_id], data.fecha_entrada, ultima_noche, capacidad_max)
+    
+    return respuesta
 
 
-@router.get("/{reserva_id}", response_model=ReservaResponse)
-async def get_reservation(reserva_id: int, db: Session = Depends(get_db)):
-    """Obtener reserva por ID"""
+def crear_reservas_lote(
+    db: Session,
+    data: ReservaLoteCreate,
+    clave_idempotencia: Optional[str] = None,
+    hash_cuerpo: Optional[str] = None
+) -> ReservaLoteResponse:
+    """
+    Crear todas las reservas de un grupo en una transacción (vía run_sync).
+    Los errores indican la línea (posición en la lista, desde 0) o el
+    tipo/noche que los provoca.
+    """
+    lineas = data.reservas
+    
+    # Validar fechas
+    invalidas = [str(i) for i, linea in enumerate(lineas) if linea.fecha_salida <= linea.fecha_entrada]
+    if invalidas:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Fecha de salida debe ser posterior a fecha de entrada (líneas: {', '.join(invalidas)})"
+        )
+    
+    # Validar todos los tipos de habitacion y sus hoteles en una sola consulta
+    tipo_ids = {linea.tipo_habitacion_id for linea in lineas}
+    tipos = {
+        tipo.id: tipo for tipo in db.query(TipoHabitacion).join(Hotel).options(
+            contains_eager(TipoHabitacion.hotel)
+        ).filter(
+            TipoHabitacion.id.in_(tipo_ids),
+            TipoHabitacion.activo == True,
+            Hotel.activo == True
+        )
+    }
+    no_encontrados = sorted(tipo_ids - tipos.keys())
+    if no_encontrados:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Tipos de habitacion no encontrados o inactivos: {', '.join(map(str, no_encontrados))}"
+        )
+    
+    # Demanda agregada por tipo y noche: varias líneas pueden compartir noches
+    demanda: Dict[int, Dict[date, int]] = defaultdict(lambda: defaultdict(int))
+    noches_linea: List[List[date]] = []
+    for linea in lineas:
+        noches_estancia = [
+            date.fromordinal(ordinal)
+            for ordinal in range(linea.fecha_entrada.toordinal(), linea.fecha_salida.toordinal())
+        ]
+        noches_linea.append(noches_estancia)
+        for noche in noches_estancia:
+            demanda[linea.tipo_habitacion_id][noche] += linea.num_habitaciones
+    
+    fecha_desde = min(linea.fecha_entrada for linea in lineas)
+    fecha_hasta = max(linea.fecha_salida for linea in lineas)
+    noches = cargar_noches_tipos(db, tipo_ids, fecha_desde, fecha_hasta, bloquear=True)
+    
+    # Verificar disponibilidad de todo el grupo en memoria
+    unavailable = []
+    for tipo_id, por_noche in sorted(demanda.items()):
+        for noche, cantidad in sorted(por_noche.items()):
+            disp = noches.get((tipo_id, noche))
+            if not disp or disp.cerrado or disp.cantidad_disponible < cantidad:
+                unavailable.append(f"{tipo_id}/{noche.isoformat()}")
+    
+    if unavailable:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=f"Sin disponibilidad (tipo/fecha): {', '.join(unavailable)}"
+        )
+    
+    # Crear reservas con su precio total
+    reservas = []
+    for linea, noches_estancia in zip(lineas, noches_linea):
+        total_price = sum(
+            (noches[(linea.tipo_habitacion_id, noche)].precio or 0) * linea.num_habitaciones
+            for noche in noches_estancia
+        )
+        reservas.append(Reserva(
+            hotel_id=tipos[linea.tipo_habitacion_id].hotel_id,
+            tipo_habitacion_id=linea.tipo_habitacion_id,
+            fecha_entrada=linea.fecha_entrada,
+            fecha_salida=linea.fecha_salida,
+            num_habitaciones=linea.num_habitaciones,
+            num_huespedes=linea.num_huespedes,
+            precio_total=total_price if total_price > 0 else None,
+            cliente_nombre=linea.cliente_nombre,
+            cliente_email=linea.cliente_email,
+            cliente_telefono=linea.cliente_telefono,
+            estado="confirmada",
+            reserva_pms_id=str(uuid.uuid4()),
+            notas=linea.notas
+        ))
+    
+    db.add_all(reservas)
+    
+    # Reducir disponibilidad: un UPDATE condicional por tipo de habitacion
+    for tipo_id, por_noche in demanda.items():
+        if descontar_stock_noches(db, tipo_id, por_noche) != len(por_noche):
+            # Otra reserva concurrente ha consumido el stock tras la verificación
+            db.rollback()
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail="Sin disponibilidad: el stock ha sido reservado por otra operación"
+            )
+    
+    # Respuesta (flush para obtener ids y created_at antes de confirmar)
+    db.flush()
+    precios = [reserva.precio_total for reserva in reservas if reserva.precio_total]
+    respuesta = ReservaLoteResponse(
+        reservas=[
+            ReservaResponse(
+                id=reserva.id,
+                localizador=reserva.reserva_pms_id,
+                hotel_id=reserva.hotel_id,
+                tipo_habitacion_id=reserva.tipo_habitacion_id,
+                fecha_entrada=reserva.fecha_entrada,
+                fecha_salida=reserva.fecha_salida,
+                num_habitaciones=reserva.num_habitaciones,
+                num_huespedes=reserva.num_huespedes,
+                precio_total=reserva.precio_total,
+                estado=reserva.estado,
+                cliente_nombre=reserva.cliente_nombre,
+                cliente_email=reserva.cliente_email,
+                created_at=reserva.created_at
+            )
+            for reserva in reservas
+        ],
+        precio_total=sum(precios) if precios else None
+    )
+    
+    if clave_idempotencia is not None:
+        guardar_clave(db, clave_idempotencia, hash_cuerpo, status.HTTP_201_CREATED, respuesta)
+    
+    registrar_cambios_reservas(db, reservas, "crear", demanda)
+    
+    # Guardar todo en un único commit
+    capacidad_max = max(tipo.capacidad_max or 0 for tipo in tipos.values()) or None
+    db.commit()
+    cambio_inventario(db, tipo_ids, fecha_desde, fecha_hasta - timedelta(days=1), capacidad_max)
+    
+    return respuesta
+
+
+def cancelar_reservas(db: Session, reserva_ids: List[int], user_id: int) -> CancelacionLoteResponse:
+    """
+    Cancelar reservas y restaurar su stock en una transacción (vía run_sync).
+
+    Solo se bloquean y cancelan reservas de hoteles de `user_id`: las de otra
+    cuenta se tratan igual que las inexistentes (404), sin revelar que existen.
+
+    El cambio de estado es un UPDATE condicional (solo reservas confirmadas):
+    si una cancelación concurrente se adelanta, el número de filas no
+    coincide y se deshace todo, de modo que el stock nunca se devuelve dos
+    veces. Después se restauran las noches con un UPDATE por tipo de
+    habitación.
+    """
+    ids = sorted(set(reserva_ids))
+    reservas = db.query(Reserva).join(Hotel, Hotel.id == Reserva.hotel_id).filter(
+        Reserva.id.in_(ids),
+        Hotel.user_id == user_id
+    ).with_for_update(of=Reserva).all()
+    
+    no_encontradas = sorted(set(ids) - {reserva.id for reserva in reservas})
+    if no_encontradas:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Reservas no encontradas: {', '.join(map(str, no_encontradas))}"
+        )
+    
+    no_cancelables = [r.id for r in reservas if r.estado not in ("confirmada", "cancelada")]
+    if no_cancelables:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=f"Reservas que no se pueden cancelar: {', '.join(map(str, no_cancelables))}"
+        )
+    
+    a_cancelar = [reserva for reserva in reservas if reserva.estado == "confirmada"]
+    ya_canceladas = [reserva.id for reserva in reservas if reserva.estado == "cancelada"]
+    if not a_cancelar:
+        return CancelacionLoteResponse(canceladas=[], ya_canceladas=ya_canceladas, noches_restauradas=0)
+    
+    # Cambiar estado con un único UPDATE condicional
+    canceladas = [reserva.id for reserva in a_cancelar]
+    resultado = db.execute(
+        update(Reserva).where(
+            Reserva.id.in_(canceladas),
+            Reserva.estado == "confirmada"
+        ).values(
+            estado="cancelada",
+            fecha_cancelacion=datetime.utcnow()
+        ).execution_options(synchronize_session="evaluate")
+    )
+    if resultado.rowcount != len(canceladas):
+        db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Las reservas han sido modificadas por otra operación, reintente la cancelación"
+        )
+    
+    # Cantidad a devolver por tipo y noche
+    devolver: Dict[int, Dict[date, int]] = defaultdict(lambda: defaultdict(int))
+    for reserva in a_cancelar:
+        for ordinal in range(reserva.fecha_entrada.toordinal(), reserva.fecha_salida.toordinal()):
+            devolver[reserva.tipo_habitacion_id][date.fromordinal(ordinal)] += reserva.num_habitaciones or 1
+    
+    noches_restauradas = sum(
+        restaurar_stock_noches(db, tipo_id, por_noche) for tipo_id, por_noche in devolver.items()
+    )
+    registrar_cambios_reservas(db, a_cancelar, "cancelar", devolver)
+    
+    fecha_desde = min(reserva.fecha_entrada for reserva in a_cancelar)
+    fecha_hasta = max(reserva.fecha_salida for reserva in a_cancelar)
+    db.commit()
+    cambio_inventario(db, list(devolver), fecha_desde, fecha_hasta - timedelta(days=1))
+    
+    return CancelacionLoteResponse(
+        canceladas=canceladas,
+        ya_canceladas=ya_canceladas,
+        noches_restauradas=noches_restauradas
+    )
+
+
+def registrar_cambios_reservas(
+    db: Session,
+    reservas: List[Reserva],
+    operacion: str,
+    noches_por_tipo: Dict[int, Dict[date, int]]
+):
+    """Registrar una entrada por reserva y otra de disponibilidad por tipo de habitación afectado"""
+    hotel_por_tipo = {}
+    for reserva in reservas:
+        hotel_por_tipo[reserva.tipo_habitacion_id] = reserva.hotel_id
+        registrar_cambio(
+            db, "reserva", operacion, reserva.hotel_id, reserva.tipo_habitacion_id, reserva.id,
+            reserva.fecha_entrada, reserva.fecha_salida - timedelta(days=1)
+        )
+    for tipo_id, por_noche in noches_por_tipo.items():
+        registrar_cambio(
+            db, "disponibilidad", "actualizar", hotel_por_tipo[tipo_id], tipo_id,
+            fecha_desde=min(por_noche), fecha_hasta=max(por_noche)
+        )
+
+
+def obtener_reserva(db: Session, reserva_id: int) -> ReservaResponse:
+    """Obtener reserva por ID (se ejecuta vía run_sync, fuera del event loop)"""
     reserva = db.query(Reserva).filter(Reserva.id == reserva_id).first()
     
     if not reserva:
@@ -6,7 +6,9 @@ from .schemas import (
     HotelBase, HotelCreate, HotelResponse, HotelUpdate, HotelConHabitaciones,
     TipoHabitacionBase, TipoHabitacionCreate, TipoHabitacionResponse, TipoHabitacionUpdate, TipoHabitacionConHotel,
     DisponibilidadBase, DisponibilidadCreate, DisponibilidadUpdate, DisponibilidadResponse, DisponibilidadBulkCreate, ConsultaDisponibilidad,
-    PaginatedResponse, MessageResponse
+    ARIOverride, ARIRango, DisponibilidadARIBulk,
+    PaginatedResponse, MessageResponse,
+    CambioResponse, CambiosResponse
 )
 
 __all__ = [
@@ -14,5 +16,7 @@ __all__ = [
     "HotelBase", "HotelCreate", "HotelResponse", "HotelUpdate", "HotelConHabitaciones",
     "TipoHabitacionBase", "TipoHabitacionCreate", "TipoHabitacionResponse", "TipoHabitacionUpdate", "TipoHabitacionConHotel",
     "DisponibilidadBase", "DisponibilidadCreate", "DisponibilidadUpdate", "DisponibilidadResponse", "DisponibilidadBulkCreate", "ConsultaDisponibilidad",
-    "PaginatedResponse", "MessageResponse"
+    "ARIOverride", "ARIRango", "DisponibilidadARIBulk",
+    "PaginatedResponse", "MessageResponse",
+    "CambioResponse", "CambiosResponse"
 ]
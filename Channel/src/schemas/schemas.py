@@ -1,6 +1,8 @@
 from datetime import date, datetime
 from typing import Optional, List
-from pydantic import BaseModel
+from pydantic import BaseModel, Field, conint, model_validator
+
+from ..config import ARI_RANGO_MAX_DIAS
 
 
 class UserCreate(BaseModel):
@@ -132,17 +134,64 @@ class DisponibilidadUpdate(BaseModel):
 
 class DisponibilidadResponse(DisponibilidadBase):
     id: int
+    precio: Optional[float] = None  # Las cargas ARI pueden crear fechas sin precio
 
     class Config:
         from_attributes = True
 
 
+def validar_rango_ari(fecha_inicio: date, fecha_fin: date):
+    """
+    El rango se expande día a día: se acota para que una petición no genere
+    millones de filas
+    """
+    if fecha_inicio > fecha_fin:
+        raise ValueError("fecha_inicio debe ser anterior o igual a fecha_fin")
+    if (fecha_fin - fecha_inicio).days >= ARI_RANGO_MAX_DIAS:
+        raise ValueError(f"El rango no puede superar {ARI_RANGO_MAX_DIAS} días")
+
+
 class DisponibilidadBulkCreate(BaseModel):
     tipo_habitacion_id: int
     fecha_inicio: date
     fecha_fin: date
-    cantidad_disponible: int
-    precio: float
+    cantidad_disponible: int = Field(..., ge=0)
+    precio: float = Field(..., ge=0)
+
+    @model_validator(mode="after")
+    def validar_rango(self):
+        validar_rango_ari(self.fecha_inicio, self.fecha_fin)
+        return self
+
+
+class ARIOverride(BaseModel):
+    """Valores para un día concreto; prevalecen sobre los del rango"""
+    fecha: date
+    cantidad_disponible: Optional[int] = Field(None, ge=0)
+    precio: Optional[float] = Field(None, ge=0)
+    cerrado: Optional[bool] = None
+
+
+class ARIRango(BaseModel):
+    """Actualización ARI (disponibilidad, precio y cierre) de un tipo de habitación"""
+    tipo_habitacion_id: int
+    fecha_inicio: date
+    fecha_fin: date
+    dias_semana: Optional[List[conint(ge=0, le=6)]] = None  # 0 = lunes ... 6 = domingo; None = todos
+    cantidad_disponible: Optional[int] = Field(None, ge=0)
+    precio: Optional[float] = Field(None, ge=0)
+    cerrado: Optional[bool] = None
+    overrides: List[ARIOverride] = []
+
+    @model_validator(mode="after")
+    def validar_rango(self):
+        validar_rango_ari(self.fecha_inicio, self.fecha_fin)
+        return self
+
+
+class DisponibilidadARIBulk(BaseModel):
+    """Carga masiva ARI para varios tipos de habitación en una sola petición"""
+    actualizaciones: List[ARIRango]
 
 
 class ConsultaDisponibilidad(BaseModel):
@@ -157,6 +206,7 @@ class PaginatedResponse(BaseModel):
     total: int
     page: int
     page_size: int
+    next_cursor: Optional[str] = None  # None en la última página
 
 
 class MessageResponse(BaseModel):
@@ -164,6 +214,29 @@ class MessageResponse(BaseModel):
     success: bool = True
 
 
+# ============== Registro de cambios ==============
+
+class CambioResponse(BaseModel):
+    seq: int
+    entidad: str  # hotel, disponibilidad, reserva, tipo_habitacion
+    operacion: str  # crear, actualizar, eliminar, cancelar
+    entidad_id: Optional[int] = None
+    hotel_id: int
+    tipo_habitacion_id: Optional[int] = None
+    fecha_desde: Optional[date] = None
+    fecha_hasta: Optional[date] = None
+    created_at: datetime
+
+    class Config:
+        from_attributes = True
+
+
+class CambiosResponse(BaseModel):
+    cambios: List[CambioResponse]
+    ultimo_seq: int  # valor de `since` para la siguiente consulta
+    hay_mas: bool
+
+
 # ============ RESERVAS ============
 
 class ReservaBase(BaseModel):
@@ -0,0 +1,32 @@
+"""
+Channel Manager - Services Package
+"""
+from .ari import aplicar_ari, rango_fechas
+from .busqueda import buscar_disponibilidad, cache_busqueda, invalidar_busquedas
+from .calendario import generar_calendario
+from .cambios import (
+    cambio_inventario, cambio_catalogo, aviso_cambios, registrar_cambio, registrar_bajas_en_cascada,
+    listar_cambios
+)
+from .idempotencia import hash_peticion, buscar_clave, guardar_clave, limpiar_claves_expiradas
+from .inventario import (
+    cargar_noches, cargar_noches_tipos, descontar_stock, descontar_stock_noches, restaurar_stock_noches,
+    upsert_disponibilidad
+)
+from .inventario_memoria import inventario_memoria
+from .paginacion import codificar_cursor, decodificar_cursor
+from .serializacion import columnas_schema, filas_a_dicts
+
+__all__ = [
+    "aplicar_ari", "rango_fechas",
+    "buscar_disponibilidad", "cache_busqueda", "invalidar_busquedas",
+    "generar_calendario",
+    "cambio_inventario", "cambio_catalogo", "aviso_cambios", "registrar_cambio", "registrar_bajas_en_cascada",
+    "listar_cambios",
+    "hash_peticion", "buscar_clave", "guardar_clave", "limpiar_claves_expiradas",
+    "cargar_noches", "cargar_noches_tipos", "descontar_stock", "descontar_stock_noches",
+    "restaurar_stock_noches", "upsert_disponibilidad",
+    "inventario_memoria",
+    "codificar_cursor", "decodificar_cursor",
+    "columnas_schema", "filas_a_dicts"
+]
@@ -0,0 +1,93 @@
+"""
+Channel Manager - Motor de carga masiva ARI (Availability, Rates & Inventory)
+"""
+from collections import defaultdict
+from datetime import date, timedelta
+from typing import Dict, List, Tuple
+
+from sqlalchemy.orm import Session
+
+from ..models import Disponibilidad
+from ..schemas import ARIRango
+from .inventario import upsert_disponibilidad
+
+CAMPOS_ARI = ("cantidad_disponible", "precio", "cerrado")
+
+
+def expandir_ari(actualizaciones: List[ARIRango]) -> Dict[Tuple[int, object], dict]:
+    """
+    Expandir rangos, máscaras de días de la semana y overrides a un valor
+    por (tipo_habitacion_id, fecha).
+
+    Los rangos se aplican en orden (el último gana) y los overrides de cada
+    rango después de sus días. Solo se incluyen los campos informados.
+    """
+    valores: Dict[Tuple[int, object], dict] = defaultdict(dict)
+
+    for rango in actualizaciones:
+        campos = {
+            campo: getattr(rango, campo)
+            for campo in CAMPOS_ARI
+            if getattr(rango, campo) is not None
+        }
+        dias_semana = set(rango.dias_semana) if rango.dias_semana is not None else None
+
+        if campos:
+            fecha = rango.fecha_inicio
+            while fecha <= rango.fecha_fin:
+                if dias_semana is None or fecha.weekday() in dias_semana:
+                    valores[(rango.tipo_habitacion_id, fecha)].update(campos)
+                fecha += timedelta(days=1)
+
+        for override in rango.overrides:
+            campos_override = override.model_dump(exclude={"fecha"}, exclude_none=True)
+            if campos_override:
+                valores[(rango.tipo_habitacion_id, override.fecha)].update(campos_override)
+
+    return valores
+
+
+def rango_fechas(actualizaciones: List[ARIRango]) -> Tuple[date, date]:
+    """Primera y última fecha tocadas por una carga ARI (incluidos overrides)"""
+    fechas = [r.fecha_inicio for r in actualizaciones] + [r.fecha_fin for r in actualizaciones]
+    fechas += [o.fecha for r in actualizaciones for o in r.overrides]
+    return min(fechas), max(fechas)
+
+
+def aplicar_ari(db: Session, actualizaciones: List[ARIRango]) -> dict:
+    """
+    Aplicar una carga ARI con upserts por lotes dentro de la transacción
+    de la sesión (el commit lo hace quien llama).
+
+    Las filas se agrupan por el conjunto de campos informados para que cada
+    grupo se resuelva con sentencias INSERT ... ON CONFLICT DO UPDATE
+    multi-valor que solo actualizan esos campos.
+    """
+    valores = expandir_ari(actualizaciones)
+    if not valores:
+        return {"creados": 0, "actualizados": 0}
+
+    # Claves ya existentes, en una sola consulta, para el recuento
+    tipo_ids = {tipo_id for tipo_id, _ in valores}
+    fechas = [fecha for _, fecha in valores]
+    existentes = set(
+        db.query(Disponibilidad.tipo_habitacion_id, Disponibilidad.fecha).filter(
+            Disponibilidad.tipo_habitacion_id.in_(tipo_ids),
+            Disponibilidad.fecha >= min(fechas),
+            Disponibilidad.fecha <= max(fechas)
+        ).all()
+    )
+
+    grupos: Dict[Tuple[str, ...], List[dict]] = defaultdict(list)
+    for (tipo_id, fecha), campos in valores.items():
+        columnas = tuple(sorted(campos))
+        grupos[columnas].append({"tipo_habitacion_id": tipo_id, "fecha": fecha, **campos})
+
+    for columnas, filas in grupos.items():
+        upsert_disponibilidad(db, filas, columnas_actualizar=columnas)
+
+    actualizados = sum(1 for clave in valores if clave in existentes)
+    return {
+        "creados": len(valores) - actualizados,
+        "actualizados": actualizados
+    }
@@ -0,0 +1,115 @@
+"""
+Channel Manager - Motor de búsqueda de disponibilidad
+"""
+from datetime import date
+from typing import List, Optional
+
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from ..config import BUSQUEDA_CACHE_TTL, BUSQUEDA_CACHE_MAX
+from ..models import Disponibilidad, TipoHabitacion, Hotel
+from .cache import CacheTTL
+
+# Precio por noche cuando la disponibilidad no tiene precio definido
+PRECIO_POR_DEFECTO = 100
+
+# Foto por defecto para los resultados de búsqueda
+FOTO_POR_DEFECTO = "https://images.unsplash.com/photo-1611892440504-42a792e24d32?w=800"
+
+# Resultados de búsqueda por (fecha_inicio, fecha_fin, num_huespedes)
+cache_busqueda = CacheTTL(max_entradas=BUSQUEDA_CACHE_MAX, ttl=BUSQUEDA_CACHE_TTL)
+
+
+def buscar_disponibilidad(
+    db: Session,
+    fecha_inicio: date,
+    fecha_fin: date,
+    num_huespedes: int
+) -> List[dict]:
+    """
+    Buscar tipos de habitación con disponibilidad para todas las noches
+    del rango [fecha_inicio, fecha_fin).
+
+    Resuelve la búsqueda con una única consulta: agrega (MIN/SUM/COUNT) la
+    disponibilidad del rango por tipo de habitación y la une con
+    TipoHabitacion y Hotel, de modo que el número de consultas no depende
+    del número de tipos de habitación ni de la duración de la estancia.
+    """
+    noches = (fecha_fin - fecha_inicio).days
+    if noches <= 0:
+        return []
+
+    # Agregados por tipo de habitación sobre las noches de la estancia
+    agregados = db.query(
+        Disponibilidad.tipo_habitacion_id.label("tipo_habitacion_id"),
+        func.min(Disponibilidad.cantidad_disponible).label("disponibilidad_minima"),
+        func.sum(
+            func.coalesce(func.nullif(Disponibilidad.precio, 0), PRECIO_POR_DEFECTO)
+        ).label("precio_total"),
+        func.count(Disponibilidad.id).label("noches")
+    ).filter(
+        Disponibilidad.fecha >= fecha_inicio,
+        Disponibilidad.fecha < fecha_fin
+    ).group_by(
+        Disponibilidad.tipo_habitacion_id
+    ).subquery()
+
+    filas = db.query(
+        TipoHabitacion.id,
+        TipoHabitacion.nombre,
+        TipoHabitacion.descripcion,
+        TipoHabitacion.capacidad_max,
+        TipoHabitacion.servicios,
+        Hotel.id.label("hotel_id"),
+        Hotel.nombre.label("hotel_nombre"),
+        agregados.c.disponibilidad_minima,
+        agregados.c.precio_total
+    ).join(
+        Hotel, Hotel.id == TipoHabitacion.hotel_id
+    ).join(
+        agregados, agregados.c.tipo_habitacion_id == TipoHabitacion.id
+    ).filter(
+        TipoHabitacion.capacidad_max >= num_huespedes,
+        # Solo tipos con disponibilidad para todas las noches del rango
+        agregados.c.noches == noches,
+        agregados.c.disponibilidad_minima > 0
+    ).order_by(TipoHabitacion.id).all()
+
+    return [
+        {
+            "tipo_habitacion_id": fila.id,
+            "tipo_nombre": fila.nombre,
+            "hotel_id": fila.hotel_id,
+            "hotel_nombre": fila.hotel_nombre,
+            "descripcion": fila.descripcion or f"Habitación {fila.nombre}",
+            "capacidad_max": fila.capacidad_max,
+            "precio": float(fila.precio_total),
+            "cantidad_disponible": int(fila.disponibilidad_minima),
+            "foto_url": FOTO_POR_DEFECTO,
+            "servicios": fila.servicios or ""
+        }
+        for fila in filas
+    ]
+
+
+def invalidar_busquedas(
+    fecha_desde: date,
+    fecha_hasta: date,
+    capacidad_max: Optional[int] = None
+) -> int:
+    """
+    Invalidar las búsquedas cacheadas afectadas por un cambio de inventario
+    en las noches [fecha_desde, fecha_hasta] (ambas incluidas).
+
+    Una búsqueda se ve afectada si su estancia incluye alguna de esas
+    noches; si se indica la capacidad del tipo de habitación modificado, se
+    conservan las búsquedas con más huéspedes de los que admite.
+    """
+    def afectada(clave, _resultados):
+        fecha_inicio, fecha_fin, num_huespedes = clave
+        if capacidad_max is not None and num_huespedes > capacidad_max:
+            return False
+        return fecha_inicio <= fecha_hasta and fecha_desde < fecha_fin
+
+    return cache_busqueda.invalidar(afectada)
@@ -0,0 +1,100 @@
+"""
+Channel Manager - Caché en memoria con expiración (TTL) y desalojo LRU
+"""
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Hashable, Optional
+
+_AUSENTE = object()
+
+
+class CacheTTL:
+    """
+    Caché LRU acotada con expiración por entrada, segura entre hilos.
+
+    Lleva contadores de aciertos, fallos, desalojos e invalidaciones para
+    monitorización. El atributo ``version`` se incrementa con cada
+    invalidación: quien calcula un valor puede pasar la versión leída antes
+    del cálculo a ``set`` para no guardar resultados que una escritura
+    concurrente ya ha dejado obsoletos.
+    """
+
+    def __init__(self, max_entradas: int = 1024, ttl: float = 30.0):
+        self.max_entradas = max_entradas
+        self.ttl = ttl
+        self.version = 0
+        self.hits = 0
+        self.misses = 0
+        self.desalojos = 0
+        self.invalidaciones = 0
+        self._datos: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    @property
+    def activa(self) -> bool:
+        return self.ttl > 0 and self.max_entradas > 0
+
+    def get(self, clave: Hashable, default: Any = None) -> Any:
+        """Obtener un valor vigente (o default) y marcarlo como usado recientemente"""
+        with self._lock:
+            entrada = self._datos.get(clave, _AUSENTE)
+            if entrada is _AUSENTE or entrada[0] <= time.monotonic():
+                if entrada is not _AUSENTE:
+                    del self._datos[clave]
+                self.misses += 1
+                return default
+            self._datos.move_to_end(clave)
+            self.hits += 1
+            return entrada[1]
+
+    def set(self, clave: Hashable, valor: Any, ttl: Optional[float] = None, version: Optional[int] = None):
+        """Guardar un valor; se descarta si la caché se invalidó desde `version`"""
+        if not self.activa:
+            return
+        with self._lock:
+            if version is not None and version != self.version:
+                return
+            self._datos[clave] = (time.monotonic() + (ttl if ttl is not None else self.ttl), valor)
+            self._datos.move_to_end(clave)
+            while len(self._datos) > self.max_entradas:
+                self._datos.popitem(last=False)
+                self.desalojos += 1
+
+    def invalidar(self, afectada: Callable[[Hashable, Any], bool]) -> int:
+        """Eliminar las entradas para las que afectada(clave, valor) es cierto"""
+        with self._lock:
+            self.version += 1
+            claves = [clave for clave, (_, valor) in self._datos.items() if afectada(clave, valor)]
+            for clave in claves:
+                del self._datos[clave]
+            self.invalidaciones += len(claves)
+            return len(claves)
+
+    def eliminar(self, clave: Hashable):
+        """Eliminar una entrada concreta"""
+        with self._lock:
+            self.version += 1
+            if self._datos.pop(clave, _AUSENTE) is not _AUSENTE:
+                self.invalidaciones += 1
+
+    def limpiar(self):
+        """Vaciar la caché"""
+        with self._lock:
+            self.version += 1
+            self.invalidaciones += len(self._datos)
+            self._datos.clear()
+
+    def estadisticas(self) -> dict:
+        with self._lock:
+            consultas = self.hits + self.misses
+            return {
+                "entradas": len(self._datos),
+                "max_entradas": self.max_entradas,
+                "ttl_segundos": self.ttl,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / consultas, 4) if consultas else 0.0,
+                "desalojos": self.desalojos,
+                "invalidaciones": self.invalidaciones
+            }
@@ -0,0 +1,75 @@
+"""
+Channel Manager - Calendario de disponibilidad multi-hotel
+"""
+from datetime import date
+from typing import Iterator, List
+
+from sqlalchemy import and_
+from sqlalchemy.orm import Session
+
+from ..models import Disponibilidad, TipoHabitacion, Hotel
+
+# Filas que se traen de la BD por cada lote del cursor
+FILAS_POR_LOTE = 2000
+
+
+def generar_calendario(
+    db: Session,
+    hotel_ids: List[int],
+    fecha_inicio: date,
+    fecha_fin: date
+) -> Iterator[dict]:
+    """
+    Recorrer con una única consulta ordenada (hotel, tipo, fecha) la
+    disponibilidad de varios hoteles en [fecha_inicio, fecha_fin] y emitir
+    el calendario de cada tipo de habitación en cuanto está completo.
+
+    La consulta parte de TipoHabitacion con un LEFT JOIN a Disponibilidad
+    para incluir también los tipos sin disponibilidad en el rango, y se lee
+    por lotes, de modo que la memoria usada no depende del tamaño del rango.
+    """
+    filas = db.query(
+        Hotel.id,
+        Hotel.nombre,
+        TipoHabitacion.id,
+        TipoHabitacion.nombre,
+        Disponibilidad.fecha,
+        Disponibilidad.cantidad_disponible,
+        Disponibilidad.precio,
+        Disponibilidad.cerrado
+    ).select_from(TipoHabitacion).join(
+        Hotel, Hotel.id == TipoHabitacion.hotel_id
+    ).outerjoin(
+        Disponibilidad, and_(
+            Disponibilidad.tipo_habitacion_id == TipoHabitacion.id,
+            Disponibilidad.fecha >= fecha_inicio,
+            Disponibilidad.fecha <= fecha_fin
+        )
+    ).filter(
+        TipoHabitacion.hotel_id.in_(hotel_ids),
+        TipoHabitacion.activo == True
+    ).order_by(
+        Hotel.id, TipoHabitacion.id, Disponibilidad.fecha
+    ).yield_per(FILAS_POR_LOTE)
+
+    actual = None
+    for hotel_id, hotel_nombre, tipo_id, tipo_nombre, fecha, cantidad, precio, cerrado in filas:
+        if actual is None or actual["tipo_id"] != tipo_id:
+            if actual is not None:
+                yield actual
+            actual = {
+                "hotel_id": hotel_id,
+                "hotel_nombre": hotel_nombre,
+                "tipo_id": tipo_id,
+                "tipo_nombre": tipo_nombre,
+                "dias": {}
+            }
+        if fecha is not None:
+            actual["dias"][fecha.isoformat()] = {
+                "disponible": cantidad,
+                "precio": precio,
+                "cerrado": cerrado
+            }
+
+    if actual is not None:
+        yield actual
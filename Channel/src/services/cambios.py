@@ -0,0 +1,188 @@
+"""
+Channel Manager - Propagación de cambios a las estructuras en memoria y
+registro de cambios para la sincronización incremental (GET /api/changes)
+"""
+import asyncio
+import threading
+from datetime import date, timedelta
+from typing import Iterable, List, Optional
+
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from ..models.models import Cambio, Disponibilidad, Hotel, Reserva
+from .busqueda import cache_busqueda, invalidar_busquedas
+from .inventario_memoria import inventario_memoria
+
+
+class AvisoCambios:
+    """
+    Despertar a las peticiones long-poll del proceso en cuanto se confirma
+    un cambio. Las escrituras llegan desde hilos del threadpool, así que
+    cada espera se resuelve en su event loop con call_soon_threadsafe.
+    Los cambios hechos por otros workers solo se ven al volver a consultar.
+    """
+
+    def __init__(self):
+        self._esperas = set()
+        self._lock = threading.Lock()
+
+    def preparar(self) -> asyncio.Future:
+        """Registrar una espera antes de consultar, para no perder avisos intermedios"""
+        futuro = asyncio.get_running_loop().create_future()
+        with self._lock:
+            self._esperas.add(futuro)
+        return futuro
+
+    async def esperar(self, futuro: asyncio.Future, timeout: float):
+        try:
+            await asyncio.wait_for(asyncio.shield(futuro), timeout)
+        except asyncio.TimeoutError:
+            pass
+        finally:
+            self.descartar(futuro)
+
+    def descartar(self, futuro: asyncio.Future):
+        with self._lock:
+            self._esperas.discard(futuro)
+
+    def notificar(self):
+        with self._lock:
+            esperas, self._esperas = self._esperas, set()
+        for futuro in esperas:
+            try:
+                futuro.get_loop().call_soon_threadsafe(_resolver, futuro)
+            except RuntimeError:
+                pass  # Event loop ya cerrado
+
+
+def _resolver(futuro: asyncio.Future):
+    if not futuro.done():
+        futuro.set_result(None)
+
+
+aviso_cambios = AvisoCambios()
+
+
+def registrar_cambio(
+    db: Session,
+    entidad: str,
+    operacion: str,
+    hotel_id: int,
+    tipo_habitacion_id: Optional[int] = None,
+    entidad_id: Optional[int] = None,
+    fecha_desde: Optional[date] = None,
+    fecha_hasta: Optional[date] = None,
+    user_id: Optional[int] = None
+):
+    """
+    Añadir una entrada al registro de cambios dentro de la transacción en
+    curso (se confirma junto con la escritura que describe). Las escrituras
+    de inventario por rangos generan una entrada por tipo de habitación con
+    las noches afectadas, no una por noche.
+
+    Si no se indica `user_id`, el propietario se toma del hotel al insertar
+    la entrada.
+    """
+    if user_id is None:
+        user_id = select(Hotel.user_id).where(Hotel.id == hotel_id).scalar_subquery()
+    db.add(Cambio(
+        entidad=entidad,
+        operacion=operacion,
+        entidad_id=entidad_id,
+        hotel_id=hotel_id,
+        user_id=user_id,
+        tipo_habitacion_id=tipo_habitacion_id,
+        fecha_desde=fecha_desde,
+        fecha_hasta=fecha_hasta
+    ))
+
+
+def registrar_bajas_en_cascada(
+    db: Session,
+    hotel_id: int,
+    user_id: int,
+    tipo_ids: List[int],
+    hotel_completo: bool = False
+):
+    """
+    Registrar, antes de borrarlos, la baja de los tipos de habitación
+    indicados y de lo que se elimina en cascada con ellos: una entrada de
+    disponibilidad por tipo con el rango de noches que tenía y una por
+    reserva. Con `hotel_completo` se incluyen todas las reservas del hotel.
+    """
+    for tipo_id in tipo_ids:
+        registrar_cambio(db, "tipo_habitacion", "eliminar", hotel_id, tipo_id, tipo_id, user_id=user_id)
+    
+    rangos = db.query(
+        Disponibilidad.tipo_habitacion_id, func.min(Disponibilidad.fecha), func.max(Disponibilidad.fecha)
+    ).filter(
+        Disponibilidad.tipo_habitacion_id.in_(tipo_ids)
+    ).group_by(Disponibilidad.tipo_habitacion_id).all()
+    for tipo_id, fecha_desde, fecha_hasta in rangos:
+        registrar_cambio(
+            db, "disponibilidad", "eliminar", hotel_id, tipo_id,
+            fecha_desde=fecha_desde, fecha_hasta=fecha_hasta, user_id=user_id
+        )
+    
+    filtro = Reserva.hotel_id == hotel_id if hotel_completo else Reserva.tipo_habitacion_id.in_(tipo_ids)
+    reservas = db.query(
+        Reserva.id, Reserva.tipo_habitacion_id, Reserva.fecha_entrada, Reserva.fecha_salida
+    ).filter(filtro).order_by(Reserva.id).all()
+    for reserva_id, tipo_id, fecha_entrada, fecha_salida in reservas:
+        registrar_cambio(
+            db, "reserva", "eliminar", hotel_id, tipo_id, reserva_id,
+            fecha_entrada, fecha_salida - timedelta(days=1), user_id=user_id
+        )
+
+
+def listar_cambios(
+    db: Session,
+    desde_seq: int,
+    user_id: int,
+    hotel_id: Optional[int],
+    limite: int
+) -> List[Cambio]:
+    """
+    Cambios posteriores a desde_seq de los hoteles del usuario (solo de
+    hotel_id, si se indica), en orden de secuencia. Se filtra por el
+    propietario guardado en cada entrada, de modo que las bajas de hoteles
+    ya eliminados también se devuelven.
+    """
+    query = db.query(Cambio).filter(
+        Cambio.seq > desde_seq,
+        Cambio.user_id == user_id
+    )
+    if hotel_id is not None:
+        query = query.filter(Cambio.hotel_id == hotel_id)
+    return query.order_by(Cambio.seq).limit(limite).all()
+
+
+def cambio_inventario(
+    db: Session,
+    tipo_ids: Iterable[int],
+    fecha_desde: date,
+    fecha_hasta: date,
+    capacidad_max: Optional[int] = None
+):
+    """
+    Notificar un cambio de Disponibilidad ya confirmado (commit) en las
+    noches [fecha_desde, fecha_hasta] de los tipos indicados.
+    """
+    invalidar_busquedas(fecha_desde, fecha_hasta, capacidad_max)
+    inventario_memoria.recargar(db, tipo_ids=tipo_ids)
+    aviso_cambios.notificar()
+
+
+def cambio_catalogo(
+    db: Session,
+    tipo_ids: Optional[Iterable[int]] = None,
+    hotel_id: Optional[int] = None
+):
+    """
+    Notificar un cambio ya confirmado en hoteles o tipos de habitación
+    (nombres, capacidades, altas y bajas).
+    """
+    cache_busqueda.limpiar()
+    inventario_memoria.recargar(db, tipo_ids=tipo_ids, hotel_id=hotel_id)
+    aviso_cambios.notificar()
@@ -0,0 +1,70 @@
+"""
+Channel Manager - Claves de idempotencia (cabecera Idempotency-Key)
+"""
+import hashlib
+import threading
+import time
+from datetime import datetime, timedelta
+from typing import Optional
+
+from pydantic import BaseModel
+from sqlalchemy.orm import Session
+
+from ..config import IDEMPOTENCIA_TTL_HORAS, IDEMPOTENCIA_LIMPIEZA_SEGUNDOS
+from ..models.models import ClaveIdempotencia
+
+_ultima_limpieza = 0.0
+_lock_limpieza = threading.Lock()
+
+
+def hash_peticion(datos: BaseModel) -> str:
+    """Huella del cuerpo de la petición para detectar claves reutilizadas con otros datos"""
+    return hashlib.sha256(datos.model_dump_json().encode("utf-8")).hexdigest()
+
+
+def buscar_clave(db: Session, clave: str) -> Optional[ClaveIdempotencia]:
+    """Respuesta guardada para la clave, o None si no existe o ha expirado"""
+    registro = db.query(ClaveIdempotencia).filter(ClaveIdempotencia.clave == clave).first()
+    if registro is None:
+        return None
+    if registro.expires_at <= datetime.utcnow():
+        # Expirada: se libera la clave dentro de la transacción en curso
+        db.delete(registro)
+        db.flush()
+        return None
+    return registro
+
+
+def guardar_clave(db: Session, clave: str, hash_cuerpo: str, status_code: int, respuesta: BaseModel):
+    """
+    Añadir la respuesta a la sesión sin confirmar: se guarda en la misma
+    transacción que la operación, de modo que ambas se confirman o se
+    deshacen juntas. Una segunda petición concurrente con la misma clave
+    fallará al confirmar por la restricción UNIQUE.
+    """
+    db.add(ClaveIdempotencia(
+        clave=clave,
+        hash_peticion=hash_cuerpo,
+        status_code=status_code,
+        respuesta=respuesta.model_dump_json(),
+        expires_at=datetime.utcnow() + timedelta(hours=IDEMPOTENCIA_TTL_HORAS)
+    ))
+
+
+def limpiar_claves_expiradas(db: Session, forzar: bool = False) -> int:
+    """
+    Borrar las claves expiradas. Como mucho una vez cada
+    IDEMPOTENCIA_LIMPIEZA_SEGUNDOS por proceso, salvo con forzar=True.
+    """
+    global _ultima_limpieza
+    with _lock_limpieza:
+        ahora = time.monotonic()
+        if not forzar and ahora - _ultima_limpieza < IDEMPOTENCIA_LIMPIEZA_SEGUNDOS:
+            return 0
+        _ultima_limpieza = ahora
+
+    borradas = db.query(ClaveIdempotencia).filter(
+        ClaveIdempotencia.expires_at <= datetime.utcnow()
+    ).delete(synchronize_session=False)
+    db.commit()
+    return borradas
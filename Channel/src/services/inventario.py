@@ -0,0 +1,219 @@
+"""
+Channel Manager - Operaciones de inventario (Disponibilidad)
+"""
+from datetime import date
+from typing import Dict, Iterable, List, Tuple
+
+from sqlalchemy import case, update
+from sqlalchemy.dialects import mysql, postgresql, sqlite
+from sqlalchemy.orm import Session
+
+from ..models import Disponibilidad
+
+
+def cargar_noches(
+    db: Session,
+    tipo_habitacion_id: int,
+    fecha_entrada: date,
+    fecha_salida: date,
+    bloquear: bool = False
+) -> Dict[date, Disponibilidad]:
+    """
+    Cargar en una sola consulta la disponibilidad de todas las noches de una estancia.
+
+    Con bloquear=True las filas se leen con SELECT ... FOR UPDATE para que
+    dos reservas concurrentes sobre las mismas noches se serialicen. SQLite
+    no soporta bloqueo de filas y omite la cláusula; allí la protección
+    contra sobreventa la da el UPDATE condicional de descontar_stock.
+    """
+    query = db.query(Disponibilidad).filter(
+        Disponibilidad.tipo_habitacion_id == tipo_habitacion_id,
+        Disponibilidad.fecha >= fecha_entrada,
+        Disponibilidad.fecha < fecha_salida
+    )
+    if bloquear:
+        query = query.with_for_update()
+    return {disp.fecha: disp for disp in query.all()}
+
+
+def descontar_stock(
+    db: Session,
+    tipo_habitacion_id: int,
+    fecha_entrada: date,
+    fecha_salida: date,
+    num_habitaciones: int
+) -> int:
+    """
+    Reducir el stock de todas las noches de una estancia con un único UPDATE.
+
+    Solo se descuentan las noches abiertas con stock suficiente; la
+    condición se evalúa de forma atómica en la base de datos, por lo que
+    dos reservas concurrentes no pueden dejar el stock en negativo.
+    Devuelve el número de noches actualizadas: si es menor que el número
+    de noches de la estancia, otra reserva ha consumido el stock y la
+    transacción debe deshacerse.
+    """
+    resultado = db.execute(
+        update(Disponibilidad).where(
+            Disponibilidad.tipo_habitacion_id == tipo_habitacion_id,
+            Disponibilidad.fecha >= fecha_entrada,
+            Disponibilidad.fecha < fecha_salida,
+            Disponibilidad.cerrado == False,
+            Disponibilidad.cantidad_disponible >= num_habitaciones
+        ).values(
+            cantidad_disponible=Disponibilidad.cantidad_disponible - num_habitaciones
+        ).execution_options(synchronize_session=False)
+    )
+    return resultado.rowcount
+
+
+def cargar_noches_tipos(
+    db: Session,
+    tipo_ids: Iterable[int],
+    fecha_desde: date,
+    fecha_hasta: date,
+    bloquear: bool = False
+) -> Dict[Tuple[int, date], Disponibilidad]:
+    """
+    Variante de cargar_noches para varios tipos de habitación a la vez:
+    disponibilidad de las noches [fecha_desde, fecha_hasta) indexada por
+    (tipo_habitacion_id, fecha), en una sola consulta.
+    """
+    query = db.query(Disponibilidad).filter(
+        Disponibilidad.tipo_habitacion_id.in_(list(tipo_ids)),
+        Disponibilidad.fecha >= fecha_desde,
+        Disponibilidad.fecha < fecha_hasta
+    )
+    if bloquear:
+        query = query.with_for_update()
+    return {(disp.tipo_habitacion_id, disp.fecha): disp for disp in query.all()}
+
+
+def descontar_stock_noches(
+    db: Session,
+    tipo_habitacion_id: int,
+    cantidades: Dict[date, int]
+) -> int:
+    """
+    Reducir el stock de un tipo de habitación en noches sueltas, con una
+    cantidad distinta por noche, mediante un único UPDATE con CASE.
+
+    Igual que descontar_stock, solo se actualizan las noches abiertas con
+    stock suficiente: si el número devuelto es menor que len(cantidades),
+    la transacción debe deshacerse.
+    """
+    cantidad = case(cantidades, value=Disponibilidad.fecha)
+    resultado = db.execute(
+        update(Disponibilidad).where(
+            Disponibilidad.tipo_habitacion_id == tipo_habitacion_id,
+            Disponibilidad.fecha.in_(list(cantidades)),
+            Disponibilidad.cerrado == False,
+            Disponibilidad.cantidad_disponible >= cantidad
+        ).values(
+            cantidad_disponible=Disponibilidad.cantidad_disponible - cantidad
+        ).execution_options(synchronize_session=False)
+    )
+    return resultado.rowcount
+
+
+def restaurar_stock_noches(
+    db: Session,
+    tipo_habitacion_id: int,
+    cantidades: Dict[date, int]
+) -> int:
+    """
+    Devolver al stock de un tipo de habitación las cantidades indicadas por
+    noche (cancelaciones) con un único UPDATE con CASE. Devuelve el número
+    de noches actualizadas; las noches sin fila de disponibilidad se omiten.
+    """
+    cantidad = case(cantidades, value=Disponibilidad.fecha)
+    resultado = db.execute(
+        update(Disponibilidad).where(
+            Disponibilidad.tipo_habitacion_id == tipo_habitacion_id,
+            Disponibilidad.fecha.in_(list(cantidades))
+        ).values(
+            cantidad_disponible=Disponibilidad.cantidad_disponible + cantidad
+        ).execution_options(synchronize_session=False)
+    )
+    return resultado.rowcount
+
+
+# Filas máximas por sentencia INSERT multi-valor
+TAMANO_LOTE_UPSERT = 500
+# Parámetros máximos por sentencia: límite de SQLite anterior a 3.32 (el
+# más bajo de los motores soportados)
+MAX_PARAMETROS_SQL = 999
+
+
+def upsert_disponibilidad(
+    db: Session,
+    filas: List[dict],
+    columnas_actualizar: Iterable[str]
+) -> None:
+    """
+    Insertar o actualizar filas de Disponibilidad sin leerlas antes.
+
+    Usa el INSERT ... ON CONFLICT DO UPDATE nativo del motor (ON DUPLICATE
+    KEY UPDATE en MySQL) sobre el índice único (tipo_habitacion_id, fecha).
+    Todas las filas deben tener las mismas claves; en caso de conflicto solo
+    se actualizan las columnas indicadas en columnas_actualizar. En otros
+    motores se usa la ruta portable: SELECT de las existentes e INSERT o
+    UPDATE por fila.
+    """
+    if not filas:
+        return
+
+    columnas_actualizar = list(columnas_actualizar)
+    dialecto = db.get_bind().dialect.name
+    tabla = Disponibilidad.__table__
+    # Cada fila usa un parámetro por columna
+    tamano_lote = min(TAMANO_LOTE_UPSERT, max(1, MAX_PARAMETROS_SQL // len(filas[0])))
+
+    for inicio in range(0, len(filas), tamano_lote):
+        lote = filas[inicio:inicio + tamano_lote]
+
+        if dialecto in ("sqlite", "postgresql"):
+            insert = sqlite.insert if dialecto == "sqlite" else postgresql.insert
+            stmt = insert(tabla).values(lote)
+            stmt = stmt.on_conflict_do_update(
+                index_elements=[tabla.c.tipo_habitacion_id, tabla.c.fecha],
+                set_={col: stmt.excluded[col] for col in columnas_actualizar}
+            )
+        elif dialecto in ("mysql", "mariadb"):
+            stmt = mysql.insert(tabla).values(lote)
+            stmt = stmt.on_duplicate_key_update(
+                {col: stmt.inserted[col] for col in columnas_actualizar}
+            )
+        else:
+            _upsert_portable(db, lote, columnas_actualizar)
+            continue
+
+        db.execute(stmt)
+
+
+def _upsert_portable(
+    db: Session,
+    filas: List[dict],
+    columnas_actualizar: List[str]
+) -> None:
+    """Upsert sin sintaxis propia del motor: una consulta por tipo de habitación y ORM"""
+    por_tipo: Dict[int, List[dict]] = {}
+    for fila in filas:
+        por_tipo.setdefault(fila["tipo_habitacion_id"], []).append(fila)
+
+    for tipo_habitacion_id, filas_tipo in por_tipo.items():
+        existentes = {
+            disp.fecha: disp
+            for disp in db.query(Disponibilidad).filter(
+                Disponibilidad.tipo_habitacion_id == tipo_habitacion_id,
+                Disponibilidad.fecha.in_([fila["fecha"] for fila in filas_tipo])
+            )
+        }
+        for fila in filas_tipo:
+            existente = existentes.get(fila["fecha"])
+            if existente is None:
+                db.add(Disponibilidad(**fila))
+            else:
+                for columna in columnas_actualizar:
+                    setattr(existente, columna, fila[columna])
+    db.flush()
@@ -0,0 +1,193 @@
+"""
+Channel Manager - Inventario en memoria con arrays densos por tipo de habitación
+"""
+import threading
+from array import array
+from datetime import date
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy.orm import Session
+
+from ..models import Disponibilidad, TipoHabitacion, Hotel
+from .busqueda import PRECIO_POR_DEFECTO, FOTO_POR_DEFECTO
+
+
+class InventarioTipo:
+    """
+    Inventario de un tipo de habitación como arrays indexados por día.
+
+    La posición i corresponde a la fecha ``date.fromordinal(origen + i)``.
+    Los días sin fila de Disponibilidad tienen stock 0. ``precio`` guarda el
+    precio por noche que usa la búsqueda (PRECIO_POR_DEFECTO si no tiene).
+    """
+
+    __slots__ = (
+        "tipo_habitacion_id", "nombre", "descripcion", "capacidad_max", "servicios",
+        "hotel_id", "hotel_nombre", "origen", "stock", "precio", "cerrado"
+    )
+
+    def __init__(self, tipo: tuple, filas: List[tuple]):
+        (self.tipo_habitacion_id, self.nombre, self.descripcion, self.capacidad_max,
+         self.servicios, self.hotel_id, self.hotel_nombre) = tipo
+
+        if filas:
+            self.origen = filas[0][0].toordinal()
+            dias = filas[-1][0].toordinal() - self.origen + 1
+        else:
+            self.origen = 0
+            dias = 0
+
+        self.stock = array("l", [0]) * dias
+        self.precio = array("d", [float(PRECIO_POR_DEFECTO)]) * dias
+        self.cerrado = bytearray(dias)
+
+        for fecha, cantidad, precio, cerrado in filas:
+            i = fecha.toordinal() - self.origen
+            self.stock[i] = cantidad or 0
+            self.precio[i] = precio or PRECIO_POR_DEFECTO
+            self.cerrado[i] = 1 if cerrado else 0
+
+    def resumen_estancia(self, fecha_inicio: date, fecha_fin: date) -> Optional[Tuple[int, float]]:
+        """
+        (stock mínimo, precio total) de las noches [fecha_inicio, fecha_fin),
+        o None si alguna noche queda fuera del inventario cargado.
+        """
+        inicio = fecha_inicio.toordinal() - self.origen
+        fin = fecha_fin.toordinal() - self.origen
+        if inicio < 0 or fin > len(self.stock) or fin <= inicio:
+            return None
+        return min(self.stock[inicio:fin]), sum(self.precio[inicio:fin])
+
+
+class InventarioMemoria:
+    """
+    Copia en memoria del inventario de todos los tipos de habitación.
+
+    Se carga al arrancar y se mantiene al día recargando los tipos
+    afectados tras cada escritura, de modo que la búsqueda pública se
+    resuelve con operaciones sobre slices de arrays sin acceder a la BD.
+    Cada proceso mantiene su propia copia: solo ve las escrituras hechas
+    por el propio proceso.
+    """
+
+    def __init__(self):
+        self.cargado = False
+        self._tipos: Dict[int, InventarioTipo] = {}
+        self._orden: Tuple[InventarioTipo, ...] = ()
+        self._lock = threading.Lock()
+        # Cada carga toma un número de secuencia antes de consultar; un tipo
+        # solo se publica si su secuencia supera la ya publicada para él, de
+        # modo que una recarga lenta no pisa datos de otra más reciente
+        self._secuencia = 0
+        self._versiones: Dict[int, int] = {}
+
+    def _consultar(self, db: Session, tipo_ids=None, hotel_id=None) -> List[InventarioTipo]:
+        """Construir el inventario de los tipos indicados con dos consultas"""
+        query_tipos = db.query(
+            TipoHabitacion.id,
+            TipoHabitacion.nombre,
+            TipoHabitacion.descripcion,
+            TipoHabitacion.capacidad_max,
+            TipoHabitacion.servicios,
+            Hotel.id,
+            Hotel.nombre
+        ).join(Hotel, Hotel.id == TipoHabitacion.hotel_id)
+        query_disp = db.query(
+            Disponibilidad.tipo_habitacion_id,
+            Disponibilidad.fecha,
+            Disponibilidad.cantidad_disponible,
+            Disponibilidad.precio,
+            Disponibilidad.cerrado
+        )
+
+        if tipo_ids is not None:
+            query_tipos = query_tipos.filter(TipoHabitacion.id.in_(tipo_ids))
+            query_disp = query_disp.filter(Disponibilidad.tipo_habitacion_id.in_(tipo_ids))
+        if hotel_id is not None:
+            query_tipos = query_tipos.filter(TipoHabitacion.hotel_id == hotel_id)
+            query_disp = query_disp.join(TipoHabitacion).filter(TipoHabitacion.hotel_id == hotel_id)
+
+        filas_por_tipo: Dict[int, List[tuple]] = {}
+        for tipo_id, fecha, cantidad, precio, cerrado in query_disp.order_by(
+            Disponibilidad.tipo_habitacion_id, Disponibilidad.fecha
+        ).yield_per(5000):
+            filas_por_tipo.setdefault(tipo_id, []).append((fecha, cantidad, precio, cerrado))
+
+        return [
+            InventarioTipo(tuple(tipo), filas_por_tipo.get(tipo[0], []))
+            for tipo in query_tipos.all()
+        ]
+
+    def _publicar(self, tipos: Dict[int, InventarioTipo]):
+        self._tipos = tipos
+        self._orden = tuple(tipos[tipo_id] for tipo_id in sorted(tipos))
+
+    def _siguiente_secuencia(self) -> int:
+        with self._lock:
+            self._secuencia += 1
+            return self._secuencia
+
+    def cargar(self, db: Session):
+        """Cargar el inventario completo"""
+        secuencia = self._siguiente_secuencia()
+        tipos = {inv.tipo_habitacion_id: inv for inv in self._consultar(db)}
+        with self._lock:
+            self._versiones = dict.fromkeys(tipos, secuencia)
+            self._publicar(tipos)
+            self.cargado = True
+
+    def recargar(self, db: Session, tipo_ids: Optional[Iterable[int]] = None, hotel_id: Optional[int] = None):
+        """Recargar desde la BD los tipos indicados (o los de un hotel); los que ya no existen se eliminan"""
+        if not self.cargado:
+            return
+        tipo_ids = set(tipo_ids) if tipo_ids is not None else None
+
+        # Se llama tras el commit: la consulta, hecha después de tomar la
+        # secuencia, ve todas las escrituras anteriores a ella. No se hace con
+        # ningún lock tomado: con DB_ASYNC se ejecuta en el hilo del event loop
+        secuencia = self._siguiente_secuencia()
+        nuevos = self._consultar(db, tipo_ids=tipo_ids, hotel_id=hotel_id)
+
+        with self._lock:
+            afectados = set(tipo_ids or ())
+            afectados.update(inv.tipo_habitacion_id for inv in nuevos)
+            if hotel_id is not None:
+                afectados.update(tipo_id for tipo_id, inv in self._tipos.items() if inv.hotel_id == hotel_id)
+
+            tipos = dict(self._tipos)
+            for tipo_id in afectados:
+                if self._versiones.get(tipo_id, 0) > secuencia:
+                    continue  # Ya publicado por una recarga más reciente
+                self._versiones[tipo_id] = secuencia
+                tipos.pop(tipo_id, None)
+            tipos.update(
+                (inv.tipo_habitacion_id, inv) for inv in nuevos
+                if self._versiones[inv.tipo_habitacion_id] == secuencia
+            )
+            self._publicar(tipos)
+
+    def buscar(self, fecha_inicio: date, fecha_fin: date, num_huespedes: int) -> List[dict]:
+        """Misma búsqueda que buscar_disponibilidad, resuelta sobre los arrays en memoria"""
+        resultados = []
+        for inv in self._orden:
+            if inv.capacidad_max is None or inv.capacidad_max < num_huespedes:
+                continue
+            resumen = inv.resumen_estancia(fecha_inicio, fecha_fin)
+            if resumen is None or resumen[0] <= 0:
+                continue
+            resultados.append({
+                "tipo_habitacion_id": inv.tipo_habitacion_id,
+                "tipo_nombre": inv.nombre,
+                "hotel_id": inv.hotel_id,
+                "hotel_nombre": inv.hotel_nombre,
+                "descripcion": inv.descripcion or f"Habitación {inv.nombre}",
+                "capacidad_max": inv.capacidad_max,
+                "precio": resumen[1],
+                "cantidad_disponible": int(resumen[0]),
+                "foto_url": FOTO_POR_DEFECTO,
+                "servicios": inv.servicios or ""
+            })
+        return resultados
+
+
+inventario_memoria = InventarioMemoria()
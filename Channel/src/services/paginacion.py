@@ -0,0 +1,26 @@
+"""
+Channel Manager - Paginación por cursor (keyset)
+"""
+import base64
+import json
+from typing import Optional, Tuple
+
+
+def codificar_cursor(*clave, pagina: int) -> str:
+    """Codificar la clave de ordenación del último elemento y la página siguiente"""
+    datos = {"k": [v.isoformat() if hasattr(v, "isoformat") else v for v in clave], "p": pagina}
+    return base64.urlsafe_b64encode(json.dumps(datos).encode("utf-8")).decode("ascii")
+
+
+def decodificar_cursor(cursor: Optional[str]) -> Tuple[Optional[list], int]:
+    """
+    Devolver (clave, página) de un cursor, o (None, 1) si no hay cursor.
+    Lanza ValueError si el cursor no es válido.
+    """
+    if not cursor:
+        return None, 1
+    try:
+        datos = json.loads(base64.urlsafe_b64decode(cursor.encode("ascii")))
+        return list(datos["k"]), int(datos["p"])
+    except Exception as exc:
+        raise ValueError("Cursor inválido") from exc
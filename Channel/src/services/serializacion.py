@@ -0,0 +1,42 @@
+"""
+Channel Manager - Lectura de filas como dicts para respuestas rápidas
+"""
+from typing import List, Type
+
+from pydantic import BaseModel
+from sqlalchemy import inspect
+
+
+def columnas_schema(modelo, schema: Type[BaseModel], prefijo: str = "") -> list:
+    """
+    Columnas del modelo SQLAlchemy que corresponden a los campos escalares
+    del schema de respuesta, en el mismo orden, etiquetadas con su nombre
+    (precedido de prefijo, para columnas de relaciones anidadas).
+    """
+    columnas = inspect(modelo).columns
+    return [
+        getattr(modelo, campo).label(prefijo + campo)
+        for campo in schema.model_fields
+        if campo in columnas
+    ]
+
+
+def filas_a_dicts(filas, prefijo_anidado: dict = None) -> List[dict]:
+    """
+    Convertir filas (Row) de una consulta por columnas en dicts.
+
+    prefijo_anidado = {"hotel": "hotel__"} agrupa las columnas etiquetadas
+    como ``hotel__<campo>`` en un dict anidado bajo la clave ``hotel``.
+    """
+    resultado = []
+    for fila in filas:
+        datos = fila._asdict()
+        for clave, prefijo in (prefijo_anidado or {}).items():
+            anidado = {
+                nombre[len(prefijo):]: datos.pop(nombre)
+                for nombre in list(datos)
+                if nombre.startswith(prefijo)
+            }
+            datos[clave] = anidado if anidado.get("id") is not None else None
+        resultado.append(datos)
+    return resultado
@@ -0,0 +1,84 @@
+"""
+Channel Manager - Prueba de estrés de reservas concurrentes
+
+Lanza cientos de reservas simultáneas contra una única noche y comprueba
+que nunca se vende más stock del disponible.
+
+Uso (con el servidor arrancado, idealmente con varios workers):
+    python -m uvicorn src.main:app --port 8001 --workers 4
+    python stress_reservas.py --url http://127.0.0.1:8001 --stock 50 --reservas 400
+"""
+import argparse
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, timedelta
+
+import httpx
+
+
+def preparar_inventario(client: httpx.Client, stock: int, fecha: date) -> int:
+    """Crear usuario, hotel, tipo de habitación y una noche con el stock indicado"""
+    email = f"stress-{uuid.uuid4().hex[:8]}@channel.local"
+    client.post("/api/auth/crear-usuario", json={"email": email, "password": "stress"}).raise_for_status()
+    token = client.post("/api/auth/login", json={"email": email, "password": "stress"}).json()["access_token"]
+    headers = {"Authorization": f"Bearer {token}"}
+
+    hotel = client.post("/api/hoteles/", json={"nombre": "Hotel Stress"}, headers=headers).json()
+    tipo = client.post("/api/habitaciones/", json={
+        "codigo": "STR",
+        "nombre": "Stress",
+        "hotel_id": hotel["id"]
+    }, headers=headers).json()
+    client.post("/api/disponibilidad/", json={
+        "tipo_habitacion_id": tipo["id"],
+        "fecha": fecha.isoformat(),
+        "cantidad_disponible": stock,
+        "precio": 100
+    }, headers=headers).raise_for_status()
+    return tipo["id"]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", default="http://127.0.0.1:8001")
+    parser.add_argument("--stock", type=int, default=50)
+    parser.add_argument("--reservas", type=int, default=400)
+    parser.add_argument("--hilos", type=int, default=64)
+    args = parser.parse_args()
+
+    fecha = date.today() + timedelta(days=30)
+
+    with httpx.Client(base_url=args.url, timeout=60) as client:
+        tipo_id = preparar_inventario(client, args.stock, fecha)
+
+    payload = {
+        "tipo_habitacion_id": tipo_id,
+        "fecha_entrada": fecha.isoformat(),
+        "fecha_salida": (fecha + timedelta(days=1)).isoformat()
+    }
+
+    def reservar(_):
+        with httpx.Client(base_url=args.url, timeout=60) as client:
+            return client.post("/api/reservas/crear", json=payload).status_code
+
+    with ThreadPoolExecutor(max_workers=args.hilos) as pool:
+        codigos = list(pool.map(reservar, range(args.reservas)))
+
+    confirmadas = codigos.count(201)
+    rechazadas = codigos.count(409)
+    otros = len(codigos) - confirmadas - rechazadas
+
+    print(f"Reservas lanzadas: {len(codigos)}")
+    print(f"  Confirmadas (201): {confirmadas}")
+    print(f"  Sin stock   (409): {rechazadas}")
+    print(f"  Otros códigos:     {otros}")
+
+    if confirmadas > args.stock:
+        raise SystemExit(f"SOBREVENTA: {confirmadas} reservas para un stock de {args.stock}")
+    if otros:
+        raise SystemExit("Se recibieron respuestas inesperadas")
+    print("OK - sin sobreventa")
+
+
+if __name__ == "__main__":
+    main()
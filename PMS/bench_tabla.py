@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+PMS - Benchmark de renderizado de listados
+
+Compara el tiempo hasta tener pintada una lista de reservas:
+  - widgets por fila: un CTkFrame + CTkLabel por celda y un botón por
+    registro dentro de un CTkScrollableFrame (como se pintaban antes)
+  - TablaVirtual: solo las filas visibles, reutilizadas al desplazarse
+
+Necesita un display (en Linux sin escritorio: xvfb-run python bench_tabla.py).
+
+Uso:
+    python bench_tabla.py --filas 10000
+    python bench_tabla.py --filas 2000 --sin-clasico
+"""
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import customtkinter as ctk
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from src.ui_gui.tabla_virtual import TablaVirtual, Columna, Accion  # noqa: E402
+
+COLUMNAS = [("Cliente", 3, 200, "w"), ("Hotel", 3, 200, "w"), ("Entrada", 2, 120, "center"),
+            ("Salida", 2, 120, "center"), ("Tipo", 2, 100, "center")]
+
+
+def generar_filas(n: int):
+    return [
+        [f"Cliente {i} Apellido", f"Hotel {i % 7}", f"2026-03-{i % 28 + 1:02d}", f"2026-04-{i % 28 + 1:02d}", "RESERVA"]
+        for i in range(n)
+    ]
+
+
+def pintar_clasico(root, filas) -> float:
+    """Un frame y un label por celda, como el listado original"""
+    contenedor = ctk.CTkScrollableFrame(root)
+    contenedor.pack(fill="both", expand=True)
+    inicio = time.perf_counter()
+    for idx, fila in enumerate(filas):
+        bg_color = ("#2B2B2B", "#1E1E1E") if idx % 2 == 0 else ("#252525", "#252525")
+        row_frame = ctk.CTkFrame(contenedor, fg_color=bg_color, corner_radius=5)
+        row_frame.pack(fill="x", pady=3, padx=10)
+        for col, (_, peso, ancho, anchor) in enumerate(COLUMNAS):
+            row_frame.grid_columnconfigure(col, weight=peso, minsize=ancho)
+            ctk.CTkLabel(row_frame, text=fila[col], font=ctk.CTkFont(size=13), anchor=anchor).grid(
+                row=0, column=col, padx=10, pady=12, sticky="ew")
+        ctk.CTkButton(row_frame, text="Ver", height=38, width=100).grid(row=0, column=len(COLUMNAS), padx=10, pady=10)
+    root.update()
+    duracion = time.perf_counter() - inicio
+    contenedor.destroy()
+    root.update()
+    return duracion
+
+
+def pintar_virtual(root, filas):
+    """TablaVirtual: devuelve (tiempo de pintado, tiempo medio por paso de scroll, widgets creados)"""
+    inicio = time.perf_counter()
+    tabla = TablaVirtual(
+        root,
+        [Columna(*c) for c in COLUMNAS] + [Accion("Acción", "Ver", lambda i: None, 2, 120)],
+        filas_visibles=15
+    )
+    tabla.pack(fill="both", expand=True)
+    tabla.set_filas(filas)
+    root.update()
+    duracion = time.perf_counter() - inicio
+
+    pasos = 200
+    inicio = time.perf_counter()
+    for paso in range(pasos):
+        tabla.desplazar_a(paso * 3)
+        root.update_idletasks()
+    scroll = (time.perf_counter() - inicio) / pasos
+
+    widgets = contar_widgets(tabla)
+    tabla.destroy()
+    root.update()
+    return duracion, scroll, widgets
+
+
+def contar_widgets(widget) -> int:
+    return 1 + sum(contar_widgets(hijo) for hijo in widget.winfo_children())
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--filas", type=int, default=10000)
+    parser.add_argument("--sin-clasico", action="store_true", help="No medir el pintado con widgets por fila")
+    args = parser.parse_args()
+
+    try:
+        root = ctk.CTk()
+    except Exception as e:
+        sys.exit(f"No hay display disponible ({e}). Ejecutar con xvfb-run.")
+    root.geometry("1400x900")
+    ctk.set_appearance_mode("dark")
+    root.update()
+
+    filas = generar_filas(args.filas)
+    print(f"Filas: {args.filas}")
+
+    virtual, scroll, widgets = pintar_virtual(root, filas)
+    print(f"  TablaVirtual:      {virtual * 1000:9.1f} ms  ({widgets} widgets, scroll {scroll * 1000:.2f} ms/paso)")
+
+    if not args.sin_clasico:
+        clasico = pintar_clasico(root, filas)
+        print(f"  Widgets por fila:  {clasico * 1000:9.1f} ms")
+        print(f"  Mejora: x{clasico / virtual:.0f}")
+
+    root.destroy()
+
+
+if __name__ == "__main__":
+    main()
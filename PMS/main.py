@@ -11,7 +11,7 @@ from tkinter import ttk
 # Agregar src al path
 sys.path.insert(0, str(Path(__file__).parent / "src"))
 
-from infrastructure import Config, APIClient
+from infrastructure import Config, APIClient, DiskCache, ETagAPIClient
 from repositories import (
     ClienteRepository,
     ReservaRepository,
@@ -20,11 +20,14 @@ from repositories import (
     TipoHabitacionRepository,
     RegimenRepository,
     ContratoRepository,
-    DisponibilidadRepository
+    DisponibilidadRepository,
+    CachedRepository
 )
 from services import ClienteService, ReservaService, ConsultaService
-from ui_gui import MainWindow
+from ui_gui import MainWindow, EjecutorTareas
 
+# Endpoints de catálogo: se sirven desde la copia local y se revalidan en segundo plano
+CATALOGO = ("hoteles", "ciudades", "tiposHabitacion", "regimenes")
 
 def main():
     """Punto de entrada de la aplicación"""
@@ -36,14 +39,33 @@ def main():
     
     # 2. Infrastructure Layer
     api_client = APIClient(config)
+    # Copia local en disco: el PMS arranca con los datos de la sesión anterior
+    cache_disco = DiskCache(config.cache_path) if config.cache_path else None
+    # GET condicionales (If-None-Match); catálogo y reservas activas se guardan en disco.
+    # Las reservas llevan datos de clientes: su copia caduca
+    api_cache = ETagAPIClient(
+        api_client,
+        cache_disco,
+        persist=CATALOGO + ("reservas/activas",),
+        background=CATALOGO,
+        max_age={"reservas/activas": config.reservas_cache_max_age}
+    )
     
     # 3. Repository Layer
     cliente_repo = ClienteRepository(api_client)
     reserva_repo = ReservaRepository(api_client)
-    hotel_repo = HotelRepository(api_client)
-    ciudad_repo = CiudadRepository(api_client)
-    tipo_hab_repo = TipoHabitacionRepository(api_client)
-    regimen_repo = RegimenRepository(api_client)
+    # Catálogo: casi no cambia, se cachea en memoria durante la sesión
+    ttl = config.catalog_cache_ttl
+    hotel_repo = CachedRepository(HotelRepository(api_cache), ttl)
+    ciudad_repo = CachedRepository(CiudadRepository(api_cache), ttl)
+    tipo_hab_repo = CachedRepository(TipoHabitacionRepository(api_cache), ttl)
+    regimen_repo = CachedRepository(RegimenRepository(api_cache), ttl)
+    
+    # Si la revalidación en segundo plano trae un catálogo distinto, se descarta el de memoria
+    def catalogo_cambiado(endpoint):
+        for repo in (hotel_repo, ciudad_repo, tipo_hab_repo, regimen_repo):
+            repo.invalidate()
+    api_cache.on_change(catalogo_cambiado)
     contrato_repo = ContratoRepository(api_client)
     disponibilidad_repo = DisponibilidadRepository(api_client)
     
@@ -63,16 +85,23 @@ def main():
     
     # 5. Create GUI
     root = tk.Tk()
+    # Hilos de I/O: no más que conexiones en el pool del APIClient
+    tareas = EjecutorTareas(root, max_hilos=config.pool_maxsize)
     app = MainWindow(
         root,
         cliente_service,
         reserva_service,
         consulta_service,
-        api_client
+        api_cache,
+        tareas
     )
     
     # Run application
-    root.mainloop()
+    try:
+        root.mainloop()
+    finally:
+        tareas.cerrar()
+        api_cache.close()
 
 
 if __name__ == "__main__":
@@ -4,5 +4,7 @@ Infrastructure Layer - Configuración y dependencias externas
 
 from .config import Config
 from .api_client import APIClient
+from .disk_cache import DiskCache
+from .etag_client import ETagAPIClient
 
-__all__ = ['Config', 'APIClient']
+__all__ = ['Config', 'APIClient', 'DiskCache', 'ETagAPIClient']
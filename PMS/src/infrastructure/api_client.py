@@ -3,6 +3,8 @@ API Client - Comunicación HTTP con el WebService
 Principio de Responsabilidad Única: Solo maneja comunicación HTTP
 """
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from typing import Dict, Any, Optional
 from .config import Config
 
@@ -10,11 +12,14 @@ from .config import Config
 class APIResponse:
     """Value Object que encapsula la respuesta de la API"""
     
-    def __init__(self, success: bool, data: Any = None, error: Any = None, status_code: int = 200):
+    def __init__(self, success: bool, data: Any = None, error: Any = None, status_code: Optional[int] = 200,
+                 headers: Optional[Dict[str, str]] = None):
+        # status_code None: no hubo respuesta HTTP (WebService caído o sin red)
         self.success = success
         self.data = data
         self.error = error
         self.status_code = status_code
+        self.headers = headers or {}
     
     def __bool__(self) -> bool:
         return self.success
@@ -27,8 +32,15 @@ class APIClient:
     """
     Cliente HTTP para comunicación con el WebService.
     Implementa el patrón Adapter para abstraer la librería requests.
+    
+    Todas las peticiones comparten una requests.Session con pool de
+    conexiones keep-alive, de modo que las pantallas que lanzan muchas
+    llamadas no pagan el establecimiento de conexión en cada una.
     """
     
+    # Métodos que se pueden reintentar sin riesgo de duplicar operaciones
+    METODOS_REINTENTABLES = frozenset({"GET", "HEAD", "OPTIONS", "PUT", "DELETE"})
+    
     def __init__(self, config: Config):
         """
         Inyección de dependencias: recibe la configuración
@@ -36,6 +48,45 @@ class APIClient:
         self._config = config
         self._base_url = config.api_base_url
         self._timeout = config.request_timeout
+        self._session = self._crear_sesion(config)
+    
+    def _crear_sesion(self, config: Config) -> requests.Session:
+        """
+        Crea la sesión HTTP con pool de conexiones y política de reintentos.
+        
+        Los errores de conexión (antes de enviar la petición) se reintentan
+        siempre; los de lectura y los códigos de retry_status solo en
+        métodos idempotentes, para no duplicar un POST.
+        """
+        reintentos = Retry(
+            total=config.max_retries,
+            connect=config.max_retries,
+            read=config.max_retries,
+            status=config.max_retries,
+            backoff_factor=config.retry_backoff,
+            status_forcelist=config.retry_status,
+            allowed_methods=self.METODOS_REINTENTABLES,
+            raise_on_status=False
+        )
+        adaptador = HTTPAdapter(
+            pool_connections=config.pool_connections,
+            pool_maxsize=config.pool_maxsize,
+            max_retries=reintentos
+        )
+        session = requests.Session()
+        session.mount("http://", adaptador)
+        session.mount("https://", adaptador)
+        return session
+    
+    def close(self) -> None:
+        """Cierra las conexiones del pool"""
+        self._session.close()
+    
+    def __enter__(self) -> 'APIClient':
+        return self
+    
+    def __exit__(self, *exc) -> None:
+        self.close()
     
     def _build_url(self, endpoint: str) -> str:
         """Construye la URL completa"""
@@ -49,7 +100,12 @@ class APIClient:
         try:
             response.raise_for_status()
             data = response.json() if response.text else None
-            return APIResponse(success=True, data=data, status_code=response.status_code)
+            return APIResponse(
+                success=True,
+                data=data,
+                status_code=response.status_code,
+                headers=response.headers
+            )
         except requests.exceptions.HTTPError as e:
             error_data = {}
             try:
@@ -59,34 +115,51 @@ class APIClient:
             return APIResponse(
                 success=False,
                 error=error_data,
-                status_code=response.status_code
+                status_code=response.status_code,
+                headers=response.headers
             )
         except Exception as e:
             return APIResponse(success=False, error=str(e))
     
-    def get(self, endpoint: str, params: Optional[Dict] = None) -> APIResponse:
+    def get(self, endpoint: str, params: Optional[Dict] = None,
+            headers: Optional[Dict[str, str]] = None) -> APIResponse:
         """
         Realiza una petición GET.
         
         Args:
             endpoint: Ruta del endpoint (ej: "clientes" o "/clientes/1")
             params: Parámetros de query string
+            headers: Cabeceras adicionales (ej: If-None-Match)
             
         Returns:
             APIResponse con el resultado
         """
         try:
             url = self._build_url(endpoint)
-            response = requests.get(url, params=params, timeout=self._timeout)
+            response = self._session.get(url, params=params, headers=headers, timeout=self._timeout)
             return self._handle_response(response)
         except requests.exceptions.ConnectionError:
             return APIResponse(
                 success=False,
-                error="No se pudo conectar al WebService. ¿Está ejecutándose?"
+                error="No se pudo conectar al WebService. ¿Está ejecutándose?",
+                status_code=None
+            )
+        except requests.exceptions.Timeout:
+            return APIResponse(
+                success=False,
+                error="El WebService no respondió a tiempo",
+                status_code=None
             )
         except Exception as e:
             return APIResponse(success=False, error=str(e))
     
+    def get_stored(self, endpoint: str, params: Optional[Dict] = None) -> Optional[APIResponse]:
+        """
+        Copia local del recurso. El cliente base no guarda nada;
+        ETagAPIClient la sobreescribe cuando hay caché en disco.
+        """
+        return None
+    
     def post(self, endpoint: str, data: Dict) -> APIResponse:
         """
         Realiza una petición POST.
@@ -101,12 +174,13 @@ class APIClient:
         try:
             url = self._build_url(endpoint)
             headers = {'x-source': 'PMS'}
-            response = requests.post(url, json=data, headers=headers, timeout=self._timeout)
+            response = self._session.post(url, json=data, headers=headers, timeout=self._timeout)
             return self._handle_response(response)
         except requests.exceptions.ConnectionError:
             return APIResponse(
                 success=False,
-                error="No se pudo conectar al WebService. ¿Está ejecutándose?"
+                error="No se pudo conectar al WebService. ¿Está ejecutándose?",
+                status_code=None
             )
         except Exception as e:
             return APIResponse(success=False, error=str(e))
@@ -127,12 +201,40 @@ class APIClient:
             kwargs = {"timeout": self._timeout}
             if data is not None:
                 kwargs["json"] = data
-            response = requests.put(url, **kwargs)
+            response = self._session.put(url, **kwargs)
+            return self._handle_response(response)
+        except requests.exceptions.ConnectionError:
+            return APIResponse(
+                success=False,
+                error="No se pudo conectar al WebService. ¿Está ejecutándose?",
+                status_code=None
+            )
+        except Exception as e:
+            return APIResponse(success=False, error=str(e))
+    
+    def patch(self, endpoint: str, data: Optional[Dict] = None) -> APIResponse:
+        """
+        Realiza una petición PATCH.
+        
+        Args:
+            endpoint: Ruta del endpoint
+            data: Datos a enviar (opcional para algunos endpoints)
+            
+        Returns:
+            APIResponse con el resultado
+        """
+        try:
+            url = self._build_url(endpoint)
+            kwargs = {"timeout": self._timeout}
+            if data is not None:
+                kwargs["json"] = data
+            response = self._session.patch(url, **kwargs)
             return self._handle_response(response)
         except requests.exceptions.ConnectionError:
             return APIResponse(
                 success=False,
-                error="No se pudo conectar al WebService. ¿Está ejecutándose?"
+                error="No se pudo conectar al WebService. ¿Está ejecutándose?",
+                status_code=None
             )
         except Exception as e:
             return APIResponse(success=False, error=str(e))
@@ -149,14 +251,15 @@ class APIClient:
         """
         try:
             url = self._build_url(endpoint)
-            response = requests.delete(url, timeout=self._timeout)
+            response = self._session.delete(url, timeout=self._timeout)
             return APIResponse(success=True, status_code=response.status_code)
         except requests.exceptions.HTTPError as e:
             return APIResponse(success=False, error=str(e), status_code=response.status_code)
         except requests.exceptions.ConnectionError:
             return APIResponse(
                 success=False,
-                error="No se pudo conectar al WebService. ¿Está ejecutándose?"
+                error="No se pudo conectar al WebService. ¿Está ejecutándose?",
+                status_code=None
             )
         except Exception as e:
             return APIResponse(success=False, error=str(e))
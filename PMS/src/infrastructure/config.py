@@ -3,7 +3,8 @@ Configuración de la aplicación
 Principio de Responsabilidad Única: Solo maneja configuración
 """
 from dataclasses import dataclass
-from typing import Optional
+from pathlib import Path
+from typing import Optional, Tuple
 import os
 
 
@@ -15,6 +16,19 @@ class Config:
     """
     api_base_url: str = "http://localhost:3000/api"
     request_timeout: int = 10
+    # Pool de conexiones HTTP (keep-alive) del APIClient
+    pool_connections: int = 4       # hosts distintos con pool propio
+    pool_maxsize: int = 10          # conexiones reutilizables por host
+    # Reintentos con backoff exponencial (solo métodos idempotentes y errores de conexión)
+    max_retries: int = 3
+    retry_backoff: float = 0.3      # segundos: 0.3, 0.6, 1.2...
+    retry_status: Tuple[int, ...] = (502, 503, 504)
+    # Caché del catálogo (hoteles, ciudades, tipos, regímenes); pasado el TTL se revalida con ETag
+    catalog_cache_ttl: int = 600    # segundos
+    # Copia local en disco para arrancar con datos de la sesión anterior ("" = desactivada)
+    cache_path: str = str(Path.home() / ".pms" / "cache.sqlite3")
+    # Antigüedad máxima de la copia local de reservas activas (datos de clientes)
+    reservas_cache_max_age: int = 86400  # segundos
     date_format: str = "%Y-%m-%d"
     datetime_format: str = "%Y-%m-%d %H:%M:%S"
     app_name: str = "PMS - Sistema de Gestión Hotelera"
@@ -29,6 +43,13 @@ class Config:
         return cls(
             api_base_url=os.getenv('PMS_API_URL', cls.api_base_url),
             request_timeout=int(os.getenv('PMS_TIMEOUT', cls.request_timeout)),
+            pool_connections=int(os.getenv('PMS_POOL_CONNECTIONS', cls.pool_connections)),
+            pool_maxsize=int(os.getenv('PMS_POOL_SIZE', cls.pool_maxsize)),
+            max_retries=int(os.getenv('PMS_MAX_RETRIES', cls.max_retries)),
+            retry_backoff=float(os.getenv('PMS_RETRY_BACKOFF', cls.retry_backoff)),
+            catalog_cache_ttl=int(os.getenv('PMS_CACHE_TTL', cls.catalog_cache_ttl)),
+            cache_path=os.getenv('PMS_CACHE_PATH', cls.cache_path),
+            reservas_cache_max_age=int(os.getenv('PMS_CACHE_RESERVAS_MAX_AGE', cls.reservas_cache_max_age)),
         )
     
     def __str__(self) -> str:
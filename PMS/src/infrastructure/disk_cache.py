@@ -0,0 +1,119 @@
+"""
+DiskCache - Copia local en SQLite de las respuestas del WebService
+Principio de Responsabilidad Única: solo persiste y recupera respuestas
+"""
+import json
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Optional, Tuple
+
+
+class DiskCache:
+    """
+    Almacén clave -> (ETag, cuerpo JSON) en un fichero SQLite local.
+
+    Permite que el PMS arranque con los datos de la última sesión aunque el
+    WebService sea lento o no esté disponible. Los errores de disco nunca se
+    propagan: una caché que falla se comporta como una caché vacía.
+
+    Puede contener datos personales (reservas con nombres de clientes): el
+    fichero solo es legible por el usuario del sistema y lo que tenga fecha
+    de caducidad se borra con purge().
+    """
+
+    def __init__(self, ruta: str):
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+        try:
+            Path(ruta).parent.mkdir(mode=0o700, parents=True, exist_ok=True)
+            self._conn = sqlite3.connect(ruta, check_same_thread=False)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS respuestas ("
+                " clave TEXT PRIMARY KEY,"
+                " etag TEXT,"
+                " cuerpo TEXT NOT NULL,"
+                " actualizado REAL NOT NULL)"
+            )
+            self._conn.commit()
+            self._solo_propietario(ruta)
+        except sqlite3.Error:
+            self._conn = None
+
+    @staticmethod
+    def _solo_propietario(ruta: str) -> None:
+        # También los ficheros -wal/-shm, que contienen las últimas escrituras
+        for fichero in (ruta, ruta + "-wal", ruta + "-shm"):
+            try:
+                os.chmod(fichero, 0o600)
+            except OSError:
+                pass
+
+    def get(self, clave: str) -> Optional[Tuple[Optional[str], Any, float]]:
+        """Devuelve (etag, datos, timestamp de guardado) o None"""
+        try:
+            with self._lock:
+                if self._conn is None:
+                    return None
+                fila = self._conn.execute(
+                    "SELECT etag, cuerpo, actualizado FROM respuestas WHERE clave = ?", (clave,)
+                ).fetchone()
+            if fila is None:
+                return None
+            return fila[0], json.loads(fila[1]), fila[2]
+        except (sqlite3.Error, ValueError):
+            return None
+
+    def put(self, clave: str, etag: Optional[str], datos: Any) -> None:
+        """Guarda (o reemplaza) la respuesta de un recurso"""
+        try:
+            cuerpo = json.dumps(datos)
+            with self._lock:
+                if self._conn is None:
+                    return
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO respuestas (clave, etag, cuerpo, actualizado) VALUES (?, ?, ?, ?)",
+                    (clave, etag, cuerpo, time.time())
+                )
+                self._conn.commit()
+        except (sqlite3.Error, TypeError, ValueError):
+            pass
+
+    def delete(self, prefijo: Optional[str] = None) -> None:
+        """Borra todas las entradas o las de claves con ese prefijo"""
+        try:
+            with self._lock:
+                if self._conn is None:
+                    return
+                if prefijo is None:
+                    self._conn.execute("DELETE FROM respuestas")
+                else:
+                    self._conn.execute(
+                        "DELETE FROM respuestas WHERE substr(clave, 1, ?) = ?", (len(prefijo), prefijo)
+                    )
+                self._conn.commit()
+        except sqlite3.Error:
+            pass
+
+    def purge(self, prefijo: str, max_edad: float) -> None:
+        """Borra las entradas de claves con ese prefijo guardadas hace más de max_edad segundos"""
+        try:
+            with self._lock:
+                if self._conn is None:
+                    return
+                self._conn.execute(
+                    "DELETE FROM respuestas WHERE substr(clave, 1, ?) = ? AND actualizado < ?",
+                    (len(prefijo), prefijo, time.time() - max_edad)
+                )
+                self._conn.commit()
+        except sqlite3.Error:
+            pass
+
+    def close(self) -> None:
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
@@ -0,0 +1,251 @@
+"""
+ETag API Client - Peticiones GET condicionales (If-None-Match)
+Principio Abierto/Cerrado: añade revalidación sin modificar APIClient
+"""
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from urllib.parse import urlencode
+from .api_client import APIClient, APIResponse
+from .disk_cache import DiskCache
+
+
+class ETagAPIClient:
+    """
+    Decorador de APIClient que recuerda el ETag y el cuerpo de cada GET.
+
+    En la siguiente petición al mismo recurso envía If-None-Match; si el
+    WebService responde 304 Not Modified se reutiliza el cuerpo guardado,
+    de modo que revalidar un catálogo que no ha cambiado no transfiere
+    datos. El resto de métodos se delegan sin cambios.
+
+    Con un DiskCache, los endpoints de `persist` se guardan también en disco:
+    - Sin conexión con el WebService (ninguna respuesta HTTP) se responde
+      con la copia local, marcada con la cabecera X-PMS-Cache.
+    - Los de `background` (catálogo) se sirven desde disco la primera vez
+      en la sesión y se revalidan en segundo plano; si han cambiado se
+      avisa a los suscriptores de on_change().
+    - `max_age` limita, por prefijo, los segundos que se conserva una copia
+      (p. ej. reservas con datos de clientes); las caducadas se borran.
+    """
+
+    # Entradas en memoria de endpoints no persistentes (detalles, búsquedas...)
+    MAX_ENTRADAS = 256
+
+    def __init__(self, api_client: APIClient, disk_cache: Optional[DiskCache] = None,
+                 persist: Tuple[str, ...] = (), background: Tuple[str, ...] = (),
+                 max_age: Optional[Dict[str, float]] = None):
+        self._api = api_client
+        self._disco = disk_cache
+        self._persist = tuple(p.strip('/') for p in persist)
+        self._background = tuple(p.strip('/') for p in background)
+        self._max_age = {p.strip('/'): segundos for p, segundos in (max_age or {}).items()}
+        self._lock = threading.Lock()
+        # clave -> (etag, datos, timestamp de guardado)
+        self._recursos: "OrderedDict[str, Tuple[Optional[str], Any, float]]" = OrderedDict()
+        self._verificados = set()
+        self._suscriptores: List[Callable[[str], None]] = []
+        self._revalidador: Optional[ThreadPoolExecutor] = None
+        self.revalidaciones = 0
+        self.no_modificados = 0
+        if self._disco is not None:
+            for prefijo, segundos in self._max_age.items():
+                self._disco.purge(prefijo, segundos)
+
+    def __getattr__(self, nombre: str):
+        # post, put, patch, delete... se delegan tal cual
+        return getattr(self._api, nombre)
+
+    @staticmethod
+    def _clave(endpoint: str, params: Optional[Dict]) -> str:
+        clave = endpoint.strip('/')
+        if params:
+            clave += ('&' if '?' in clave else '?') + urlencode(sorted(params.items()))
+        return clave
+
+    @staticmethod
+    def _coincide(clave: str, prefijos: Tuple[str, ...]) -> bool:
+        return any(clave == p or clave.startswith(p + '/') or clave.startswith(p + '?') for p in prefijos)
+
+    def _caducidad(self, clave: str) -> Optional[Tuple[str, float]]:
+        """(prefijo, segundos) de max_age que se aplica a la clave, o None"""
+        for prefijo, segundos in self._max_age.items():
+            if self._coincide(clave, (prefijo,)):
+                return prefijo, segundos
+        return None
+
+    # ------------------------------------------------------------------
+    # Almacén (memoria + disco)
+    # ------------------------------------------------------------------
+
+    def _leer(self, clave: str) -> Optional[Tuple[Optional[str], Any, float]]:
+        caducidad = self._caducidad(clave)
+        limite = time.time() - caducidad[1] if caducidad else None
+        with self._lock:
+            guardado = self._recursos.get(clave)
+            if guardado is not None:
+                if limite is None or guardado[2] >= limite:
+                    self._recursos.move_to_end(clave)
+                    return guardado
+                # Caducada: la de disco es de la misma escritura
+                del self._recursos[clave]
+        if self._disco is not None and self._coincide(clave, self._persist):
+            en_disco = self._disco.get(clave)
+            if en_disco is not None:
+                if limite is not None and en_disco[2] < limite:
+                    self._disco.purge(caducidad[0], caducidad[1])
+                    return None
+                with self._lock:
+                    self._recursos[clave] = en_disco
+                return en_disco
+        return None
+
+    def _guardar(self, clave: str, etag: Optional[str], datos: Any) -> None:
+        with self._lock:
+            self._recursos[clave] = (etag, datos, time.time())
+            self._recursos.move_to_end(clave)
+            self._verificados.add(clave)
+            while len(self._recursos) > self.MAX_ENTRADAS:
+                self._recursos.popitem(last=False)
+        if self._disco is not None and self._coincide(clave, self._persist):
+            self._disco.put(clave, etag, datos)
+
+    def get_stored(self, endpoint: str, params: Optional[Dict] = None) -> Optional[APIResponse]:
+        """
+        Copia local del recurso sin ir al WebService (None si no hay).
+        Sirve para pintar enseguida mientras llega la respuesta real.
+        """
+        guardado = self._leer(self._clave(endpoint, params))
+        if guardado is None:
+            return None
+        return self._respuesta_local(guardado)
+
+    @staticmethod
+    def _respuesta_local(guardado: Tuple[Optional[str], Any, float]) -> APIResponse:
+        # X-PMS-Cache-Time: timestamp de cuando se guardó la copia
+        return APIResponse(
+            success=True,
+            data=guardado[1],
+            headers={'X-PMS-Cache': 'local', 'X-PMS-Cache-Time': str(guardado[2])}
+        )
+
+    # ------------------------------------------------------------------
+    # GET condicional
+    # ------------------------------------------------------------------
+
+    def get(self, endpoint: str, params: Optional[Dict] = None,
+            headers: Optional[Dict[str, str]] = None) -> APIResponse:
+        """GET condicional: envía el último ETag conocido del recurso"""
+        clave = self._clave(endpoint, params)
+        guardado = self._leer(clave)
+
+        # Catálogo de la sesión anterior: se usa ya y se revalida en segundo plano
+        if guardado is not None and self._coincide(clave, self._background):
+            with self._lock:
+                pendiente = clave not in self._verificados
+                self._verificados.add(clave)
+            if pendiente:
+                self._revalidar_en_segundo_plano(endpoint, params, clave)
+                return self._respuesta_local(guardado)
+
+        return self._pedir(endpoint, params, headers, clave, guardado)
+
+    def _pedir(self, endpoint: str, params: Optional[Dict], headers: Optional[Dict[str, str]],
+               clave: str, guardado: Optional[Tuple[Optional[str], Any, float]]) -> APIResponse:
+        cabeceras = dict(headers or {})
+        if guardado is not None and guardado[0]:
+            cabeceras['If-None-Match'] = guardado[0]
+
+        response = self._api.get(endpoint, params=params, headers=cabeceras or None)
+
+        if guardado is not None:
+            with self._lock:
+                self.revalidaciones += 1
+
+        if response.success and response.status_code == 304 and guardado is not None:
+            with self._lock:
+                self.no_modificados += 1
+                self._verificados.add(clave)
+            return APIResponse(
+                success=True,
+                data=guardado[1],
+                status_code=304,
+                headers=response.headers
+            )
+
+        if response.success:
+            etag = response.headers.get('ETag')
+            if etag or self._coincide(clave, self._persist):
+                self._guardar(clave, etag, response.data)
+            else:
+                with self._lock:
+                    self._recursos.pop(clave, None)
+        elif response.status_code is None and guardado is not None and self._coincide(clave, self._persist):
+            # Sin respuesta HTTP (WebService caído): se sirve la copia local.
+            # Los errores HTTP (403, 404, 500...) se devuelven tal cual
+            return self._respuesta_local(guardado)
+        return response
+
+    def _revalidar_en_segundo_plano(self, endpoint: str, params: Optional[Dict], clave: str) -> None:
+        with self._lock:
+            if self._revalidador is None:
+                self._revalidador = ThreadPoolExecutor(max_workers=2, thread_name_prefix="pms-revalidar")
+            revalidador = self._revalidador
+
+        def revalidar():
+            anterior = self._leer(clave)
+            response = self._pedir(endpoint, params, None, clave, anterior)
+            if response.success and response.status_code != 304 and 'X-PMS-Cache' not in response.headers:
+                if anterior is None or response.data != anterior[1]:
+                    self._notificar(clave)
+            elif not response.success or 'X-PMS-Cache' in response.headers:
+                # No se pudo revalidar: se reintentará en la próxima lectura
+                with self._lock:
+                    self._verificados.discard(clave)
+
+        try:
+            revalidador.submit(revalidar)
+        except RuntimeError:
+            pass  # Cerrando la aplicación
+
+    # ------------------------------------------------------------------
+    # Suscripción e invalidación
+    # ------------------------------------------------------------------
+
+    def on_change(self, callback: Callable[[str], None]) -> None:
+        """Registra un callback(endpoint) para cuando una revalidación trae datos nuevos"""
+        with self._lock:
+            self._suscriptores.append(callback)
+
+    def _notificar(self, clave: str) -> None:
+        with self._lock:
+            suscriptores = list(self._suscriptores)
+        for callback in suscriptores:
+            callback(clave)
+
+    def forget(self, prefijo: Optional[str] = None) -> None:
+        """
+        Olvida los ETag guardados (todos o los de endpoints con ese prefijo),
+        forzando una descarga completa en la siguiente petición.
+        """
+        with self._lock:
+            if prefijo is None:
+                self._recursos.clear()
+                self._verificados.clear()
+            else:
+                prefijo = prefijo.strip('/')
+                for clave in [c for c in self._recursos if c.startswith(prefijo)]:
+                    del self._recursos[clave]
+                self._verificados = {c for c in self._verificados if not c.startswith(prefijo)}
+        if self._disco is not None:
+            self._disco.delete(prefijo)
+
+    def close(self) -> None:
+        """Detiene las revalidaciones pendientes y cierra disco y conexiones"""
+        if self._revalidador is not None:
+            self._revalidador.shutdown(wait=False, cancel_futures=True)
+        if self._disco is not None:
+            self._disco.close()
+        self._api.close()
@@ -4,6 +4,7 @@ Principio de Inversión de Dependencias e Interfaz Segregation
 """
 
 from .base import IRepository, RepositoryException
+from .cached_repository import CachedRepository
 from .cliente_repository import ClienteRepository
 from .reserva_repository import ReservaRepository
 from .hotel_repository import (
@@ -18,6 +19,7 @@ from .disponibilidad_repository import DisponibilidadRepository
 __all__ = [
     'IRepository',
     'RepositoryException',
+    'CachedRepository',
     'ClienteRepository',
     'ReservaRepository',
     'HotelRepository',
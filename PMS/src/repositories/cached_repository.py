@@ -0,0 +1,137 @@
+"""
+CachedRepository - Caché de lectura para repositorios de catálogo
+Patrón Decorator: misma interfaz IRepository, añade caché sin tocar el repositorio
+"""
+import copy
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from repositories.base import IRepository, RepositoryException, T
+
+
+class CachedRepository(IRepository[T]):
+    """
+    Decorador read-through para datos de catálogo que casi no cambian
+    (hoteles, ciudades, tipos de habitación, regímenes).
+
+    - find_all, find_by_id y cualquier otro find_* se sirven desde memoria
+      durante `ttl` segundos.
+    - Pasado el TTL se vuelve a pedir al repositorio decorado; si este usa un
+      ETagAPIClient, la revalidación es un GET condicional que responde 304
+      sin cuerpo cuando el catálogo no ha cambiado.
+    - Si la revalidación falla (WebService caído) se sirve el valor anterior.
+    - create/update/delete se delegan e invalidan la caché; invalidate()
+      permite invalidar desde fuera y on_invalidate() suscribirse.
+    """
+
+    def __init__(self, repository: IRepository[T], ttl: float = 600):
+        self._repository = repository
+        self._ttl = ttl
+        self._lock = threading.Lock()
+        self._entradas: Dict[Tuple, Tuple[float, Any]] = {}
+        self._cargas: Dict[Tuple, threading.Lock] = {}
+        self._suscriptores: List[Callable[[], None]] = []
+        self.hits = 0
+        self.misses = 0
+
+    # ------------------------------------------------------------------
+    # Lecturas
+    # ------------------------------------------------------------------
+
+    def find_all(self) -> List[T]:
+        return self._leer('find_all')
+
+    def find_by_id(self, id: int) -> Optional[T]:
+        return self._leer('find_by_id', id)
+
+    def __getattr__(self, nombre: str):
+        # Otros métodos del repositorio decorado (find_by_ciudad, find_by_hotel...)
+        atributo = getattr(self._repository, nombre)
+        if nombre.startswith('find') and callable(atributo):
+            return lambda *args, **kwargs: self._leer(nombre, *args, **kwargs)
+        return atributo
+
+    def _leer(self, metodo: str, *args, **kwargs) -> Any:
+        clave = (metodo, args, tuple(sorted(kwargs.items())))
+        ahora = time.monotonic()
+        with self._lock:
+            entrada = self._entradas.get(clave)
+            if entrada is not None and entrada[0] > ahora:
+                self.hits += 1
+                return self._copia(entrada[1])
+            self.misses += 1
+            # Una sola carga por clave aunque varios hilos fallen a la vez
+            carga = self._cargas.setdefault(clave, threading.Lock())
+
+        try:
+            with carga:
+                with self._lock:
+                    actual = self._entradas.get(clave)
+                    if actual is not None and actual is not entrada and actual[0] > time.monotonic():
+                        return self._copia(actual[1])
+                try:
+                    valor = getattr(self._repository, metodo)(*args, **kwargs)
+                except RepositoryException:
+                    if entrada is None:
+                        raise
+                    # Sin conexión: mejor un catálogo algo antiguo que una pantalla vacía
+                    return self._copia(entrada[1])
+                with self._lock:
+                    self._entradas[clave] = (time.monotonic() + self._ttl, valor)
+                return self._copia(valor)
+        finally:
+            # El lock de carga solo vive mientras hay hilos cargando esa clave
+            with self._lock:
+                if self._cargas.get(clave) is carga and not carga.locked():
+                    del self._cargas[clave]
+
+    @staticmethod
+    def _copia(valor: Any) -> Any:
+        # Copia superficial de la lista y de cada entidad: quien llama puede
+        # modificar lo que recibe sin alterar la caché
+        if isinstance(valor, list):
+            return [copy.copy(item) for item in valor]
+        return copy.copy(valor)
+
+    # ------------------------------------------------------------------
+    # Escrituras: se delegan e invalidan
+    # ------------------------------------------------------------------
+
+    def create(self, entity: T) -> Optional[T]:
+        resultado = self._repository.create(entity)
+        self.invalidate()
+        return resultado
+
+    def update(self, id: int, entity: T) -> Optional[T]:
+        resultado = self._repository.update(id, entity)
+        self.invalidate()
+        return resultado
+
+    def delete(self, id: int) -> bool:
+        resultado = self._repository.delete(id)
+        self.invalidate()
+        return resultado
+
+    # ------------------------------------------------------------------
+    # Invalidación
+    # ------------------------------------------------------------------
+
+    def invalidate(self, metodo: Optional[str] = None) -> None:
+        """
+        Descarta la caché completa o solo la de un método (ej: 'find_all').
+        La siguiente lectura volverá a consultar el WebService.
+        """
+        with self._lock:
+            if metodo is None:
+                self._entradas.clear()
+            else:
+                for clave in [c for c in self._entradas if c[0] == metodo]:
+                    del self._entradas[clave]
+            suscriptores = list(self._suscriptores)
+        for callback in suscriptores:
+            callback()
+
+    def on_invalidate(self, callback: Callable[[], None]) -> None:
+        """Registra un callback que se llama cada vez que se invalida la caché"""
+        with self._lock:
+            self._suscriptores.append(callback)
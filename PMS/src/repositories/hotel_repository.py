@@ -4,6 +4,7 @@ HotelRepository - Acceso a datos de Hoteles y entidades relacionadas
 from typing import List, Optional
 from repositories.base import IRepository, RepositoryException
 from domain import Hotel, Ciudad, TipoHabitacion, Regimen
+from domain.hotel import PrecioRegimen
 from infrastructure import APIClient
 
 
@@ -156,6 +157,14 @@ class RegimenRepository(IRepository[Regimen]):
         
         return Regimen.from_dict(response.data)
     
+    def find_by_hotel(self, id_hotel: int) -> List[PrecioRegimen]:
+        """Obtiene los regímenes de un hotel con su precio"""
+        response = self._api.get(f"regimenes/hotel/{id_hotel}")
+        if not response.success:
+            raise RepositoryException(f"Error al obtener regímenes del hotel: {response.error}")
+        
+        return [PrecioRegimen.from_dict(data) for data in response.data.get('regimenes', [])]
+    
     def create(self, regimen: Regimen) -> Regimen:
         raise NotImplementedError("Creación de regímenes no permitida")
     
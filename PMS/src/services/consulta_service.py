@@ -15,6 +15,7 @@ from repositories import (
     RepositoryException
 )
 from domain import Cliente, Reserva, Hotel, Ciudad, TipoHabitacion, Regimen, Contrato
+from domain.hotel import PrecioRegimen
 from services.cliente_service import ServiceException
 
 
@@ -87,6 +88,13 @@ class ConsultaService:
         except RepositoryException as e:
             raise ServiceException(f"Error al consultar regímenes: {str(e)}")
     
+    def consultar_regimenes_hotel(self, id_hotel: int) -> List[PrecioRegimen]:
+        """Consulta los regímenes de un hotel con su precio"""
+        try:
+            return self._regimen_repo.find_by_hotel(id_hotel)
+        except RepositoryException as e:
+            raise ServiceException(f"Error al consultar regímenes del hotel: {str(e)}")
+    
     def consultar_contratos(self) -> List[Contrato]:
         """Consulta todos los contratos"""
         try:
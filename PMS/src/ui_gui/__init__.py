@@ -1,6 +1,7 @@
 ﻿"""
-UI GUI Package - Exporta solo la ventana principal
+UI GUI Package - Exporta la ventana principal y el ejecutor de tareas
 """
 from .main_window import MainWindow
+from .tareas import EjecutorTareas
 
-__all__ = ["MainWindow"]
+__all__ = ["MainWindow", "EjecutorTareas"]
@@ -4,14 +4,17 @@ ClientePanel - Panel de gestión de clientes actualizado según modelo de domini
 import customtkinter as ctk
 from tkinter import messagebox
 from datetime import date
+from src.ui_gui.tareas import EjecutorTareas
 
 
 class ClientePanel:
     """Panel para gestionar clientes con CustomTkinter"""
     
-    def __init__(self, parent, cliente_service):
+    def __init__(self, parent, cliente_service, tareas: EjecutorTareas):
         self.parent = parent
         self.cliente_service = cliente_service
+        # Ejecutor compartido de la ventana (lo cierra quien lo crea)
+        self.tareas = tareas
         self.selected_cliente_id = None
         
         # Configurar parent
@@ -192,14 +195,23 @@ class ClientePanel:
             label.grid(row=0, column=col, sticky="ew", padx=5, pady=5)
     
     def _load_clientes(self):
-        """Carga todos los clientes en la tabla"""
+        """Carga todos los clientes en la tabla en segundo plano"""
+        self.tareas.ejecutar(
+            self.cliente_service.listar_clientes,
+            al_terminar=self._pintar_clientes,
+            al_fallar=lambda e: messagebox.showerror("Error", f"Error al cargar clientes: {str(e)}"),
+            clave="clientes",
+            widget=self.scrollable_frame,
+            texto="Cargando clientes..."
+        )
+    
+    def _pintar_clientes(self, clientes):
+        """Pinta los clientes en la tabla"""
         # Limpiar tabla (mantener headers)
         for widget in self.scrollable_frame.winfo_children()[4:]:
             widget.destroy()
         
         try:
-            clientes = self.cliente_service.listar_clientes()
-            
             for idx, cliente in enumerate(clientes, start=1):
                 row = idx
                 # Alternar colores
@@ -3,14 +3,17 @@ ConsultaPanel - Panel de consultas con diseño moderno
 """
 import customtkinter as ctk
 from tkinter import messagebox
+from src.ui_gui.tareas import EjecutorTareas
 
 
 class ConsultaPanel:
     """Panel para consultar todas las tablas con CustomTkinter"""
     
-    def __init__(self, parent, consulta_service):
+    def __init__(self, parent, consulta_service, tareas: EjecutorTareas):
         self.parent = parent
         self.consulta_service = consulta_service
+        # Ejecutor compartido de la ventana (lo cierra quien lo crea)
+        self.tareas = tareas
         
         # Configurar parent
         self.parent.grid_rowconfigure(0, weight=1)
@@ -88,10 +91,19 @@ class ConsultaPanel:
         self._load_hoteles()
     
     def _load_hoteles(self):
+        self.tareas.ejecutar(
+            self.consulta_service.obtener_hoteles,
+            al_terminar=self._pintar_hoteles,
+            al_fallar=lambda e: messagebox.showerror("Error", f"Error al cargar hoteles: {str(e)}"),
+            clave="hoteles",
+            widget=self.hoteles_scroll,
+            texto="Cargando hoteles..."
+        )
+    
+    def _pintar_hoteles(self, hoteles):
         for widget in self.hoteles_scroll.winfo_children()[5:]:
             widget.destroy()
         try:
-            hoteles = self.consulta_service.obtener_hoteles()
             for idx, hotel in enumerate(hoteles, start=1):
                 row = idx
                 bg_color = ("#2B2B2B", "#1E1E1E") if row % 2 == 0 else ("#252525", "#252525")
@@ -7,17 +7,23 @@ from tkinter import messagebox, Toplevel
 from datetime import datetime, timedelta, date
 from tkcalendar import Calendar
 
+from .tabla_virtual import TablaVirtual, Columna, Accion
+from .tareas import EjecutorTareas
+
 
 class MainWindow:
     """Ventana principal de la aplicación PMS"""
     
-    def __init__(self, root, cliente_service, reserva_service, consulta_service, api_client):
+    def __init__(self, root, cliente_service, reserva_service, consulta_service, api_client, tareas: EjecutorTareas):
         self.root = root
         self.cliente_service = cliente_service
         self.reserva_service = reserva_service
         self.consulta_service = consulta_service
         self.api_client = api_client
         
+        # Las llamadas al WebService se hacen en segundo plano para no congelar la ventana
+        self.tareas = tareas
+        
         # Hotel seleccionado (se establecerá al inicio)
         self.hotel_seleccionado = None
         self.hoteles_disponibles = []
@@ -30,6 +36,11 @@ class MainWindow:
         ctk.set_appearance_mode("dark")
         ctk.set_default_color_theme("blue")
         
+        # Barra de estado con el indicador de carga (fuera de main_frame, que se vacía al cambiar de hotel)
+        self.label_estado = ctk.CTkLabel(self.root, text="", height=22, anchor="w", font=ctk.CTkFont(size=12))
+        self.label_estado.pack(side="bottom", fill="x", padx=10)
+        self.tareas.indicador = self._mostrar_carga
+        
         # Frame principal
         self.main_frame = ctk.CTkFrame(self.root, corner_radius=0)
         self.main_frame.pack(fill="both", expand=True)
@@ -56,8 +67,23 @@ class MainWindow:
         titulo.pack(pady=(20, 30), padx=40)
         
         # Cargar hoteles desde la API
+        self.tareas.ejecutar(
+            self.consulta_service.obtener_hoteles,
+            al_terminar=lambda hoteles: self._mostrar_opciones_hotel(selector_frame, hoteles),
+            al_fallar=lambda e: messagebox.showerror("Error", f"Error al cargar hoteles: {str(e)}"),
+            clave="hoteles",
+            widget=selector_frame,
+            texto="Cargando hoteles..."
+        )
+    
+    def _mostrar_carga(self, texto):
+        """Indicador de carga de las tareas en segundo plano (None = inactivo)"""
+        self.label_estado.configure(text=f"⏳ {texto}" if texto else "")
+    
+    def _mostrar_opciones_hotel(self, selector_frame, hoteles):
+        """Pinta el dropdown de hoteles cuando llega la respuesta de la API"""
         try:
-            self.hoteles_disponibles = self.consulta_service.obtener_hoteles()
+            self.hoteles_disponibles = hoteles
             
             if not self.hoteles_disponibles:
                 messagebox.showerror("Error", "No se encontraron hoteles disponibles")
@@ -357,90 +383,134 @@ class MainWindow:
             
             print(f"🔍 Buscando reservas ACTIVAS en hotel {self.hotel_seleccionado.nombre}: {query_string}")
             
-            # Llamar al endpoint de búsqueda de reservas ACTIVAS
-            response = self.api_client.get(f"reservas/buscar/cliente/activas?{query_string}")
-            
-            if not response.success:
-                messagebox.showinfo("Info", "No se encontraron reservas con esos criterios")
-                return
-            
-            # Extraer reservas de la respuesta
-            reservas_data = response.data.get('reservas', [])
-            
-            if not reservas_data:
-                messagebox.showinfo("Info", f"No se encontraron reservas para: {nombre} {apellido}")
-                # Limpiar resultados
-                for widget in self.reservas_result_frame.winfo_children():
-                    widget.destroy()
-                label = ctk.CTkLabel(
-                    self.reservas_result_frame,
-                    text=f"No se encontraron reservas para: {nombre} {apellido}",
-                    font=ctk.CTkFont(size=14)
-                )
-                label.pack(pady=20)
-                return
-            
-            print(f"✅ Se encontraron {len(reservas_data)} reservas")
-            
-            # Convertir a objetos Reserva y mostrar
-            from src.domain.reserva import Reserva
-            reservas = []
-            for data in reservas_data:
-                # Usar el método from_dict de la clase Reserva
-                reserva = Reserva.from_dict(data)
-                # Agregar datos adicionales para el display
-                reserva._contrato_data = data.get('contrato')
-                reserva._cliente_data = data.get('clientePaga')
-                reserva._precio_regimen_data = data.get('precioRegimen')
-                reservas.append(reserva)
-            
-            self._mostrar_lista_reservas(reservas)
+            def buscar():
+                # Llamar al endpoint de búsqueda de reservas ACTIVAS
+                response = self.api_client.get(f"reservas/buscar/cliente/activas?{query_string}")
+                if not response.success:
+                    return None
+                # Extraer reservas de la respuesta
+                return self._reservas_desde_datos(response.data.get('reservas', []))
+            
+            self.tareas.ejecutar(
+                buscar,
+                al_terminar=lambda reservas: self._mostrar_resultado_busqueda_reservas(reservas, nombre, apellido),
+                al_fallar=self._error_buscar_reservas,
+                clave="reservas",
+                widget=self.reservas_result_frame,
+                texto="Buscando reservas..."
+            )
             
         except Exception as e:
-            print(f"❌ Error al buscar reservas: {e}")
-            import traceback
-            traceback.print_exc()
-            messagebox.showerror("Error", f"Error al buscar reservas: {str(e)}")
+            self._error_buscar_reservas(e)
+    
+    def _mostrar_resultado_busqueda_reservas(self, reservas, nombre, apellido):
+        """Pinta el resultado de la búsqueda de reservas por cliente"""
+        if reservas is None:
+            messagebox.showinfo("Info", "No se encontraron reservas con esos criterios")
+            return
+        
+        if not reservas:
+            messagebox.showinfo("Info", f"No se encontraron reservas para: {nombre} {apellido}")
+            # Limpiar resultados
+            for widget in self.reservas_result_frame.winfo_children():
+                widget.destroy()
+            label = ctk.CTkLabel(
+                self.reservas_result_frame,
+                text=f"No se encontraron reservas para: {nombre} {apellido}",
+                font=ctk.CTkFont(size=14)
+            )
+            label.pack(pady=20)
+            return
+        
+        print(f"✅ Se encontraron {len(reservas)} reservas")
+        self._mostrar_lista_reservas(reservas)
+    
+    def _error_buscar_reservas(self, e):
+        print(f"❌ Error al buscar reservas: {e}")
+        import traceback
+        traceback.print_exception(type(e), e, e.__traceback__)
+        messagebox.showerror("Error", f"Error al buscar reservas: {str(e)}")
+    
+    def _reservas_desde_datos(self, reservas_data):
+        """Convierte la respuesta de la API en objetos Reserva (se ejecuta en segundo plano)"""
+        from src.domain.reserva import Reserva
+        reservas = []
+        for data in reservas_data:
+            # Usar el método from_dict de la clase Reserva
+            reserva = Reserva.from_dict(data)
+            # Agregar datos adicionales para el display
+            reserva._contrato_data = data.get('contrato')
+            reserva._cliente_data = data.get('clientePaga')
+            reserva._precio_regimen_data = data.get('precioRegimen')
+            reservas.append(reserva)
+        return reservas
     
     def _listar_todas_reservas(self):
         """Lista todas las reservas ACTIVAS del hotel seleccionado"""
-        try:
-            # FILTRAR POR HOTEL SELECCIONADO
-            query = ""
-            if self.hotel_seleccionado:
-                query = f"?hotel={self.hotel_seleccionado.id_hotel}"
-            
+        # FILTRAR POR HOTEL SELECCIONADO
+        query = ""
+        if self.hotel_seleccionado:
+            query = f"?hotel={self.hotel_seleccionado.id_hotel}"
+        
+        def listar():
             # Obtener datos completos de la API - Solo ACTIVAS
             response = self.api_client.get(f"reservas/activas{query}")
             if not response.success:
                 raise Exception(response.error)
-            
-            reservas_data = response.data
-            
+            # Sin conexión, el cliente devuelve la copia local: se avisa en la lista
+            return self._reservas_desde_datos(response.data), self._aviso_copia_local(response)
+        
+        def mostrar(resultado):
+            reservas, aviso = resultado
             print(f"📋 Listando reservas ACTIVAS del hotel: {self.hotel_seleccionado.nombre}")
-            print(f"✅ Se encontraron {len(reservas_data)} reservas activas")
-            
-            # Convertir a objetos Reserva
-            from src.domain.reserva import Reserva
-            reservas = []
-            for data in reservas_data:
-                reserva = Reserva.from_dict(data)
-                # Agregar datos adicionales para el display
-                reserva._contrato_data = data.get('contrato')
-                reserva._cliente_data = data.get('clientePaga')
-                reserva._precio_regimen_data = data.get('precioRegimen')
-                reservas.append(reserva)
-            
-            self._mostrar_lista_reservas(reservas)
-        except Exception as e:
-            messagebox.showerror("Error", f"Error al listar reservas: {str(e)}")
+            print(f"✅ Se encontraron {len(reservas)} reservas activas")
+            self._mostrar_lista_reservas(reservas, aviso)
+        
+        # Pintar ya la copia local (última sesión) mientras llega la lista actualizada
+        copia = self.api_client.get_stored(f"reservas/activas{query}")
+        if copia is not None:
+            self._mostrar_lista_reservas(
+                self._reservas_desde_datos(copia.data),
+                self._aviso_copia_local(copia, actualizando=True)
+            )
+        
+        self.tareas.ejecutar(
+            listar,
+            al_terminar=mostrar,
+            al_fallar=lambda e: messagebox.showerror("Error", f"Error al listar reservas: {str(e)}"),
+            clave="reservas",
+            widget=self.reservas_result_frame,
+            texto="Actualizando reservas..." if copia is not None else "Cargando reservas..."
+        )
     
-    def _mostrar_lista_reservas(self, reservas):
-        """Muestra una lista de reservas"""
+    def _aviso_copia_local(self, response, actualizando=False):
+        """Texto del aviso si la respuesta es la copia local (cabecera X-PMS-Cache), o None"""
+        if 'X-PMS-Cache' not in response.headers:
+            return None
+        guardada = response.headers.get('X-PMS-Cache-Time')
+        if guardada:
+            origen = "del " + datetime.fromtimestamp(float(guardada)).strftime("%d/%m/%Y %H:%M")
+        else:
+            origen = "de la sesión anterior"
+        if actualizando:
+            return f"🕓 Copia local {origen}: actualizando..."
+        return f"⚠️ Datos sin conexión: copia local {origen}, puede no estar al día"
+    
+    def _mostrar_lista_reservas(self, reservas, aviso=None):
+        """Muestra una lista de reservas (con un aviso encima si son datos de la copia local)"""
         # Limpiar resultados
         for widget in self.reservas_result_frame.winfo_children():
             widget.destroy()
         
+        if aviso:
+            label_aviso = ctk.CTkLabel(
+                self.reservas_result_frame,
+                text=aviso,
+                font=ctk.CTkFont(size=14, weight="bold"),
+                text_color=("#E67E22", "#F39C12")
+            )
+            label_aviso.pack(pady=(0, 10))
+        
         if not reservas:
             label = ctk.CTkLabel(
                 self.reservas_result_frame,
@@ -450,44 +520,9 @@ class MainWindow:
             label.pack(pady=20)
             return
         
-        # Headers con anchos proporcionados
-        header_frame = ctk.CTkFrame(self.reservas_result_frame, fg_color=("#2B7A78", "#14443F"), corner_radius=8)
-        header_frame.pack(fill="x", pady=(0, 10), padx=10)
-        
-        # Configurar grid para que se expanda
-        header_frame.grid_columnconfigure(0, weight=3, minsize=200)  # Cliente
-        header_frame.grid_columnconfigure(1, weight=3, minsize=200)  # Hotel
-        header_frame.grid_columnconfigure(2, weight=2, minsize=120)  # Entrada
-        header_frame.grid_columnconfigure(3, weight=2, minsize=120)  # Salida
-        header_frame.grid_columnconfigure(4, weight=2, minsize=100)  # Tipo
-        header_frame.grid_columnconfigure(5, weight=2, minsize=120)  # Accion
-        
-        headers = ["Cliente", "Hotel", "Entrada", "Salida", "Tipo", "Acción"]
-        for col, header in enumerate(headers):
-            label = ctk.CTkLabel(
-                header_frame,
-                text=header,
-                font=ctk.CTkFont(size=14, weight="bold"),
-                anchor="center"
-            )
-            label.grid(row=0, column=col, padx=5, pady=15, sticky="ew")
-        
-        # Datos con filas alternadas
-        for idx, reserva in enumerate(reservas):
-            # Color alternado para mejor legibilidad
-            bg_color = ("#2B2B2B", "#1E1E1E") if idx % 2 == 0 else ("#252525", "#252525")
-            
-            row_frame = ctk.CTkFrame(self.reservas_result_frame, fg_color=bg_color, corner_radius=5)
-            row_frame.pack(fill="x", pady=3, padx=10)
-            
-            # Configurar grid igual que header
-            row_frame.grid_columnconfigure(0, weight=3, minsize=200)
-            row_frame.grid_columnconfigure(1, weight=3, minsize=200)
-            row_frame.grid_columnconfigure(2, weight=2, minsize=120)
-            row_frame.grid_columnconfigure(3, weight=2, minsize=120)
-            row_frame.grid_columnconfigure(4, weight=2, minsize=100)
-            row_frame.grid_columnconfigure(5, weight=2, minsize=120)
-            
+        # Tabla virtual: solo se crean widgets para las filas visibles
+        filas = []
+        for reserva in reservas:
             # Cliente (nombre completo)
             cliente_text = "N/A"
             if hasattr(reserva, '_cliente_data') and reserva._cliente_data:
@@ -497,13 +532,6 @@ class MainWindow:
             elif reserva.id_cliente:
                 cliente_text = f"ID: {reserva.id_cliente}"
             
-            ctk.CTkLabel(
-                row_frame,
-                text=cliente_text,
-                font=ctk.CTkFont(size=13),
-                anchor="w"
-            ).grid(row=0, column=0, padx=10, pady=12, sticky="ew")
-            
             # Hotel (nombre)
             hotel_text = "N/A"
             if hasattr(reserva, '_precio_regimen_data') and reserva._precio_regimen_data:
@@ -514,49 +542,25 @@ class MainWindow:
             elif reserva.id_hotel:
                 hotel_text = f"ID: {reserva.id_hotel}"
             
-            ctk.CTkLabel(
-                row_frame,
-                text=hotel_text,
-                font=ctk.CTkFont(size=13),
-                anchor="w"
-            ).grid(row=0, column=1, padx=10, pady=12, sticky="ew")
-            
-            # Fechas
-            ctk.CTkLabel(
-                row_frame,
-                text=str(reserva.fecha_entrada),
-                font=ctk.CTkFont(size=13),
-                anchor="center"
-            ).grid(row=0, column=2, padx=5, pady=12, sticky="ew")
-            
-            ctk.CTkLabel(
-                row_frame,
-                text=str(reserva.fecha_salida),
-                font=ctk.CTkFont(size=13),
-                anchor="center"
-            ).grid(row=0, column=3, padx=5, pady=12, sticky="ew")
-            
             # Tipo de reserva
             tipo_text = reserva.tipo.value if hasattr(reserva.tipo, 'value') else str(reserva.tipo)
-            ctk.CTkLabel(
-                row_frame,
-                text=tipo_text,
-                font=ctk.CTkFont(size=13),
-                anchor="center"
-            ).grid(row=0, column=4, padx=5, pady=12, sticky="ew")
-            
-            # Boton
-            btn_ver = ctk.CTkButton(
-                row_frame,
-                text="Ver",
-                command=lambda r=reserva: self._mostrar_detalle_reserva(r),
-                fg_color=("#1F618D", "#154360"),
-                hover_color=("#2E86C1", "#1A5490"),
-                font=ctk.CTkFont(size=13, weight="bold"),
-                height=38,
-                width=100
-            )
-            btn_ver.grid(row=0, column=5, padx=10, pady=10, sticky="ew")
+            
+            filas.append([cliente_text, hotel_text, str(reserva.fecha_entrada), str(reserva.fecha_salida), tipo_text])
+        
+        tabla = TablaVirtual(
+            self.reservas_result_frame,
+            [
+                Columna("Cliente", 3, 200, "w"),
+                Columna("Hotel", 3, 200, "w"),
+                Columna("Entrada", 2, 120),
+                Columna("Salida", 2, 120),
+                Columna("Tipo", 2, 100),
+                Accion("Acción", "Ver", lambda i: self._mostrar_detalle_reserva(reservas[i]), 2, 120),
+            ],
+            filas_visibles=10
+        )
+        tabla.pack(fill="x")
+        tabla.set_filas(filas)
     
     def _mostrar_detalle_reserva(self, reserva):
         """Muestra el detalle de una reserva con opción de check-in"""
@@ -565,20 +569,35 @@ class MainWindow:
             widget.destroy()
         
         # Obtener datos completos de la reserva desde la API
-        try:
+        def cargar():
             response = self.api_client.get(f"reservas/{reserva.id_reserva}")
-            if response.success:
-                from src.domain.reserva import Reserva
-                reserva = Reserva.from_dict(response.data)
-                reserva._contrato_data = response.data.get('contrato')
-                reserva._cliente_data = response.data.get('clientePaga')
-                reserva._precio_regimen_data = response.data.get('precioRegimen')
-                reserva._raw_data = response.data  # Guardar datos completos incluyendo pernoctaciones
-        except Exception as e:
+            if not response.success:
+                return reserva
+            from src.domain.reserva import Reserva
+            completa = Reserva.from_dict(response.data)
+            completa._contrato_data = response.data.get('contrato')
+            completa._cliente_data = response.data.get('clientePaga')
+            completa._precio_regimen_data = response.data.get('precioRegimen')
+            completa._raw_data = response.data  # Guardar datos completos incluyendo pernoctaciones
+            return completa
+        
+        def sin_datos_completos(e):
             print(f"⚠️ No se pudieron obtener datos completos de la reserva: {e}")
             import traceback
-            traceback.print_exc()
-        
+            traceback.print_exception(type(e), e, e.__traceback__)
+            self._pintar_detalle_reserva(reserva)
+        
+        self.tareas.ejecutar(
+            cargar,
+            al_terminar=self._pintar_detalle_reserva,
+            al_fallar=sin_datos_completos,
+            clave="reservas",
+            widget=self.reservas_result_frame,
+            texto=f"Cargando reserva #{reserva.id_reserva}..."
+        )
+    
+    def _pintar_detalle_reserva(self, reserva):
+        """Pinta el detalle de una reserva ya cargada"""
         # Frame de detalle con estilo mejorado
         detalle_frame = ctk.CTkFrame(self.reservas_result_frame, corner_radius=15)
         detalle_frame.pack(fill="both", expand=True, padx=30, pady=30)
@@ -734,53 +753,25 @@ class MainWindow:
             checkin_frame = ctk.CTkFrame(acciones_frame, fg_color="transparent")
             checkin_frame.pack(pady=12)
             
-            # Obtener habitaciones disponibles del hotel
-            habitaciones_disponibles = self._obtener_habitaciones_disponibles(reserva)
-            
             # Mostrar formulario de check-in
             label_hab = ctk.CTkLabel(checkin_frame, text="Seleccionar Habitación:", font=ctk.CTkFont(size=15, weight="bold"))
             label_hab.pack(side="left", padx=12)
-        
-            if habitaciones_disponibles:
-                # Crear opciones del dropdown con formato "Número - Tipo"
-                opciones_habitaciones = {}
-                for hab in habitaciones_disponibles:
-                    numero = hab.get('numeroHabitacion', 'N/A')
-                    tipo = hab.get('tipoHabitacion', {}).get('categoria', 'N/A')
-                    texto = f"{numero} - {tipo}"
-                    opciones_habitaciones[texto] = numero
-                
-                dropdown_hab = ctk.CTkOptionMenu(
-                    checkin_frame,
-                    values=list(opciones_habitaciones.keys()),
-                    font=ctk.CTkFont(size=14),
-                    width=250,
-                    height=45
-                )
-                dropdown_hab.pack(side="left", padx=12)
-                dropdown_hab.set(list(opciones_habitaciones.keys())[0])
-                
-                btn_checkin = ctk.CTkButton(
-                    checkin_frame,
-                    text="✓ Hacer Check-in",
-                    command=lambda: self._mostrar_checkin_con_huespedes_inline(reserva, opciones_habitaciones[dropdown_hab.get()]),
-                    font=ctk.CTkFont(size=15, weight="bold"),
-                    fg_color=("#2B7A78", "#14443F"),
-                    hover_color=("#3D9970", "#2A7A5E"),
-                    width=220,
-                    height=45,
-                    corner_radius=10
-                )
-                btn_checkin.pack(side="left", padx=12)
-            else:
-                # No hay habitaciones disponibles
-                label_no_hab = ctk.CTkLabel(
-                    checkin_frame,
-                    text="❌ No hay habitaciones disponibles",
-                    font=ctk.CTkFont(size=14),
-                    text_color=("#E74C3C", "#C0392B")
-                )
-                label_no_hab.pack(side="left", padx=12)
+            
+            label_cargando = ctk.CTkLabel(checkin_frame, text="Cargando habitaciones...", font=ctk.CTkFont(size=14))
+            label_cargando.pack(side="left", padx=12)
+            
+            # Obtener habitaciones disponibles del hotel en segundo plano
+            def pintar_habitaciones(habitaciones_disponibles):
+                label_cargando.destroy()
+                self._pintar_opciones_checkin(checkin_frame, reserva, habitaciones_disponibles)
+            
+            self.tareas.ejecutar(
+                lambda: self._obtener_habitaciones_disponibles(reserva),
+                al_terminar=pintar_habitaciones,
+                clave="habitaciones",
+                widget=checkin_frame,
+                texto="Cargando habitaciones disponibles..."
+            )
             
             # Frame para cancelar (separado visualmente)
             separador = ctk.CTkLabel(acciones_frame, text="— o —", font=ctk.CTkFont(size=14, weight="bold"))
@@ -802,22 +793,74 @@ class MainWindow:
             )
             btn_cancelar.pack(padx=12)
     
-    def _mostrar_checkin_con_huespedes_inline(self, reserva, numero_hab):
-        """Muestra el panel inline para gestionar huéspedes y hacer check-in"""
-        try:
-            if not numero_hab:
-                messagebox.showwarning("Advertencia", "Debe ingresar el número de habitación")
-                return
+    def _pintar_opciones_checkin(self, checkin_frame, reserva, habitaciones_disponibles):
+        """Pinta el selector de habitación y el botón de check-in de una reserva"""
+        if habitaciones_disponibles:
+            # Crear opciones del dropdown con formato "Número - Tipo"
+            opciones_habitaciones = {}
+            for hab in habitaciones_disponibles:
+                numero = hab.get('numeroHabitacion', 'N/A')
+                tipo = hab.get('tipoHabitacion', {}).get('categoria', 'N/A')
+                texto = f"{numero} - {tipo}"
+                opciones_habitaciones[texto] = numero
+            
+            dropdown_hab = ctk.CTkOptionMenu(
+                checkin_frame,
+                values=list(opciones_habitaciones.keys()),
+                font=ctk.CTkFont(size=14),
+                width=250,
+                height=45
+            )
+            dropdown_hab.pack(side="left", padx=12)
+            dropdown_hab.set(list(opciones_habitaciones.keys())[0])
             
-            # Obtener la reserva completa desde la API para asegurar tener todas las relaciones
+            btn_checkin = ctk.CTkButton(
+                checkin_frame,
+                text="✓ Hacer Check-in",
+                command=lambda: self._mostrar_checkin_con_huespedes_inline(reserva, opciones_habitaciones[dropdown_hab.get()]),
+                font=ctk.CTkFont(size=15, weight="bold"),
+                fg_color=("#2B7A78", "#14443F"),
+                hover_color=("#3D9970", "#2A7A5E"),
+                width=220,
+                height=45,
+                corner_radius=10
+            )
+            btn_checkin.pack(side="left", padx=12)
+        else:
+            # No hay habitaciones disponibles
+            label_no_hab = ctk.CTkLabel(
+                checkin_frame,
+                text="❌ No hay habitaciones disponibles",
+                font=ctk.CTkFont(size=14),
+                text_color=("#E74C3C", "#C0392B")
+            )
+            label_no_hab.pack(side="left", padx=12)
+    
+    def _mostrar_checkin_con_huespedes_inline(self, reserva, numero_hab):
+        """Carga la reserva completa y muestra el panel inline de huéspedes y check-in"""
+        if not numero_hab:
+            messagebox.showwarning("Advertencia", "Debe ingresar el número de habitación")
+            return
+        
+        # Obtener la reserva completa desde la API para asegurar tener todas las relaciones
+        def cargar():
             response = self.api_client.get(f"reservas/{reserva.id_reserva}")
-            
             if not response.success:
-                messagebox.showerror("Error", f"No se pudo obtener la reserva: {response.error}")
-                return
-            
-            reserva_data = response.data
-            
+                raise Exception(f"No se pudo obtener la reserva: {response.error}")
+            return response.data
+        
+        self.tareas.ejecutar(
+            cargar,
+            al_terminar=lambda reserva_data: self._pintar_checkin_con_huespedes_inline(reserva, numero_hab, reserva_data),
+            al_fallar=lambda e: messagebox.showerror("Error", str(e)),
+            clave="reservas",
+            widget=self.reservas_result_frame,
+            texto=f"Cargando reserva #{reserva.id_reserva}..."
+        )
+    
+    def _pintar_checkin_con_huespedes_inline(self, reserva, numero_hab, reserva_data):
+        """Muestra el panel inline para gestionar huéspedes y hacer check-in"""
+        try:
             # Verificar si ya tiene contrato
             if reserva_data.get("contrato"):
                 messagebox.showwarning(
@@ -998,14 +1041,18 @@ class MainWindow:
             messagebox.showerror("Error", f"Error al mostrar check-in: {str(e)}")
     
     def _obtener_habitaciones_disponibles(self, reserva):
-        """Obtiene las habitaciones disponibles del hotel para el tipo de la reserva"""
+        """
+        Obtiene las habitaciones disponibles del hotel para el tipo de la reserva.
+        Hace peticiones al WebService: se ejecuta en segundo plano.
+        """
         try:
-            # Obtener el tipo de habitación de la reserva
-            response = self.api_client.get(f"reservas/{reserva.id_reserva}")
-            if not response.success:
-                return []
-            
-            reserva_data = response.data
+            # Obtener el tipo de habitación de la reserva (ya cargada por el detalle, si es posible)
+            reserva_data = getattr(reserva, '_raw_data', None)
+            if reserva_data is None:
+                response = self.api_client.get(f"reservas/{reserva.id_reserva}")
+                if not response.success:
+                    return []
+                reserva_data = response.data
             pernoctaciones = reserva_data.get("pernoctaciones", [])
             if not pernoctaciones:
                 return []
@@ -1189,78 +1236,87 @@ class MainWindow:
             
             print(f"🔍 Buscando contratos en hotel {self.hotel_seleccionado.nombre}: {query_string}")
             
-            # Llamar a la API
-            response = self.api_client.get(f"contratos/buscar/cliente?{query_string}")
-            
-            if not response.success:
-                messagebox.showerror("Error", f"Error al buscar contratos: {response.error}")
-                return
-            
-            contratos_data = response.data.get('contratos', [])
-            
-            if not contratos_data:
-                # Mostrar mensaje de no encontrado
-                for widget in self.contratos_result_frame.winfo_children():
-                    widget.destroy()
-                label = ctk.CTkLabel(
-                    self.contratos_result_frame,
-                    text=f"No se encontraron contratos para: {nombre} {apellido}".strip(),
-                    font=ctk.CTkFont(size=14)
-                )
-                label.pack(pady=20)
-                return
-            
-            print(f"✅ Se encontraron {len(contratos_data)} contratos")
-            
-            # Convertir a objetos Contrato
-            from src.domain.contrato import Contrato
-            contratos = []
-            for data in contratos_data:
-                contrato = Contrato.from_dict(data)
-                # Agregar datos adicionales para el display
-                contrato._reserva_data = data.get('reserva')
-                contrato._habitacion_data = data.get('habitacion')
-                contratos.append(contrato)
-            
-            self._mostrar_lista_contratos(contratos)
+            def buscar():
+                # Llamar a la API
+                response = self.api_client.get(f"contratos/buscar/cliente?{query_string}")
+                if not response.success:
+                    raise Exception(response.error)
+                return self._contratos_desde_datos(response.data.get('contratos', []))
+            
+            self.tareas.ejecutar(
+                buscar,
+                al_terminar=lambda contratos: self._mostrar_resultado_busqueda_contratos(contratos, nombre, apellido),
+                al_fallar=self._error_buscar_contratos,
+                clave="contratos",
+                widget=self.contratos_result_frame,
+                texto="Buscando contratos..."
+            )
             
         except Exception as e:
-            print(f"❌ Error al buscar contratos: {e}")
-            import traceback
-            traceback.print_exc()
-            messagebox.showerror("Error", f"Error al buscar contratos: {str(e)}")
+            self._error_buscar_contratos(e)
+    
+    def _mostrar_resultado_busqueda_contratos(self, contratos, nombre, apellido):
+        """Pinta el resultado de la búsqueda de contratos por cliente"""
+        if not contratos:
+            # Mostrar mensaje de no encontrado
+            for widget in self.contratos_result_frame.winfo_children():
+                widget.destroy()
+            label = ctk.CTkLabel(
+                self.contratos_result_frame,
+                text=f"No se encontraron contratos para: {nombre} {apellido}".strip(),
+                font=ctk.CTkFont(size=14)
+            )
+            label.pack(pady=20)
+            return
+        
+        print(f"✅ Se encontraron {len(contratos)} contratos")
+        self._mostrar_lista_contratos(contratos)
+    
+    def _error_buscar_contratos(self, e):
+        print(f"❌ Error al buscar contratos: {e}")
+        import traceback
+        traceback.print_exception(type(e), e, e.__traceback__)
+        messagebox.showerror("Error", f"Error al buscar contratos: {str(e)}")
+    
+    def _contratos_desde_datos(self, contratos_data):
+        """Convierte la respuesta de la API en objetos Contrato (se ejecuta en segundo plano)"""
+        from src.domain.contrato import Contrato
+        contratos = []
+        for data in contratos_data:
+            contrato = Contrato.from_dict(data)
+            # Agregar datos adicionales para el display
+            contrato._reserva_data = data.get('reserva')
+            contrato._habitacion_data = data.get('habitacion')
+            contratos.append(contrato)
+        return contratos
     
     def _listar_todos_contratos(self):
         """Lista todos los contratos del hotel seleccionado"""
-        try:
-            # FILTRAR POR HOTEL SELECCIONADO
-            query = ""
-            if self.hotel_seleccionado:
-                query = f"?hotel={self.hotel_seleccionado.id_hotel}"
-            
+        # FILTRAR POR HOTEL SELECCIONADO
+        query = ""
+        if self.hotel_seleccionado:
+            query = f"?hotel={self.hotel_seleccionado.id_hotel}"
+        
+        def listar():
             # Obtener datos completos de la API
             response = self.api_client.get(f"contratos{query}")
             if not response.success:
                 raise Exception(response.error)
-            
-            contratos_data = response.data.get('contratos', [])
-            
+            return self._contratos_desde_datos(response.data.get('contratos', []))
+        
+        def mostrar(contratos):
             print(f"📋 Listando todos los contratos del hotel: {self.hotel_seleccionado.nombre}")
-            print(f"✅ Se encontraron {len(contratos_data)} contratos")
-            
-            # Convertir a objetos Contrato
-            from src.domain.contrato import Contrato
-            contratos = []
-            for data in contratos_data:
-                contrato = Contrato.from_dict(data)
-                # Agregar datos adicionales para el display
-                contrato._reserva_data = data.get('reserva')
-                contrato._habitacion_data = data.get('habitacion')
-                contratos.append(contrato)
-            
+            print(f"✅ Se encontraron {len(contratos)} contratos")
             self._mostrar_lista_contratos(contratos)
-        except Exception as e:
-            messagebox.showerror("Error", f"Error al listar contratos: {str(e)}")
+        
+        self.tareas.ejecutar(
+            listar,
+            al_terminar=mostrar,
+            al_fallar=lambda e: messagebox.showerror("Error", f"Error al listar contratos: {str(e)}"),
+            clave="contratos",
+            widget=self.contratos_result_frame,
+            texto="Cargando contratos..."
+        )
     
     def _mostrar_lista_contratos(self, contratos):
         """Muestra una lista de contratos"""
@@ -1277,49 +1333,9 @@ class MainWindow:
             label.pack(pady=20)
             return
         
-        # Headers con anchos proporcionados
-        header_frame = ctk.CTkFrame(self.contratos_result_frame, fg_color=("#2B7A78", "#14443F"), corner_radius=8)
-        header_frame.pack(fill="x", pady=(0, 10), padx=10)
-        
-        # Configurar grid con anchos mínimos para alineación perfecta
-        header_frame.grid_columnconfigure(0, weight=3, minsize=180)  # Cliente
-        header_frame.grid_columnconfigure(1, weight=1, minsize=100)  # Habitación
-        header_frame.grid_columnconfigure(2, weight=2, minsize=150)  # Check-in
-        header_frame.grid_columnconfigure(3, weight=2, minsize=150)  # Check-out
-        header_frame.grid_columnconfigure(4, weight=1, minsize=100)  # Estado
-        header_frame.grid_columnconfigure(5, weight=1, minsize=120)  # Servicios
-        header_frame.grid_columnconfigure(6, weight=1, minsize=100)  # Acción
-        
-        headers = ["Cliente", "Habitación", "Check-in", "Check-out", "Estado", "Servicios", "Acción"]
-        
-        for col, header in enumerate(headers):
-            # Anclar a la izquierda solo la columna Cliente, el resto al centro
-            anchor_pos = "w" if col == 0 else "center"
-            
-            label = ctk.CTkLabel(
-                header_frame,
-                text=header,
-                font=ctk.CTkFont(size=14, weight="bold"),
-                anchor=anchor_pos
-            )
-            label.grid(row=0, column=col, padx=5, pady=15, sticky="ew")
-        
-        # Datos
-        for idx, contrato in enumerate(contratos):
-            bg_color = ("#2B2B2B", "#1E1E1E") if idx % 2 == 0 else ("#252525", "#252525")
-            
-            row_frame = ctk.CTkFrame(self.contratos_result_frame, fg_color=bg_color, corner_radius=5)
-            row_frame.pack(fill="x", pady=3, padx=10)
-            
-            # Configurar grid EXACTAMENTE igual que header
-            row_frame.grid_columnconfigure(0, weight=3, minsize=180)  # Cliente
-            row_frame.grid_columnconfigure(1, weight=1, minsize=100)  # Habitación
-            row_frame.grid_columnconfigure(2, weight=2, minsize=150)  # Check-in
-            row_frame.grid_columnconfigure(3, weight=2, minsize=150)  # Check-out
-            row_frame.grid_columnconfigure(4, weight=1, minsize=100)  # Estado
-            row_frame.grid_columnconfigure(5, weight=1, minsize=120)  # Servicios
-            row_frame.grid_columnconfigure(6, weight=1, minsize=100)  # Acción
-            
+        # Tabla virtual: solo se crean widgets para las filas visibles
+        filas = []
+        for contrato in contratos:
             # Obtener información de la reserva
             cliente_nombre = "N/A"
             
@@ -1333,51 +1349,37 @@ class MainWindow:
                 fecha_checkin = contrato.fecha_checkin.strftime("%d/%m/%Y %H:%M")
             
             fecha_checkout = "N/A"
-            estado = "✅ Activo"
-            estado_color = ("#27AE60", "#2ECC71")
-            contrato_activo = True
+            estado = ("✅ Activo", ("#27AE60", "#2ECC71"))
             
             if contrato.fecha_checkout:
                 fecha_checkout = contrato.fecha_checkout.strftime("%d/%m/%Y %H:%M")
-                estado = "🔒 Finalizado"
-                estado_color = ("#7F8C8D", "#95A5A6")
-                contrato_activo = False
-            
-            # Columnas de datos con padding UNIFORME
-            ctk.CTkLabel(row_frame, text=cliente_nombre, font=ctk.CTkFont(size=13), anchor="w").grid(row=0, column=0, padx=5, pady=10, sticky="ew")
-            ctk.CTkLabel(row_frame, text=str(contrato.numero_habitacion), font=ctk.CTkFont(size=13), anchor="center").grid(row=0, column=1, padx=5, pady=10, sticky="ew")
-            ctk.CTkLabel(row_frame, text=fecha_checkin, font=ctk.CTkFont(size=13), anchor="center").grid(row=0, column=2, padx=5, pady=10, sticky="ew")
-            ctk.CTkLabel(row_frame, text=fecha_checkout, font=ctk.CTkFont(size=13), anchor="center").grid(row=0, column=3, padx=5, pady=10, sticky="ew")
-            
-            estado_label = ctk.CTkLabel(row_frame, text=estado, font=ctk.CTkFont(size=13), text_color=estado_color, anchor="center")
-            estado_label.grid(row=0, column=4, padx=5, pady=10, sticky="ew")
-            
-            # Botón de añadir servicios (solo si el contrato está activo)
-            if contrato_activo:
-                btn_servicios = ctk.CTkButton(
-                    row_frame,
-                    text="➕ Servicios",
-                    command=lambda c=contrato: self._mostrar_anadir_servicios(c),
+                estado = ("🔒 Finalizado", ("#7F8C8D", "#95A5A6"))
+            
+            filas.append([cliente_nombre, str(contrato.numero_habitacion), fecha_checkin, fecha_checkout, estado])
+        
+        tabla = TablaVirtual(
+            self.contratos_result_frame,
+            [
+                Columna("Cliente", 3, 180, "w"),
+                Columna("Habitación", 1, 100),
+                Columna("Check-in", 2, 150),
+                Columna("Check-out", 2, 150),
+                Columna("Estado", 1, 100),
+                # Añadir servicios solo si el contrato está activo
+                Accion(
+                    "Servicios", "➕ Servicios",
+                    lambda i: self._mostrar_anadir_servicios(contratos[i]),
+                    1, 120,
                     fg_color=("#F39C12", "#E67E22"),
                     hover_color=("#E67E22", "#D35400"),
-                    font=ctk.CTkFont(size=12, weight="bold"),
-                    height=38
-                )
-                btn_servicios.grid(row=0, column=5, padx=5, pady=8, sticky="ew")
-            else:
-                # Espacio vacío si el contrato está finalizado
-                ctk.CTkLabel(row_frame, text="-", font=ctk.CTkFont(size=13), anchor="center").grid(row=0, column=5, padx=5, pady=10, sticky="ew")
-            
-            btn_ver = ctk.CTkButton(
-                row_frame,
-                text="👁️ Ver",
-                command=lambda c=contrato: self._mostrar_detalle_contrato(c),
-                fg_color=("#1F618D", "#154360"),
-                hover_color=("#2E86C1", "#1A5490"),
-                font=ctk.CTkFont(size=13, weight="bold"),
-                height=38
-            )
-            btn_ver.grid(row=0, column=6, padx=5, pady=8, sticky="ew")
+                    visible=lambda i: not contratos[i].fecha_checkout
+                ),
+                Accion("Acción", "👁️ Ver", lambda i: self._mostrar_detalle_contrato(contratos[i]), 1, 100),
+            ],
+            filas_visibles=10
+        )
+        tabla.pack(fill="x")
+        tabla.set_filas(filas)
     
     def _mostrar_detalle_contrato(self, contrato):
         """Muestra el detalle de un contrato con opción de check-out"""
@@ -1386,16 +1388,23 @@ class MainWindow:
             widget.destroy()
         
         # Obtener datos completos del contrato desde la API para tener pernoctaciones con servicios
-        try:
+        def cargar_pernoctaciones():
             response = self.api_client.get(f"contratos/{contrato.id_contrato}")
             if response.success:
-                contrato_completo = response.data
-                pernoctaciones = contrato_completo.get('pernoctaciones', [])
-            else:
-                pernoctaciones = []
-        except:
-            pernoctaciones = []
+                return response.data.get('pernoctaciones', [])
+            return []
         
+        self.tareas.ejecutar(
+            cargar_pernoctaciones,
+            al_terminar=lambda pernoctaciones: self._pintar_detalle_contrato(contrato, pernoctaciones),
+            al_fallar=lambda e: self._pintar_detalle_contrato(contrato, []),
+            clave="contratos",
+            widget=self.contratos_result_frame,
+            texto=f"Cargando contrato #{contrato.id_contrato}..."
+        )
+    
+    def _pintar_detalle_contrato(self, contrato, pernoctaciones):
+        """Pinta el detalle de un contrato con sus pernoctaciones ya cargadas"""
         # Frame de detalle con estilo mejorado
         detalle_frame = ctk.CTkFrame(self.contratos_result_frame, corner_radius=15)
         detalle_frame.pack(fill="both", expand=True, padx=30, pady=30)
@@ -1780,9 +1789,14 @@ class MainWindow:
         try:
             print("🔍 Cargando disponibilidad...")
             
+            # Descartar una consulta anterior aún en curso (fechas ya cambiadas)
+            self.tareas.cancelar("disponibilidad")
+            
             # Limpiar el frame de disponibilidad
             for widget in self.disponibilidad_frame.winfo_children():
                 widget.destroy()
+            self.dropdown_tipo_hab = None
+            self.disponibilidad_data = {}
             
             # Validar hotel
             if not self.hotel_seleccionado:
@@ -1839,8 +1853,21 @@ class MainWindow:
             print(f"🌐 Llamando a disponibilidad para hotel ID: {self.hotel_seleccionado.id_hotel} ({self.hotel_seleccionado.nombre})")
             print(f"🌐 URL: {url}")
             
-            response = self.api_client.get(url)
+            self.tareas.ejecutar(
+                lambda: self.api_client.get(url),
+                al_terminar=self._mostrar_disponibilidad,
+                al_fallar=self._error_disponibilidad,
+                clave="disponibilidad",
+                widget=self.disponibilidad_frame,
+                texto="Consultando disponibilidad..."
+            )
             
+        except Exception as e:
+            self._error_disponibilidad(e)
+    
+    def _mostrar_disponibilidad(self, response):
+        """Pinta el dropdown de tipos de habitación con la respuesta de disponibilidad"""
+        try:
             if not response.success or not response.data:
                 info = ctk.CTkLabel(
                     self.disponibilidad_frame,
@@ -1916,17 +1943,22 @@ class MainWindow:
             self._actualizar_precio_desde_disponibilidad(opciones_display[0])
             
         except Exception as e:
-            print(f"❌ Error al cargar disponibilidad: {e}")
-            import traceback
-            traceback.print_exc()
-            
-            info = ctk.CTkLabel(
-                self.disponibilidad_frame,
-                text=f"❌ Error: {str(e)}",
-                font=ctk.CTkFont(size=13),
-                text_color=("#E74C3C", "#C0392B")
-            )
-            info.pack(side="left", padx=10)
+            self._error_disponibilidad(e)
+    
+    def _error_disponibilidad(self, e):
+        print(f"❌ Error al cargar disponibilidad: {e}")
+        import traceback
+        traceback.print_exception(type(e), e, e.__traceback__)
+        
+        for widget in self.disponibilidad_frame.winfo_children():
+            widget.destroy()
+        info = ctk.CTkLabel(
+            self.disponibilidad_frame,
+            text=f"❌ Error: {str(e)}",
+            font=ctk.CTkFont(size=13),
+            text_color=("#E74C3C", "#C0392B")
+        )
+        info.pack(side="left", padx=10)
     
     def _actualizar_precio_desde_disponibilidad(self, seleccion=None):
         """Actualiza el precio total usando los datos de disponibilidad"""
@@ -2005,7 +2037,7 @@ class MainWindow:
             if hasattr(self, 'label_precio_total'):
                 self.label_precio_total.configure(text="0.00 €")
     def _cargar_y_crear_dropdown_regimen(self, parent):
-        """Carga los regímenes disponibles del hotel seleccionado y crea el dropdown"""
+        """Crea el dropdown de regímenes y carga en segundo plano los del hotel seleccionado"""
         campo_frame = ctk.CTkFrame(parent, fg_color="transparent")
         campo_frame.pack(fill="x", pady=12, padx=50)
         
@@ -2019,64 +2051,63 @@ class MainWindow:
         label.pack(side="left", padx=12)
         label.pack(side="left", padx=10)
         
-        try:
+        # Mientras cargan, el régimen no es válido para crear la reserva
+        self.regimen_opciones = {"Cargando regímenes...": None}
+        self.dropdown_regimen = ctk.CTkOptionMenu(
+            campo_frame,
+            values=["Cargando regímenes..."],
+            height=45,
+            font=ctk.CTkFont(size=14),
+            fg_color=("#2B7A78", "#14443F"),
+            button_color=("#3D9970", "#2A7A5E"),
+            button_hover_color=("#2B7A78", "#14443F"),
+            corner_radius=8,
+            command=lambda x: self._actualizar_precio_desde_disponibilidad()
+        )
+        self.dropdown_regimen.set("Cargando regímenes...")
+        self.dropdown_regimen.pack(side="left", fill="x", expand=True, padx=12)
+        self.dropdown_regimen.pack(side="left", fill="x", expand=True, padx=10)
+        dropdown = self.dropdown_regimen
+        
+        def cargar():
             # Verificar que haya un hotel seleccionado
             if not self.hotel_seleccionado:
                 raise Exception("No hay hotel seleccionado")
-            
-            # Llamar al nuevo endpoint de regímenes por hotel
-            response = self.api_client.get(f"regimenes/hotel/{self.hotel_seleccionado.id_hotel}")
-            
-            if not response.success:
-                raise Exception("Error al cargar regímenes del hotel")
-            
+            # Regímenes del hotel (catálogo cacheado: solo va al WebService la primera vez)
+            return self.consulta_service.consultar_regimenes_hotel(self.hotel_seleccionado.id_hotel)
+        
+        def mostrar(precios_regimen):
             # Crear diccionario de opciones: "Código - Precio" -> idPrecioRegimen
-            self.regimen_opciones = {}
+            regimen_opciones = {}
             opciones_display = []
             
-            # Parsear la respuesta del API
-            if response.data and 'regimenes' in response.data:
-                for regimen_data in response.data['regimenes']:
-                    codigo = regimen_data['regimen']['codigo']
-                    precio = regimen_data['precio']
-                    id_precio_regimen = regimen_data['idPrecioRegimen']
-                    
-                    texto = f"{codigo} - {precio}€"
-                    opciones_display.append(texto)
-                    self.regimen_opciones[texto] = id_precio_regimen
+            for precio_regimen in precios_regimen:
+                texto = f"{precio_regimen.regimen.codigo} - {precio_regimen.precio:g}€"
+                opciones_display.append(texto)
+                regimen_opciones[texto] = precio_regimen.id_precio_regimen
             
             if not opciones_display:
                 opciones_display = ["No hay regímenes disponibles"]
-                self.regimen_opciones["No hay regímenes disponibles"] = None
-            self.dropdown_regimen = ctk.CTkOptionMenu(
-                campo_frame,
-                values=opciones_display,
-                height=45,
-                font=ctk.CTkFont(size=14),
-                fg_color=("#2B7A78", "#14443F"),
-                button_color=("#3D9970", "#2A7A5E"),
-                button_hover_color=("#2B7A78", "#14443F"),
-                corner_radius=8,
-                command=lambda x: self._actualizar_precio_desde_disponibilidad()
-            )
-            self.dropdown_regimen.set(opciones_display[0])
-            self.dropdown_regimen.pack(side="left", fill="x", expand=True, padx=12)
-            self.dropdown_regimen.pack(side="left", fill="x", expand=True, padx=10)
-            
-        except Exception as e:
+                regimen_opciones["No hay regímenes disponibles"] = None
+            self.regimen_opciones = regimen_opciones
+            dropdown.configure(values=opciones_display)
+            dropdown.set(opciones_display[0])
+        
+        def error(e):
             print(f"❌ Error al cargar regímenes: {e}")
-            import traceback
             # Si falla, mostrar dropdown con mensaje de error
-            self.dropdown_regimen = ctk.CTkOptionMenu(
-                campo_frame,
-                values=["Error al cargar regímenes"],
-                height=45,
-                font=ctk.CTkFont(size=14),
-                corner_radius=8
-            )
-            self.dropdown_regimen.set("Error al cargar regímenes")
-            self.dropdown_regimen.pack(side="left", fill="x", expand=True, padx=12)
+            dropdown.configure(values=["Error al cargar regímenes"])
+            dropdown.set("Error al cargar regímenes")
             self.regimen_opciones = None
+        
+        self.tareas.ejecutar(
+            cargar,
+            al_terminar=mostrar,
+            al_fallar=error,
+            clave="regimenes",
+            widget=dropdown,
+            texto="Cargando regímenes..."
+        )
     
     def _crear_campo_form(self, parent, label_text, entry_name, placeholder):
         """Crea un campo del formulario"""
@@ -2429,31 +2460,54 @@ class MainWindow:
             messagebox.showerror("Error", f"Error al crear reserva: {str(e)}")
     
     def _mostrar_anadir_servicios(self, contrato):
-        """Muestra el panel para añadir servicios a las pernoctaciones de un contrato"""
-        try:
-            # Limpiar contenido principal
-            self._limpiar_contenido()
-            
+        """Carga el contrato y los servicios y muestra el panel para añadirlos a sus pernoctaciones"""
+        # Limpiar contenido principal
+        self._limpiar_contenido()
+        
+        # Si se cambia de pantalla antes de que termine la carga, el resultado se descarta
+        label_cargando = ctk.CTkLabel(
+            self.content_frame,
+            text=f"Cargando contrato #{contrato.id_contrato}...",
+            font=ctk.CTkFont(size=16)
+        )
+        label_cargando.pack(pady=40)
+        
+        def cargar():
             # Obtener datos completos del contrato desde la API
             response = self.api_client.get(f"contratos/{contrato.id_contrato}")
             if not response.success:
-                messagebox.showerror("Error", f"No se pudo obtener el contrato: {response.error}")
-                return
-            
-            contrato_data = response.data
-            pernoctaciones = contrato_data.get('pernoctaciones', [])
-            
-            if not pernoctaciones:
-                messagebox.showwarning("Advertencia", "Este contrato no tiene pernoctaciones")
-                return
+                raise Exception(f"No se pudo obtener el contrato: {response.error}")
             
             # Obtener servicios disponibles
             servicios_response = self.api_client.get("servicios")
             if not servicios_response.success:
-                messagebox.showerror("Error", f"No se pudieron obtener los servicios: {servicios_response.error}")
-                return
+                raise Exception(f"No se pudieron obtener los servicios: {servicios_response.error}")
             
-            servicios_disponibles = servicios_response.data
+            return response.data.get('pernoctaciones', []), servicios_response.data
+        
+        def mostrar(datos):
+            label_cargando.destroy()
+            self._pintar_anadir_servicios(contrato, *datos)
+        
+        def error(e):
+            label_cargando.configure(text="❌ No se pudieron cargar los servicios del contrato")
+            messagebox.showerror("Error", str(e))
+        
+        self.tareas.ejecutar(
+            cargar,
+            al_terminar=mostrar,
+            al_fallar=error,
+            clave="contratos",
+            widget=label_cargando,
+            texto=f"Cargando contrato #{contrato.id_contrato}..."
+        )
+    
+    def _pintar_anadir_servicios(self, contrato, pernoctaciones, servicios_disponibles):
+        """Muestra el panel para añadir servicios a las pernoctaciones de un contrato"""
+        try:
+            if not pernoctaciones:
+                messagebox.showwarning("Advertencia", "Este contrato no tiene pernoctaciones")
+                return
             
             # Título
             titulo = ctk.CTkLabel(
@@ -0,0 +1,286 @@
+"""
+TablaVirtual - Tabla que solo crea los widgets de las filas visibles
+
+Principio de coste constante: con miles de registros se crean tantas
+filas de widgets como caben en pantalla; al desplazarse se reutilizan
+cambiando su texto, en lugar de crear un CTkFrame y varios CTkLabel por
+registro.
+"""
+from dataclasses import dataclass
+from typing import Callable, List, Optional, Sequence, Tuple, Union
+import customtkinter as ctk
+
+# Una celda es un texto o (texto, color del texto)
+Celda = Union[str, Tuple[str, Tuple[str, str]]]
+
+
+@dataclass
+class Columna:
+    """Columna de datos"""
+    titulo: str
+    peso: int = 1
+    ancho_min: int = 100
+    anchor: str = "center"
+
+
+@dataclass
+class Accion:
+    """Columna con un botón por fila; el callback recibe el índice del registro"""
+    titulo: str
+    texto: str
+    comando: Callable[[int], None]
+    peso: int = 1
+    ancho_min: int = 100
+    fg_color: Tuple[str, str] = ("#1F618D", "#154360")
+    hover_color: Tuple[str, str] = ("#2E86C1", "#1A5490")
+    # Si devuelve False para un registro, la celda muestra "-" en lugar del botón
+    visible: Optional[Callable[[int], bool]] = None
+
+
+class TablaVirtual(ctk.CTkFrame):
+    """
+    Tabla con cabecera fija, scroll propio y selección por índice.
+
+    Uso:
+        tabla = TablaVirtual(parent, [Columna("Cliente", 3, 200, "w"), ...],
+                             al_seleccionar=lambda i: ...)
+        tabla.set_filas([["Ana Pérez", ...], ...])
+    """
+
+    COLORES_FILA = (("#2B2B2B", "#1E1E1E"), ("#252525", "#252525"))
+    COLOR_SELECCION = ("#1F618D", "#154360")
+    COLOR_CABECERA = ("#2B7A78", "#14443F")
+
+    def __init__(self, master, columnas: Sequence[Union[Columna, Accion]],
+                 alto_fila: int = 50, filas_visibles: Optional[int] = None,
+                 al_seleccionar: Optional[Callable[[int], None]] = None,
+                 tamano_fuente: int = 13, colores_fila: Optional[Tuple] = None,
+                 color_cabecera: Optional[Tuple[str, str]] = None, **kwargs):
+        kwargs.setdefault("fg_color", "transparent")
+        super().__init__(master, **kwargs)
+        self.columnas = list(columnas)
+        # Posición de cada columna de datos dentro de la fila (las acciones no ocupan valor)
+        self._indice_valor = []
+        for columna in self.columnas:
+            self._indice_valor.append(None if isinstance(columna, Accion) else
+                                      sum(1 for v in self._indice_valor if v is not None))
+        self.alto_fila = alto_fila
+        self.al_seleccionar = al_seleccionar
+        self.seleccion: Optional[int] = None
+        self._colores_fila = colores_fila or self.COLORES_FILA
+
+        self._filas: Sequence[Sequence[Celda]] = []
+        self._primera = 0
+        self._visibles = 0
+        self._pool: List[dict] = []
+        self._fuente = ctk.CTkFont(size=tamano_fuente)
+        self._fuente_boton = ctk.CTkFont(size=tamano_fuente, weight="bold")
+
+        self.grid_rowconfigure(1, weight=1)
+        self.grid_columnconfigure(0, weight=1)
+
+        # Cabecera
+        cabecera = ctk.CTkFrame(self, fg_color=color_cabecera or self.COLOR_CABECERA, corner_radius=8)
+        cabecera.grid(row=0, column=0, columnspan=2, sticky="ew", padx=10, pady=(0, 10))
+        self._configurar_columnas(cabecera)
+        for col, columna in enumerate(self.columnas):
+            anchor = columna.anchor if isinstance(columna, Columna) else "center"
+            ctk.CTkLabel(
+                cabecera,
+                text=columna.titulo,
+                font=ctk.CTkFont(size=tamano_fuente + 1, weight="bold"),
+                anchor=anchor
+            ).grid(row=0, column=col, padx=5, pady=15, sticky="ew")
+
+        # Cuerpo: solo las filas visibles. Su alto lo fija el contenedor (o
+        # filas_visibles), nunca las filas, para que el pool no lo haga crecer
+        alto_cuerpo = filas_visibles * alto_fila if filas_visibles else 200
+        self._cuerpo = ctk.CTkFrame(self, fg_color="transparent", height=alto_cuerpo)
+        self._cuerpo.grid(row=1, column=0, sticky="nsew", padx=(10, 0))
+        self._cuerpo.grid_columnconfigure(0, weight=1)
+        self._cuerpo.grid_propagate(False)
+        self._cuerpo.bind("<Configure>", self._al_redimensionar, add="+")
+
+        self._scrollbar = ctk.CTkScrollbar(self, command=self._desplazar)
+        self._scrollbar.grid(row=1, column=1, sticky="ns")
+        self._scrollbar.set(0, 1)
+
+        self._enlazar_rueda(self._cuerpo)
+
+    # ------------------------------------------------------------------
+    # API pública
+    # ------------------------------------------------------------------
+
+    def set_filas(self, filas: Sequence[Sequence[Celda]], conservar_posicion: bool = False):
+        """Reemplaza los datos; no crea widgets nuevos"""
+        self._filas = filas
+        self.seleccion = None
+        if not conservar_posicion:
+            self._primera = 0
+        self._limitar_primera()
+        self._refrescar()
+
+    def desplazar_a(self, indice: int):
+        """Desplaza la vista para que `indice` sea la primera fila visible"""
+        anterior = self._primera
+        self._primera = indice
+        self._limitar_primera()
+        if self._primera != anterior:
+            self._refrescar()
+
+    def seleccionar(self, indice: Optional[int]):
+        """Marca un registro como seleccionado (sin llamar a al_seleccionar)"""
+        self.seleccion = indice
+        if indice is not None and not (self._primera <= indice < self._primera + self._visibles):
+            self.desplazar_a(indice)
+        self._refrescar()
+
+    @property
+    def total(self) -> int:
+        return len(self._filas)
+
+    # ------------------------------------------------------------------
+    # Filas reutilizables
+    # ------------------------------------------------------------------
+
+    def _configurar_columnas(self, frame):
+        # Misma configuración en cabecera y filas para que las columnas se alineen
+        for col, columna in enumerate(self.columnas):
+            frame.grid_columnconfigure(col, weight=columna.peso, minsize=columna.ancho_min)
+
+    def _crear_fila(self, posicion: int) -> dict:
+        frame = ctk.CTkFrame(self._cuerpo, corner_radius=5, height=self.alto_fila - 6)
+        frame.grid_propagate(False)
+        frame.grid_rowconfigure(0, weight=1)
+        self._configurar_columnas(frame)
+
+        celdas = []
+        for col, columna in enumerate(self.columnas):
+            if isinstance(columna, Accion):
+                boton = ctk.CTkButton(
+                    frame,
+                    text=columna.texto,
+                    command=lambda c=columna, p=posicion: c.comando(self._primera + p),
+                    fg_color=columna.fg_color,
+                    hover_color=columna.hover_color,
+                    font=self._fuente_boton,
+                    height=self.alto_fila - 14
+                )
+                guion = ctk.CTkLabel(frame, text="-", font=self._fuente, anchor="center")
+                self._enlazar_fila(guion, posicion)
+                self._enlazar_rueda(boton)
+                celdas.append({"boton": boton, "guion": guion, "col": col, "visible": None})
+            else:
+                label = ctk.CTkLabel(frame, text="", font=self._fuente, anchor=columna.anchor)
+                label.grid(row=0, column=col, padx=5, sticky="ew")
+                self._enlazar_fila(label, posicion)
+                celdas.append({"label": label, "texto": "", "color": None})
+
+        self._enlazar_fila(frame, posicion)
+        return {"frame": frame, "celdas": celdas, "color": None, "mostrada": False}
+
+    def _enlazar_fila(self, widget, posicion: int):
+        widget.bind("<Button-1>", lambda e, p=posicion: self._click(p), add="+")
+        self._enlazar_rueda(widget)
+
+    def _enlazar_rueda(self, widget):
+        widget.bind("<MouseWheel>", self._al_rodar, add="+")
+        widget.bind("<Button-4>", self._al_rodar, add="+")
+        widget.bind("<Button-5>", self._al_rodar, add="+")
+
+    def _al_redimensionar(self, event):
+        visibles = max(1, event.height // self.alto_fila)
+        if visibles == self._visibles:
+            return
+        while len(self._pool) < visibles:
+            self._pool.append(self._crear_fila(len(self._pool)))
+        self._visibles = visibles
+        self._limitar_primera()
+        self._refrescar()
+
+    def _refrescar(self):
+        """Vuelca en las filas del pool los registros de la ventana visible"""
+        for posicion, fila in enumerate(self._pool):
+            indice = self._primera + posicion
+            if posicion >= self._visibles or indice >= len(self._filas):
+                if fila["mostrada"]:
+                    fila["frame"].grid_remove()
+                    fila["mostrada"] = False
+                continue
+
+            color = self.COLOR_SELECCION if indice == self.seleccion else self._colores_fila[indice % 2]
+            if fila["color"] != color:
+                fila["frame"].configure(fg_color=color)
+                fila["color"] = color
+
+            valores = self._filas[indice]
+            for columna, celda, indice_valor in zip(self.columnas, fila["celdas"], self._indice_valor):
+                if indice_valor is None:
+                    visible = columna.visible is None or columna.visible(indice)
+                    if celda["visible"] != visible:
+                        mostrar, ocultar = ("boton", "guion") if visible else ("guion", "boton")
+                        celda[ocultar].grid_forget()
+                        celda[mostrar].grid(row=0, column=celda["col"], padx=5, sticky="ew")
+                        celda["visible"] = visible
+                    continue
+                valor = valores[indice_valor]
+                texto, color_texto = valor if isinstance(valor, tuple) else (valor, None)
+                if celda["texto"] != texto:
+                    celda["label"].configure(text=texto)
+                    celda["texto"] = texto
+                if celda["color"] != color_texto and color_texto is not None:
+                    celda["label"].configure(text_color=color_texto)
+                    celda["color"] = color_texto
+                elif celda["color"] is not None and color_texto is None:
+                    celda["label"].configure(text_color=ctk.ThemeManager.theme["CTkLabel"]["text_color"])
+                    celda["color"] = None
+
+            if not fila["mostrada"]:
+                fila["frame"].grid(row=posicion, column=0, sticky="ew", pady=3)
+                fila["mostrada"] = True
+
+        self._actualizar_scrollbar()
+
+    # ------------------------------------------------------------------
+    # Desplazamiento y selección
+    # ------------------------------------------------------------------
+
+    def _limitar_primera(self):
+        maximo = max(0, len(self._filas) - self._visibles)
+        self._primera = min(max(0, self._primera), maximo)
+
+    def _actualizar_scrollbar(self):
+        total = len(self._filas)
+        if total <= self._visibles or total == 0:
+            self._scrollbar.set(0, 1)
+        else:
+            self._scrollbar.set(self._primera / total, (self._primera + self._visibles) / total)
+
+    def _desplazar(self, *args):
+        """Protocolo de scrollbar: ('moveto', fracción) o ('scroll', n, 'units'|'pages')"""
+        if args[0] == "moveto":
+            self.desplazar_a(int(round(float(args[1]) * len(self._filas))))
+        elif args[0] == "scroll":
+            n = float(args[1])
+            if n == 0:
+                return
+            if args[2] == "pages":
+                pasos = self._visibles
+            else:
+                pasos = max(1, min(3, int(abs(n))))
+            self.desplazar_a(self._primera + (pasos if n > 0 else -pasos))
+
+    def _al_rodar(self, event):
+        arriba = event.num == 4 or getattr(event, "delta", 0) > 0
+        self.desplazar_a(self._primera + (-3 if arriba else 3))
+        # Evita que el CTkScrollableFrame contenedor también se desplace
+        return "break"
+
+    def _click(self, posicion: int):
+        indice = self._primera + posicion
+        if indice >= len(self._filas):
+            return
+        self.seleccion = indice
+        self._refrescar()
+        if self.al_seleccionar is not None:
+            self.al_seleccionar(indice)
@@ -0,0 +1,207 @@
+"""
+Ejecutor de tareas en segundo plano para la interfaz gráfica
+
+Principio de no bloqueo: las llamadas al WebService se ejecutan en un pool
+de hilos y su resultado vuelve al hilo de tkinter mediante root.after,
+porque tkinter no es thread-safe y los widgets solo se tocan desde el
+hilo principal.
+"""
+import queue
+import traceback
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional
+
+
+class Tarea:
+    """Petición en curso; se puede cancelar mientras no haya terminado"""
+
+    def __init__(self, clave: Optional[str], texto: str, widget=None):
+        self.clave = clave
+        self.texto = texto
+        self.widget = widget
+        self.cancelada = False
+        self.terminada = False
+        self._futuro = None
+
+    def cancelar(self):
+        """
+        Descarta el resultado. Si la petición aún no ha empezado no llega a
+        enviarse; si ya está en vuelo, su respuesta se ignora al llegar.
+        """
+        self.cancelada = True
+        if self._futuro is not None:
+            self._futuro.cancel()
+
+    @property
+    def vigente(self) -> bool:
+        """La tarea no está cancelada y su widget asociado sigue existiendo"""
+        if self.cancelada:
+            return False
+        if self.widget is None:
+            return True
+        try:
+            return bool(self.widget.winfo_exists())
+        except Exception:
+            return False
+
+
+class EjecutorTareas:
+    """
+    Pool de hilos para I/O compartido por todos los paneles.
+
+    - ejecutar() lanza la función en un hilo y llama a al_terminar/al_fallar
+      en el hilo de tkinter.
+    - Una tarea nueva con la misma clave cancela la anterior (resultados
+      superados: p. ej. el usuario pulsa "Listar" dos veces o cambia de fecha
+      antes de que llegue la disponibilidad).
+    - Mientras haya tareas pendientes se muestra el cursor de espera y se
+      avisa al indicador de carga.
+    """
+
+    def __init__(self, root, max_hilos: int = 4, intervalo_ms: int = 30,
+                 indicador: Optional[Callable[[Optional[str]], None]] = None):
+        self.root = root
+        self.intervalo_ms = intervalo_ms
+        self.indicador = indicador
+        self._pool = ThreadPoolExecutor(max_workers=max_hilos, thread_name_prefix="pms-io")
+        self._resultados: "queue.Queue" = queue.Queue()
+        self._pendientes: Dict[int, Tarea] = {}
+        self._por_clave: Dict[str, Tarea] = {}
+        self._sondeo = None
+        self._cerrado = False
+
+    def ejecutar(self, funcion: Callable[[], Any],
+                 al_terminar: Optional[Callable[[Any], None]] = None,
+                 al_fallar: Optional[Callable[[Exception], None]] = None,
+                 clave: Optional[str] = None,
+                 widget=None,
+                 texto: str = "Cargando...") -> Tarea:
+        """
+        Ejecutar funcion() en segundo plano.
+
+        Args:
+            funcion: Trabajo de I/O; no debe tocar widgets
+            al_terminar: Recibe el resultado en el hilo de tkinter
+            al_fallar: Recibe la excepción en el hilo de tkinter
+            clave: Las tareas con la misma clave se sustituyen entre sí
+            widget: Si se destruye antes de terminar, se descarta el resultado
+            texto: Mensaje para el indicador de carga
+        """
+        if clave is not None:
+            self.cancelar(clave)
+
+        tarea = Tarea(clave, texto, widget)
+        if self._cerrado:
+            tarea.cancelada = True
+            return tarea
+
+        self._pendientes[id(tarea)] = tarea
+        if clave is not None:
+            self._por_clave[clave] = tarea
+
+        def trabajo():
+            if tarea.cancelada:
+                self._resultados.put((tarea, None, None, None, None))
+                return
+            try:
+                self._resultados.put((tarea, al_terminar, al_fallar, True, funcion()))
+            except Exception as e:
+                self._resultados.put((tarea, al_terminar, al_fallar, False, e))
+
+        tarea._futuro = self._pool.submit(trabajo)
+        self._actualizar_indicador()
+        self._programar_sondeo()
+        return tarea
+
+    def cancelar(self, clave: str):
+        """Cancelar la tarea pendiente con esa clave, si la hay"""
+        anterior = self._por_clave.pop(clave, None)
+        if anterior is not None and not anterior.terminada:
+            anterior.cancelar()
+            # Un futuro cancelado antes de empezar no pasa por la cola
+            if anterior._futuro is not None and anterior._futuro.cancelled():
+                self._retirar(anterior)
+
+    def cancelar_todas(self):
+        """Cancelar todas las tareas pendientes (p. ej. al cambiar de pantalla)"""
+        for tarea in list(self._pendientes.values()):
+            if tarea.clave is not None:
+                self.cancelar(tarea.clave)
+            else:
+                tarea.cancelar()
+                if tarea._futuro is not None and tarea._futuro.cancelled():
+                    self._retirar(tarea)
+
+    @property
+    def ocupado(self) -> bool:
+        return bool(self._pendientes)
+
+    def cerrar(self):
+        """Cancelar lo pendiente y liberar los hilos sin esperar respuestas en vuelo"""
+        self._cerrado = True
+        for tarea in list(self._pendientes.values()):
+            tarea.cancelar()
+        self._pendientes.clear()
+        self._por_clave.clear()
+        if self._sondeo is not None:
+            try:
+                self.root.after_cancel(self._sondeo)
+            except Exception:
+                pass
+            self._sondeo = None
+        self._pool.shutdown(wait=False, cancel_futures=True)
+
+    # ------------------------------------------------------------------
+    # Hilo de tkinter
+    # ------------------------------------------------------------------
+
+    def _programar_sondeo(self):
+        if self._sondeo is None and not self._cerrado:
+            self._sondeo = self.root.after(self.intervalo_ms, self._sondear)
+
+    def _sondear(self):
+        """Entregar en el hilo principal los resultados que hayan llegado"""
+        self._sondeo = None
+        while True:
+            try:
+                tarea, al_terminar, al_fallar, exito, valor = self._resultados.get_nowait()
+            except queue.Empty:
+                break
+
+            self._retirar(tarea)
+            if not tarea.vigente:
+                continue
+
+            try:
+                if exito and al_terminar is not None:
+                    al_terminar(valor)
+                elif not exito:
+                    if al_fallar is not None:
+                        al_fallar(valor)
+                    else:
+                        traceback.print_exception(type(valor), valor, valor.__traceback__)
+            except Exception:
+                # Un fallo al pintar no debe detener la entrega del resto
+                traceback.print_exc()
+
+        if self._pendientes:
+            self._programar_sondeo()
+
+    def _retirar(self, tarea: Tarea):
+        tarea.terminada = True
+        self._pendientes.pop(id(tarea), None)
+        if tarea.clave is not None and self._por_clave.get(tarea.clave) is tarea:
+            del self._por_clave[tarea.clave]
+        self._actualizar_indicador()
+
+    def _actualizar_indicador(self):
+        if self._cerrado:
+            return
+        activas = [t for t in self._pendientes.values() if not t.cancelada]
+        texto = activas[-1].texto if activas else None
+        try:
+            self.root.configure(cursor="watch" if activas else "")
+        except Exception:
+            pass
+        if self.indicador is not None:
+            self.indicador(texto)